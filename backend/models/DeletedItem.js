@@ -0,0 +1,34 @@
+const mongoose = require('mongoose');
+
+/**
+ * Deleted Items (tombstones)
+ *
+ * DELETE /api/items/:id removes the item document, so the ?since= change
+ * feed (ordered by updatedAt) would never see it again. A tombstone keeps
+ * the item's _id, its list filter fields and the deletion time, and the feed
+ * returns it as { _id, deleted: true, updatedAt } so pollers can drop the item.
+ *
+ * Tombstones expire after TOMBSTONE_TTL_SECONDS; a feed position older than
+ * that misses the deletions before it and should reload the list instead.
+ */
+
+const TOMBSTONE_TTL_SECONDS = 30 * 24 * 60 * 60;
+
+const deletedItemSchema = new mongoose.Schema({
+  // _id is the deleted item's _id
+  // Copies of the item fields that GET /api/items filters on
+  processType: String,
+  operator: String,
+  statusCode: String,
+  productId: String,
+  timestamp: Date,
+  deletedAt: { type: Date, required: true }
+}, { versionKey: false });
+
+deletedItemSchema.index({ deletedAt: 1, _id: 1 }); // ?since= change feed
+deletedItemSchema.index({ deletedAt: 1 }, { expireAfterSeconds: TOMBSTONE_TTL_SECONDS });
+
+const DeletedItem = mongoose.model('DeletedItem', deletedItemSchema);
+DeletedItem.TOMBSTONE_TTL_SECONDS = TOMBSTONE_TTL_SECONDS;
+
+module.exports = DeletedItem;
@@ -111,8 +111,23 @@ const itemSchema = new mongoose.Schema({
     type: Date,
     default: Date.now
   }
+}, {
+  // createdAt/updatedAt are set by the server on insert and save; updatedAt
+  // orders the ?since= change feed (timestamp may be client-supplied)
+  timestamps: true
 });
 
+// Indexes for the query shapes of routes/itemRoutes.js. Every list is sorted
+// newest first with _id as the tie-breaker of the ?cursor= paging, so the
+// filtered indexes end in (timestamp, _id) and serve filter + sort without a
+// collection scan or an in-memory sort. Mongoose builds them on startup.
+itemSchema.index({ timestamp: -1, _id: -1 }); // Unfiltered list and paging
+itemSchema.index({ processType: 1, timestamp: -1, _id: -1 }); // ?processType=, QC stats
+itemSchema.index({ operator: 1, timestamp: -1, _id: -1 }); // ?operator=
+itemSchema.index({ productId: 1 }); // Quality control lookups by product
+itemSchema.index({ statusCode: 1, timestamp: -1 }); // Per sensor/source queries
+itemSchema.index({ updatedAt: 1, _id: 1 }); // ?since= change feed
+
 // Pre-save middleware to auto-generate status code if not provided
 itemSchema.pre('save', function(next) {
   if (!this.statusCode) {
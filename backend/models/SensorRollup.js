@@ -0,0 +1,133 @@
+const mongoose = require('mongoose');
+
+/**
+ * Sensor Rollups
+ *
+ * Pre-aggregated count/sum/min/max of each measurement field per processType
+ * and per minute, hour and day bucket (UTC, by item timestamp), so long-range
+ * trend charts read a few thousand rows instead of every raw reading.
+ * Mean is sum / count.
+ *
+ * Rows are updated incrementally when items are inserted (recordItems).
+ * Updates and deletes of items are not subtracted; the batch job
+ * testing/rollup_rebuild.py recomputes whole days from the items and
+ * replaces those rows (PUT /api/items/rollups folds in the items inserted
+ * after the job read the day, so no increment is lost).
+ */
+
+// Bucket widths in milliseconds
+const GRANULARITIES = {
+  minute: 60 * 1000,
+  hour: 60 * 60 * 1000,
+  day: 24 * 60 * 60 * 1000
+};
+
+// Measurement fields with a numeric .value (see models/Item.js)
+const ROLLUP_FIELDS = ['temperature', 'speed', 'squeegeeSpeed', 'printPressure', 'inkViscosity'];
+
+const sensorRollupSchema = new mongoose.Schema({
+  granularity: {
+    type: String,
+    enum: Object.keys(GRANULARITIES),
+    required: true
+  },
+  bucketStart: { type: Date, required: true },
+  processType: { type: String, required: true },
+  field: {
+    type: String,
+    enum: ROLLUP_FIELDS,
+    required: true
+  },
+  count: { type: Number, default: 0 },
+  sum: { type: Number, default: 0 },
+  min: Number,
+  max: Number,
+  rebuiltAt: Date // Set when the batch job last replaced the row
+}, { versionKey: false });
+
+// One row per bucket; also serves the range reads of GET /api/items/rollups
+sensorRollupSchema.index({ granularity: 1, processType: 1, field: 1, bucketStart: 1 }, { unique: true });
+
+/**
+ * Start of the bucket containing a time
+ * @param {Date|string|number} timestamp - Item timestamp
+ * @param {string} granularity - minute, hour or day
+ * @returns {Date} - Bucket start (UTC)
+ */
+function bucketStart(timestamp, granularity) {
+  const ms = new Date(timestamp).getTime();
+  return new Date(ms - (ms % GRANULARITIES[granularity]));
+}
+
+/**
+ * Key of a rollup row in the maps returned by combineItems
+ * @param {Object} row - granularity, processType, field, bucketStart
+ * @returns {string} - Map key
+ */
+function rowKey({ granularity, processType, field, bucketStart: start }) {
+  return `${granularity}|${processType}|${field}|${new Date(start).getTime()}`;
+}
+
+/**
+ * Aggregate items per rollup bucket
+ * @param {Array<Object>} items - Item documents
+ * @returns {Map} - rowKey -> { filter: { granularity, processType, field, bucketStart }, count, sum, min, max }
+ */
+function combineItems(items) {
+  const buckets = new Map();
+  items.forEach(item => {
+    if (!item.processType || !item.timestamp) return;
+    ROLLUP_FIELDS.forEach(field => {
+      const value = item[field]?.value;
+      if (typeof value !== 'number' || !Number.isFinite(value)) return;
+      Object.keys(GRANULARITIES).forEach(granularity => {
+        const filter = {
+          granularity, processType: item.processType, field, bucketStart: bucketStart(item.timestamp, granularity)
+        };
+        const key = rowKey(filter);
+        const bucket = buckets.get(key);
+        if (bucket) {
+          bucket.count += 1;
+          bucket.sum += value;
+          bucket.min = Math.min(bucket.min, value);
+          bucket.max = Math.max(bucket.max, value);
+        } else {
+          buckets.set(key, { filter, count: 1, sum: value, min: value, max: value });
+        }
+      });
+    });
+  });
+  return buckets;
+}
+
+/**
+ * Fold newly inserted items into the rollups
+ * @param {Array<Object>} items - Inserted item documents
+ * @returns {Promise} - Resolves when every affected bucket has been upserted
+ */
+sensorRollupSchema.statics.recordItems = async function(items) {
+  // Combine the items per bucket first, so each bucket costs one upsert
+  const buckets = combineItems(items);
+  if (buckets.size === 0) return;
+
+  await this.bulkWrite([...buckets.values()].map(bucket => ({
+    updateOne: {
+      filter: bucket.filter,
+      update: {
+        $inc: { count: bucket.count, sum: bucket.sum },
+        $min: { min: bucket.min },
+        $max: { max: bucket.max }
+      },
+      upsert: true
+    }
+  })), { ordered: false });
+};
+
+const SensorRollup = mongoose.model('SensorRollup', sensorRollupSchema);
+SensorRollup.GRANULARITIES = GRANULARITIES;
+SensorRollup.ROLLUP_FIELDS = ROLLUP_FIELDS;
+SensorRollup.bucketStart = bucketStart;
+SensorRollup.combineItems = combineItems;
+SensorRollup.rowKey = rowKey;
+
+module.exports = SensorRollup;
@@ -1,103 +1,917 @@
 const express = require('express');
+const mongoose = require('mongoose');
 const router = express.Router();
 const Item = require('../models/Item');
+const DeletedItem = require('../models/DeletedItem');
+const SensorRollup = require('../models/SensorRollup');
+
+// Bulk insert limit for POST /bulk
+const MAX_BULK_ITEMS = 5000;
+
+// Row limits of GET /rollups and of one PUT /rollups rebuild
+const MAX_ROLLUP_ROWS = 20000;
+const MAX_ROLLUP_REBUILD_ROWS = 50000;
+
+// Sensor type digit (Z of a sensor data status code XYZW with Y=2, see models/Item.js) -> measurement field
+const SENSOR_FIELDS = {
+  1: 'squeegeeSpeed',
+  2: 'printPressure',
+  3: 'inkViscosity',
+  4: 'temperature',
+  5: 'speed'
+};
+
+/**
+ * Measurement field reported by a single-sensor status code, e.g. 2240 -> temperature
+ * @param {string|number} statusCode - 4-digit status code (see models/Item.js)
+ * @returns {string|null} - Field name, or null for manual/general codes
+ */
+function sensorFieldForStatusCode(statusCode) {
+  const match = /^[12]2([1-5])\d$/.exec(String(statusCode ?? ''));
+  return match ? SENSOR_FIELDS[match[1]] : null;
+}
+
+/**
+ * Validate a create payload against the per-process rules
+ * @param {Object} payload - Request body for a single item
+ * @throws {Error} - When a required field is missing
+ */
+function validateItemPayload(payload) {
+  const {
+    processType,
+    squeegeeSpeed,
+    printPressure,
+    inkViscosity,
+    temperature,
+    speed,
+    processStation,
+    productId,
+    decision,
+    causeOfFailure
+  } = payload || {};
+
+  // Basic processType check
+  if (!processType) throw new Error('Missing processType');
+
+  // Single-sensor readings (e.g. 2240 thermometer) only carry their own measurement
+  const sensorField = processType !== 'QualityControl' && sensorFieldForStatusCode(payload.statusCode);
+  if (sensorField) {
+    const value = payload[sensorField]?.value;
+    if (value === undefined || value === null || value === '') {
+      throw new Error(`Missing ${sensorField} value for sensor status code ${payload.statusCode}`);
+    }
+  }
+
+  // Silvering validation
+  if (processType === 'Silvering' && !sensorField) {
+    if (!squeegeeSpeed?.value || !printPressure?.value || !inkViscosity?.value) {
+      throw new Error('Missing required silvering sensor values');
+    }
+  }
+
+  // Streeting validation
+  if (processType === 'Streeting' && !sensorField) {
+    if (!temperature?.value || !speed?.value) {
+      throw new Error('Missing required streeting sensor values');
+    }
+  }
+
+  // Quality Control validation
+  if (processType === 'QualityControl') {
+    if (!processStation || !productId) {
+      throw new Error('Missing required quality control fields');
+    }
+  }
+
+  // Validate causeOfFailure when decision is false or goes to rework
+  if ((decision === 'No' || decision === 'Goes to Rework') && (!causeOfFailure || causeOfFailure.length === 0)) {
+    throw new Error('Cause of failure is required when decision is No or Goes to Rework');
+  }
+}
+
+/**
+ * Pick the stored fields from a create payload and apply defaults
+ * @param {Object} payload - Validated request body for a single item
+ * @returns {Object} - Fields for a new Item
+ */
+function buildItemFields(payload) {
+  const {
+    _id,
+    processType,
+    squeegeeSpeed,
+    printPressure,
+    inkViscosity,
+    temperature,
+    speed,
+    processStation,
+    productId,
+    reworkability,
+    affectedOutput,
+    priority,
+    targetMetricAffected,
+    operator,
+    statusCode,
+    reworked,
+    decision,
+    causeOfFailure,
+    timestamp
+  } = payload;
+
+  return {
+    // Clients that retry (e.g. the sensor spool) send their own ObjectId so a
+    // re-sent item fails with a duplicate key error instead of being stored twice
+    ...(_id !== undefined && { _id }),
+    processType,
+    squeegeeSpeed,
+    printPressure,
+    inkViscosity,
+    temperature,
+    speed,
+    processStation,
+    productId,
+    reworkability,
+    affectedOutput: affectedOutput || [],
+    priority: priority || 'M',
+    targetMetricAffected: targetMetricAffected || [],
+    operator: operator || 'Unknown',
+    statusCode,
+    reworked: reworked || 'No',
+    decision: decision || 'Yes',
+    causeOfFailure: causeOfFailure || [],
+    timestamp: timestamp || Date.now()
+  };
+}
+
+// Start times (epoch ms) of the writes in progress in this process, by handle.
+// The ?since= change feed only returns changes stamped before the oldest of
+// them: a slow write (e.g. a large bulk insert) stamps its documents when it
+// starts but they only become visible when it ends, so a cursor taken past a
+// faster, later write would otherwise skip them. With several backend
+// processes behind one database, each only knows its own writes.
+const inFlightWrites = new Map();
+let nextWriteHandle = 0;
+
+/**
+ * Register a write before it stamps createdAt/updatedAt/deletedAt
+ * @returns {number} - Handle to pass to endWrite
+ */
+function beginWrite() {
+  const handle = nextWriteHandle++;
+  inFlightWrites.set(handle, Date.now());
+  return handle;
+}
+
+/**
+ * Unregister a write once it has completed or failed
+ * @param {number} handle - Value returned by beginWrite
+ */
+function endWrite(handle) {
+  inFlightWrites.delete(handle);
+}
+
+/**
+ * Latest change time the feed may return: every write stamped at or before
+ * it has completed, so no change can later appear behind a returned cursor
+ * @returns {Date} - Settled time
+ */
+function settledTime() {
+  let oldest = Date.now();
+  inFlightWrites.forEach(startedAt => {
+    oldest = Math.min(oldest, startedAt);
+  });
+  return new Date(oldest - 1);
+}
 
 // POST grouped payload for Silvering or Streeting
 router.post('/', async (req, res) => {
   try {
-    const {
-      processType,
-      squeegeeSpeed,
-      printPressure,
-      inkViscosity,
-      temperature,
-      speed,
-      processStation,
-      productId,
-      reworkability,
-      affectedOutput,
-      priority,
-      targetMetricAffected,
-      operator,
-      statusCode,
-      reworked,
-      decision,
-      causeOfFailure,
-      timestamp
-    } = req.body;
-
-    // Basic processType check
-    if (!processType) throw new Error('Missing processType');
-
-    // Silvering validation
-    if (processType === 'Silvering') {
-      if (!squeegeeSpeed?.value || !printPressure?.value || !inkViscosity?.value) {
-        throw new Error('Missing required silvering sensor values');
+    validateItemPayload(req.body);
+
+    const item = new Item(buildItemFields(req.body));
+
+    await enterRollupInsert();
+    let savedItem;
+    try {
+      const writeHandle = beginWrite();
+      try {
+        savedItem = await item.save();
+      } finally {
+        endWrite(writeHandle);
       }
+      await recordRollups([savedItem]);
+    } finally {
+      leaveRollupInsert();
     }
+    res.status(201).json(savedItem);
+  } catch (err) {
+    console.error('❌ Failed to create item:', err.message);
+    res.status(400).json({ message: err.message });
+  }
+});
 
-    // Streeting validation
-    if (processType === 'Streeting') {
-      if (!temperature?.value || !speed?.value) {
-        throw new Error('Missing required streeting sensor values');
-      }
+// Rollup rebuilds (PUT /rollups) replace rows that inserts increment. An insert
+// holds a shared slot from storing its items until its rollup update is done;
+// a rebuild waits for those to finish and holds off new ones while it folds
+// in the late items and replaces the rows, so no increment lands in between.
+// Like the change feed's in-flight writes, this only covers this process.
+const rollupGate = { inserts: 0, rebuild: null, drained: [] };
+
+/**
+ * Take a shared slot before inserting items (waits while a rebuild runs)
+ */
+async function enterRollupInsert() {
+  while (rollupGate.rebuild) await rollupGate.rebuild;
+  rollupGate.inserts += 1;
+}
+
+/**
+ * Release the slot taken by enterRollupInsert
+ */
+function leaveRollupInsert() {
+  rollupGate.inserts -= 1;
+  if (rollupGate.inserts === 0) rollupGate.drained.splice(0).forEach(resolve => resolve());
+}
+
+/**
+ * Run a rollup rebuild with no insert in progress
+ * @param {Function} rebuild - Async function replacing rollup rows
+ * @returns {Promise} - Result of rebuild
+ */
+async function withRollupsExclusive(rebuild) {
+  while (rollupGate.rebuild) await rollupGate.rebuild;
+  let release;
+  rollupGate.rebuild = new Promise(resolve => { release = resolve; });
+  try {
+    if (rollupGate.inserts > 0) await new Promise(resolve => rollupGate.drained.push(resolve));
+    return await rebuild();
+  } finally {
+    rollupGate.rebuild = null;
+    release();
+  }
+}
+
+/**
+ * Fold inserted items into the sensor rollups. A failure is logged, not
+ * returned: the items are stored, and the rollup rebuild job repairs the rows
+ * @param {Array<Object>} items - Inserted items
+ */
+async function recordRollups(items) {
+  try {
+    await SensorRollup.recordItems(items);
+  } catch (err) {
+    console.error('❌ Rollup update failed:', err.message);
+  }
+}
+
+// POST many items in one round trip
+// Body is an array of items (or { items: [...] }). Each item goes through the
+// same rules as POST /; valid items are inserted and invalid ones are
+// reported by their index in the request.
+router.post('/bulk', async (req, res) => {
+  try {
+    const payloads = Array.isArray(req.body) ? req.body : req.body?.items;
+    if (!Array.isArray(payloads) || payloads.length === 0) {
+      throw new Error('Expected a non-empty array of items');
+    }
+    if (payloads.length > MAX_BULK_ITEMS) {
+      throw new Error(`A bulk request may contain at most ${MAX_BULK_ITEMS} items`);
     }
 
-    // Quality Control validation
-    if (processType === 'QualityControl') {
-      if (!processStation || !productId) {
-        throw new Error('Missing required quality control fields');
+    const docs = [];
+    const docIndexes = [];
+    const failed = [];
+    payloads.forEach((payload, index) => {
+      try {
+        validateItemPayload(payload);
+        const item = new Item(buildItemFields(payload));
+        const validationError = item.validateSync();
+        if (validationError) throw validationError;
+        docs.push(item.toObject());
+        docIndexes.push(index);
+      } catch (err) {
+        failed.push({ index, message: err.message });
       }
-    }
+    });
 
-    // Validate causeOfFailure when decision is false or goes to rework
-    if ((decision === 'No' || decision === 'Goes to Rework') && (!causeOfFailure || causeOfFailure.length === 0)) {
-      throw new Error('Cause of failure is required when decision is No or Goes to Rework');
+    // Documents are already validated, so insert them lean and unordered.
+    // Lean inserts skip the schema timestamps, so set them here
+    const failedDocs = new Set();
+    let insertedDocs;
+    await enterRollupInsert();
+    try {
+      if (docs.length > 0) {
+        const writeHandle = beginWrite();
+        const now = new Date();
+        docs.forEach(doc => {
+          doc.createdAt = now;
+          doc.updatedAt = now;
+        });
+        try {
+          await Item.insertMany(docs, { ordered: false, lean: true });
+        } catch (err) {
+          if (!err.writeErrors) throw err;
+          err.writeErrors.forEach(writeError => {
+            failedDocs.add(writeError.index);
+            failed.push({ index: docIndexes[writeError.index], message: writeError.errmsg });
+          });
+        } finally {
+          endWrite(writeHandle);
+        }
+      }
+      insertedDocs = docs.filter((doc, i) => !failedDocs.has(i));
+      await recordRollups(insertedDocs);
+    } finally {
+      leaveRollupInsert();
     }
 
-    const item = new Item({
-      processType,
-      squeegeeSpeed,
-      printPressure,
-      inkViscosity,
-      temperature,
-      speed,
-      processStation,
-      productId,
-      reworkability,
-      affectedOutput: affectedOutput || [],
-      priority: priority || 'M',
-      targetMetricAffected: targetMetricAffected || [],
-      operator: operator || 'Unknown',
-      statusCode,
-      reworked: reworked || 'No',
-      decision: decision || 'Yes',
-      causeOfFailure: causeOfFailure || [],
-      timestamp: timestamp || Date.now()
-    });
+    const insertedIds = insertedDocs.map(doc => doc._id);
 
-    const savedItem = await item.save();
-    res.status(201).json(savedItem);
+    if (failed.length > 0) {
+      console.error(`❌ Bulk insert rejected ${failed.length} of ${payloads.length} items`);
+    }
+    res.status(insertedIds.length > 0 ? 201 : 400).json({
+      insertedCount: insertedIds.length,
+      insertedIds,
+      failed: failed.sort((a, b) => a.index - b.index)
+    });
   } catch (err) {
-    console.error('❌ Failed to create item:', err.message);
+    console.error('❌ Bulk insert failed:', err.message);
     res.status(400).json({ message: err.message });
   }
 });
 
+// Pagination limits for GET ?limit=
+const MAX_PAGE_SIZE = 5000;
+
+// Exact-match filters accepted by GET / and GET /stats/quality
+const EQUALITY_FILTERS = ['processType', 'operator', 'statusCode', 'productId'];
+
+// Paths accepted by ?fields=, e.g. "temperature.value"
+const FIELD_PATH = /^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$/;
+
+/**
+ * Parse a ?from= / ?to= bound
+ * @param {string} name - Parameter name, for the error message
+ * @param {string} value - ISO date string or epoch milliseconds
+ * @returns {Date} - Parsed date
+ * @throws {Error} - When the value is not a valid date
+ */
+function parseTimeBound(name, value) {
+  const date = /^\d+$/.test(value) ? new Date(Number(value)) : new Date(value);
+  if (Number.isNaN(date.getTime())) {
+    throw new Error(`${name} must be an ISO date or epoch milliseconds`);
+  }
+  return date;
+}
+
+/**
+ * Build the Mongo filter for the list query parameters
+ * @param {Object} query - req.query (processType, operator, statusCode, productId, from, to)
+ * @returns {Object} - Mongo filter; from is inclusive, to is exclusive
+ */
+function buildItemFilters(query) {
+  const filters = {};
+  EQUALITY_FILTERS.forEach(field => {
+    // String() keeps query objects such as ?operator[$ne]=x from becoming operators
+    if (query[field]) filters[field] = String(query[field]);
+  });
+  if (query.from || query.to) {
+    filters.timestamp = {};
+    if (query.from) filters.timestamp.$gte = parseTimeBound('from', String(query.from));
+    if (query.to) filters.timestamp.$lt = parseTimeBound('to', String(query.to));
+  }
+  return filters;
+}
+
+/**
+ * Build the projection for ?fields=
+ * @param {string} fields - Comma-separated field paths, or undefined for full documents
+ * @returns {Object|null} - Mongo projection; timestamp is always kept for the paging cursor
+ * @throws {Error} - When a path is not a plain field path
+ */
+function parseFields(fields) {
+  if (!fields) return null;
+  const paths = String(fields).split(',').map(path => path.trim()).filter(Boolean);
+  paths.forEach(path => {
+    if (!FIELD_PATH.test(path)) throw new Error(`Invalid field "${path}"`);
+  });
+  return Object.fromEntries([...new Set([...paths, 'timestamp'])].map(path => [path, 1]));
+}
+
+/**
+ * Encode the position of an item in the (timestamp desc, _id desc) order
+ * @param {Object} item - The last item of a page
+ * @returns {string} - Cursor in the form "<epoch ms>_<ObjectId>"
+ */
+function encodeCursor(item) {
+  return `${new Date(item.timestamp).getTime()}_${item._id}`;
+}
+
+/**
+ * Build the filter that selects items strictly after a cursor
+ * @param {string} cursor - Cursor returned in X-Next-Cursor
+ * @returns {Object} - Mongo filter
+ */
+function afterCursor(cursor) {
+  const [ms, id] = cursor.split('_');
+  const timestamp = new Date(Number(ms));
+  if (isNaN(timestamp.getTime()) || !mongoose.isValidObjectId(id)) {
+    throw new Error('Invalid cursor');
+  }
+  return {
+    $or: [
+      { timestamp: { $lt: timestamp } },
+      { timestamp, _id: { $lt: new mongoose.Types.ObjectId(id) } }
+    ]
+  };
+}
+
+/**
+ * Encode the position of an item in the (updatedAt asc, _id asc) change feed
+ * @param {Date|number} updatedAt - Update time of the last item returned
+ * @param {string} id - Its ObjectId (all zeros for a bare time position)
+ * @returns {string} - Cursor in the form "<epoch ms>_<ObjectId>"
+ */
+function encodeSinceCursor(updatedAt, id = '000000000000000000000000') {
+  return `${new Date(updatedAt).getTime()}_${id}`;
+}
+
+/**
+ * Build the filter that selects documents changed after a ?since= position
+ * @param {string} since - X-Since-Cursor value, or a plain ISO date / epoch ms
+ * @param {string} timeField - updatedAt for items, deletedAt for tombstones
+ * @returns {Object} - Mongo filter
+ */
+function changedSince(since, timeField = 'updatedAt') {
+  if (!since.includes('_')) {
+    return { [timeField]: { $gt: parseTimeBound('since', since) } };
+  }
+  const [ms, id] = since.split('_');
+  const updatedAt = new Date(Number(ms));
+  if (isNaN(updatedAt.getTime()) || !mongoose.isValidObjectId(id)) {
+    throw new Error('Invalid since cursor');
+  }
+  return {
+    $or: [
+      { [timeField]: { $gt: updatedAt } },
+      { [timeField]: updatedAt, _id: { $gt: new mongoose.Types.ObjectId(id) } }
+    ]
+  };
+}
+
+/**
+ * Order of two changes in the feed: (updatedAt, _id) ascending
+ * @param {Object} a - Item or tombstone
+ * @param {Object} b - Item or tombstone
+ * @returns {number} - Negative when a comes first
+ */
+function compareChanges(a, b) {
+  const byTime = new Date(a.updatedAt) - new Date(b.updatedAt);
+  if (byTime !== 0) return byTime;
+  return String(a._id) < String(b._id) ? -1 : String(a._id) > String(b._id) ? 1 : 0;
+}
+
+/**
+ * Answer a ?since= poll with the items created, updated or deleted after the position
+ * @param {Object} req - Express request (filters, fields, limit, since)
+ * @param {Object} res - Express response
+ */
+async function sendChangesSince(req, res) {
+  const limit = req.query.limit === undefined ? MAX_PAGE_SIZE : Number(req.query.limit);
+  if (!Number.isInteger(limit) || limit < 1 || limit > MAX_PAGE_SIZE) {
+    throw new Error(`limit must be an integer between 1 and ${MAX_PAGE_SIZE}`);
+  }
+  const settled = settledTime();
+  const since = String(req.query.since);
+  if (since === 'now') {
+    // Start a feed at the current position without returning anything
+    res.set('X-Since-Cursor', encodeSinceCursor(settled));
+    return res.status(200).json([]);
+  }
+
+  const filters = buildItemFilters(req.query);
+  const projection = parseFields(req.query.fields);
+  if (projection) projection.updatedAt = 1;
+  const [items, tombstones] = await Promise.all([
+    Item.find({ $and: [filters, changedSince(since), { updatedAt: { $lte: settled } }] }, projection)
+      .sort({ updatedAt: 1, _id: 1 })
+      .limit(limit)
+      .lean(),
+    DeletedItem.find({ $and: [filters, changedSince(since, 'deletedAt'), { deletedAt: { $lte: settled } }] },
+      { deletedAt: 1 })
+      .sort({ deletedAt: 1, _id: 1 })
+      .limit(limit)
+      .lean()
+  ]);
+
+  // Both lists are in feed order, so the first `limit` of the merged list are
+  // the first `limit` changes overall
+  const deletions = tombstones.map(({ _id, deletedAt }) => ({ _id, deleted: true, updatedAt: deletedAt }));
+  const changes = items.concat(deletions).sort(compareChanges).slice(0, limit);
+
+  const last = changes[changes.length - 1];
+  res.set('X-Since-Cursor', last ? encodeSinceCursor(last.updatedAt, last._id) : since);
+  if (changes.length === limit) res.set('X-More', 'true');
+  res.status(200).json(changes);
+}
+
 // GET items with optional filters
+// Filters: processType, operator, statusCode, productId and the time window
+// ?from= (inclusive) / ?to= (exclusive). ?fields=a,b.c returns only those
+// fields (plus _id and timestamp).
+// Without ?limit the full list is returned. With ?limit=N the list is paged:
+// the first page sets X-Total-Count, and X-Next-Cursor is passed back as
+// ?cursor= to fetch the following page. ?limit=0 only returns the count.
+// With ?since= the route is a change feed for live polling: it returns the
+// items created or updated after that position, oldest change first, and
+// X-Since-Cursor to pass as ?since= on the next poll (X-More: true when the
+// page was full). Deleted items appear as { _id, deleted: true, updatedAt }.
+// Start with ?since=now, or a date / epoch ms.
 router.get('/', async (req, res) => {
   try {
-    const filters = {};
-    if (req.query.processType) filters.processType = req.query.processType;
-    if (req.query.operator) filters.operator = req.query.operator;
+    if (req.query.since) return await sendChangesSince(req, res);
+
+    const filters = buildItemFilters(req.query);
+    const projection = parseFields(req.query.fields);
+
+    if (req.query.limit === undefined) {
+      const items = await Item.find(filters, projection).sort({ timestamp: -1 });
+      return res.status(200).json(items);
+    }
+
+    const limit = Number(req.query.limit);
+    if (!Number.isInteger(limit) || limit < 0 || limit > MAX_PAGE_SIZE) {
+      throw new Error(`limit must be an integer between 0 and ${MAX_PAGE_SIZE}`);
+    }
 
-    const items = await Item.find(filters).sort({ timestamp: -1 });
+    if (!req.query.cursor) {
+      res.set('X-Total-Count', String(await Item.countDocuments(filters)));
+    }
+    if (limit === 0) return res.status(200).json([]);
+
+    const pageFilters = req.query.cursor
+      ? { $and: [filters, afterCursor(req.query.cursor)] }
+      : filters;
+    const items = await Item.find(pageFilters, projection)
+      .sort({ timestamp: -1, _id: -1 })
+      .limit(limit)
+      .lean();
+
+    if (items.length === limit) {
+      res.set('X-Next-Cursor', encodeCursor(items[items.length - 1]));
+    }
     res.status(200).json(items);
   } catch (err) {
     res.status(400).json({ message: err.message });
   }
 });
 
+// Bin widths of the "pass/defect rate by range" charts in QualityControlChart.js
+const QUALITY_BIN_SIZES = {
+  temperature: 2,
+  speed: 5,
+  squeegeeSpeed: 5,
+  printPressure: 1000,
+  inkViscosity: 2
+};
+const DEFECT_DECISIONS = ['No', 'Goes to Rework'];
+const MIN_RATE_SAMPLES = 2; // Ranges with fewer samples are left out, as in the chart
+
+/**
+ * Match items with a set, non-zero measurement and a decision
+ * (the chart's `item[field] && item[field].value && item.decision`)
+ * @param {string} field - Measurement field, e.g. 'speed'
+ * @returns {Object} - $match filter
+ */
+function measuredFilter(field) {
+  return { [`${field}.value`]: { $nin: [null, 0] }, decision: { $nin: [null, ''] } };
+}
+
+/**
+ * Round a numeric expression down to a multiple of size
+ * @param {*} expression - Aggregation expression
+ * @param {number} size - Bucket width
+ * @returns {Object} - Aggregation expression
+ */
+function floorTo(expression, size) {
+  return { $multiply: [{ $floor: { $divide: [expression, size] } }, size] };
+}
+
+/**
+ * $group stage counting items and defects per bucket
+ * @param {*} bucket - Aggregation expression for the bucket key
+ * @returns {Object} - $group stage
+ */
+function defectRateGroup(bucket) {
+  return {
+    $group: {
+      _id: bucket,
+      total: { $sum: 1 },
+      defects: { $sum: { $cond: [{ $in: ['$decision', DEFECT_DECISIONS] }, 1, 0] } }
+    }
+  };
+}
+
+/**
+ * Turn { _id, total, defects } groups into the chart's rate rows
+ * @param {Array} groups - Output of a defectRateGroup() facet
+ * @param {Function} describe - Maps a group _id to the row's key fields
+ * @param {string} sortKey - Row field to sort by
+ * @returns {Array} - Rows with defectRate, passRate and totalSamples, sorted by sortKey
+ */
+function rateRows(groups, describe, sortKey) {
+  return groups
+    .map(({ _id, total, defects }) => ({
+      ...describe(_id),
+      defectRate: (defects / total) * 100,
+      passRate: ((total - defects) / total) * 100,
+      totalSamples: total
+    }))
+    .filter(row => row.totalSamples >= MIN_RATE_SAMPLES)
+    .sort((a, b) => a[sortKey] - b[sortKey]);
+}
+
+/**
+ * Totals and per-operator rows for an array field counted per (operator, value)
+ * @param {Array} groups - { _id: { operator, name }, count } groups
+ * @param {Array} operators - Operators to build rows for
+ * @returns {Object} - { totals: [{ name, count }], names, byOperator: [{ operator, <name>: count }] }
+ */
+function operatorBreakdown(groups, operators) {
+  const totals = {};
+  const perOperator = {};
+  groups.forEach(({ _id, count }) => {
+    totals[_id.name] = (totals[_id.name] || 0) + count;
+    if (_id.operator) {
+      perOperator[_id.operator] = perOperator[_id.operator] || {};
+      perOperator[_id.operator][_id.name] = count;
+    }
+  });
+
+  const names = Object.keys(totals).sort();
+  return {
+    totals: Object.entries(totals)
+      .map(([name, count]) => ({ name, count }))
+      .sort((a, b) => b.count - a.count || a.name.localeCompare(b.name)),
+    names,
+    byOperator: operators.map(operator => {
+      const row = { operator };
+      names.forEach(name => {
+        row[name] = perOperator[operator]?.[name] || 0;
+      });
+      return row;
+    })
+  };
+}
+
+/**
+ * Compute the QualityControlChart.js metrics in MongoDB
+ * @param {Object} filters - Item filter (e.g. { processType: 'QualityControl' })
+ * @returns {Promise<Object>} - Chart-ready metrics
+ */
+async function computeQualityStats(filters) {
+  // Range bins start at each field's minimum, so those are looked up first
+  const binFields = Object.keys(QUALITY_BIN_SIZES);
+  const [minimums] = await Item.aggregate([
+    { $match: filters },
+    {
+      $facet: Object.fromEntries(binFields.map(field => [field, [
+        { $match: measuredFilter(field) },
+        { $group: { _id: null, min: { $min: `$${field}.value` } } }
+      ]]))
+    }
+  ]);
+
+  const binFacets = {};
+  binFields.forEach(field => {
+    const min = minimums[field][0]?.min;
+    if (min === undefined) return;
+    const size = QUALITY_BIN_SIZES[field];
+    binFacets[`bin_${field}`] = [
+      { $match: measuredFilter(field) },
+      defectRateGroup({ $add: [floorTo({ $subtract: [`$${field}.value`, min] }, size), min] })
+    ];
+  });
+
+  const [facets] = await Item.aggregate([
+    { $match: filters },
+    {
+      $facet: {
+        total: [{ $count: 'count' }],
+        decisions: [{ $group: { _id: { $ifNull: ['$decision', 'Unknown'] }, count: { $sum: 1 } } }],
+        reworked: [{ $group: { _id: { $ifNull: ['$reworked', 'No'] }, count: { $sum: 1 } } }],
+        reworkOutcome: [
+          { $match: { reworked: 'Yes' } },
+          { $group: { _id: { $ifNull: ['$reworkOutcome', '$decision'] }, count: { $sum: 1 } } }
+        ],
+        causeOfFailure: [
+          { $unwind: '$causeOfFailure' },
+          { $group: { _id: { operator: '$operator', name: '$causeOfFailure' }, count: { $sum: 1 } } }
+        ],
+        affectedOutput: [
+          { $unwind: '$affectedOutput' },
+          { $group: { _id: { operator: '$operator', name: '$affectedOutput' }, count: { $sum: 1 } } }
+        ],
+        operators: [
+          { $match: { operator: { $nin: [null, ''] } } },
+          { $group: { _id: '$operator' } },
+          { $sort: { _id: 1 } }
+        ],
+        speed: [{ $match: measuredFilter('speed') }, defectRateGroup(floorTo('$speed.value', 2))],
+        temperature: [{ $match: measuredFilter('temperature') }, defectRateGroup({ $floor: '$temperature.value' })],
+        ...binFacets
+      }
+    }
+  ]);
+
+  const countsById = groups => Object.fromEntries(groups.map(({ _id, count }) => [_id, count]));
+  const reworked = countsById(facets.reworked);
+  const operators = facets.operators.map(group => group._id);
+  const causes = operatorBreakdown(facets.causeOfFailure, operators);
+  const outputs = operatorBreakdown(facets.affectedOutput, operators);
+
+  return {
+    total: facets.total[0]?.count || 0,
+    decisions: countsById(facets.decisions),
+    reworked: { Yes: reworked.Yes || 0, No: reworked.No || 0 },
+    reworkOutcome: countsById(facets.reworkOutcome),
+    causeOfFailure: causes.totals,
+    affectedOutput: outputs.totals,
+    operators,
+    causes: causes.names,
+    outputs: outputs.names,
+    causeOfFailureByOperator: causes.byOperator,
+    affectedOutputByOperator: outputs.byOperator,
+    speedDefectRate: rateRows(facets.speed, speed => ({ speed }), 'speed'),
+    temperatureDefectRate: rateRows(facets.temperature, temperature => ({ temperature }), 'temperature'),
+    bins: Object.fromEntries(binFields.map(field => [
+      field,
+      rateRows(facets[`bin_${field}`] || [], binStart => ({
+        bin: `${binStart.toFixed(1)}-${(binStart + QUALITY_BIN_SIZES[field]).toFixed(1)}`,
+        binStart
+      }), 'binStart')
+    ]))
+  };
+}
+
+// GET quality control dashboard metrics, aggregated in the database
+// Takes the list filters (e.g. ?from=/?to=); processType defaults to QualityControl.
+router.get('/stats/quality', async (req, res) => {
+  let filters;
+  try {
+    filters = buildItemFilters({ processType: 'QualityControl', ...req.query });
+  } catch (err) {
+    return res.status(400).json({ message: err.message });
+  }
+  try {
+    res.status(200).json(await computeQualityStats(filters));
+  } catch (err) {
+    console.error('❌ Quality stats failed:', err.message);
+    res.status(500).json({ message: err.message });
+  }
+});
+
+/**
+ * Parse the rollup query or rebuild window
+ * @param {Object} query - granularity, processType, field, from, to
+ * @returns {Object} - Mongo filter on SensorRollup
+ * @throws {Error} - On an unknown granularity or field, or an invalid bound
+ */
+function buildRollupFilters(query) {
+  const filters = {};
+  if (query.granularity) {
+    if (!SensorRollup.GRANULARITIES[query.granularity]) {
+      throw new Error(`granularity must be one of ${Object.keys(SensorRollup.GRANULARITIES).join(', ')}`);
+    }
+    filters.granularity = String(query.granularity);
+  }
+  if (query.field) {
+    if (!SensorRollup.ROLLUP_FIELDS.includes(query.field)) {
+      throw new Error(`field must be one of ${SensorRollup.ROLLUP_FIELDS.join(', ')}`);
+    }
+    filters.field = String(query.field);
+  }
+  if (query.processType) filters.processType = String(query.processType);
+  if (query.from || query.to) {
+    filters.bucketStart = {};
+    if (query.from) filters.bucketStart.$gte = parseTimeBound('from', String(query.from));
+    if (query.to) filters.bucketStart.$lt = parseTimeBound('to', String(query.to));
+  }
+  return filters;
+}
+
+// GET pre-aggregated sensor rollups for trend charts
+// ?granularity=minute|hour|day (default hour), optional processType and field,
+// ?from=/?to= on the bucket start. Rows are oldest first, with mean = sum / count;
+// X-More: true when more than MAX_ROLLUP_ROWS rows matched.
+router.get('/rollups', async (req, res) => {
+  let filters;
+  try {
+    filters = buildRollupFilters({ granularity: 'hour', ...req.query });
+  } catch (err) {
+    return res.status(400).json({ message: err.message });
+  }
+  try {
+    const rows = await SensorRollup.find(filters, { _id: 0, rebuiltAt: 0 })
+      .sort({ bucketStart: 1, processType: 1, field: 1 })
+      .limit(MAX_ROLLUP_ROWS + 1)
+      .lean();
+    if (rows.length > MAX_ROLLUP_ROWS) {
+      rows.pop();
+      res.set('X-More', 'true');
+    }
+    res.status(200).json(rows.map(row => ({ ...row, mean: row.count ? row.sum / row.count : null })));
+  } catch (err) {
+    console.error('❌ Rollup query failed:', err.message);
+    res.status(500).json({ message: err.message });
+  }
+});
+
+// PUT recomputed rollups for a window of whole UTC days (testing/rollup_rebuild.py)
+// Body: { from, to, asOf, rows: [{ granularity, bucketStart, processType, field, count, sum, min, max }] }
+// rows must cover exactly the items of the window created at or before asOf
+// (a ?since=now cursor time taken before the job read the window); items
+// created later are folded in here. Every row in the window is replaced; rows
+// of the window that are not sent and get no late items are deleted.
+router.put('/rollups', async (req, res) => {
+  const body = req.body && typeof req.body === 'object' && !Array.isArray(req.body) ? req.body : {};
+  const { rows } = body;
+  let window;
+  let asOf;
+  try {
+    window = buildRollupFilters({ from: body.from, to: body.to }).bucketStart;
+    const dayMs = SensorRollup.GRANULARITIES.day;
+    if (!window?.$gte || !window.$lt
+      || window.$gte.getTime() % dayMs !== 0 || window.$lt.getTime() % dayMs !== 0) {
+      throw new Error('from and to must both be UTC midnights');
+    }
+    if (body.asOf === undefined || body.asOf === null) throw new Error('asOf is required');
+    asOf = parseTimeBound('asOf', String(body.asOf));
+    if (!Array.isArray(rows) || rows.length > MAX_ROLLUP_REBUILD_ROWS) {
+      throw new Error(`rows must be an array of at most ${MAX_ROLLUP_REBUILD_ROWS} rollups`);
+    }
+    rows.forEach((row, index) => {
+      const validationError = new SensorRollup(row).validateSync();
+      if (validationError) throw new Error(`rows[${index}]: ${validationError.message}`);
+      const start = new Date(row.bucketStart);
+      if (start < window.$gte || start >= window.$lt
+        || SensorRollup.bucketStart(start, row.granularity).getTime() !== start.getTime()) {
+        throw new Error(`rows[${index}]: bucketStart is not a ${row.granularity} bucket inside the window`);
+      }
+    });
+  } catch (err) {
+    return res.status(400).json({ message: err.message });
+  }
+
+  try {
+    const result = await withRollupsExclusive(async () => {
+      const buckets = new Map(rows.map(row => {
+        const filter = {
+          granularity: row.granularity,
+          processType: row.processType,
+          field: row.field,
+          bucketStart: new Date(row.bucketStart)
+        };
+        return [SensorRollup.rowKey(filter), { filter, count: row.count, sum: row.sum, min: row.min, max: row.max }];
+      }));
+
+      // Items inserted after asOf already incremented the rows being replaced
+      const rollupFields = Object.fromEntries(
+        ['processType', 'timestamp', ...SensorRollup.ROLLUP_FIELDS.map(field => `${field}.value`)]
+          .map(path => [path, 1]));
+      const lateItems = await Item.find({ timestamp: window, createdAt: { $gt: asOf } }, rollupFields).lean();
+      SensorRollup.combineItems(lateItems).forEach((late, key) => {
+        const bucket = buckets.get(key);
+        if (!bucket) return buckets.set(key, late);
+        bucket.count += late.count;
+        bucket.sum += late.sum;
+        bucket.min = Math.min(bucket.min, late.min);
+        bucket.max = Math.max(bucket.max, late.max);
+      });
+
+      const rebuiltAt = new Date();
+      if (buckets.size > 0) {
+        await SensorRollup.bulkWrite([...buckets.values()].map(({ filter, count, sum, min, max }) => ({
+          replaceOne: {
+            filter,
+            replacement: { ...filter, count, sum, min, max, rebuiltAt },
+            upsert: true
+          }
+        })), { ordered: false });
+      }
+      const { deletedCount } = await SensorRollup.deleteMany({
+        bucketStart: window,
+        rebuiltAt: { $ne: rebuiltAt }
+      });
+      return { replaced: buckets.size, deleted: deletedCount, lateItems: lateItems.length };
+    });
+    res.status(200).json(result);
+  } catch (err) {
+    console.error('❌ Rollup rebuild failed:', err.message);
+    res.status(500).json({ message: err.message });
+  }
+});
+
 // PUT update item (supports nested fields)
 router.put('/:id', async (req, res) => {
   try {
@@ -134,7 +948,13 @@ router.put('/:id', async (req, res) => {
       }
     });
 
-    const updated = await existing.save();
+    const writeHandle = beginWrite();
+    let updated;
+    try {
+      updated = await existing.save();
+    } finally {
+      endWrite(writeHandle);
+    }
     res.status(200).json(updated);
   } catch (err) {
     console.error('❌ Update failed:', err.message);
@@ -143,12 +963,24 @@ router.put('/:id', async (req, res) => {
 });
 
 // DELETE item
+// Leaves a tombstone (models/DeletedItem.js) so ?since= pollers see the deletion
 router.delete('/:id', async (req, res) => {
+  const writeHandle = beginWrite();
   try {
-    await Item.findByIdAndDelete(req.params.id);
+    const deleted = await Item.findByIdAndDelete(req.params.id);
+    if (deleted) {
+      const { processType, operator, statusCode, productId, timestamp } = deleted;
+      await DeletedItem.replaceOne(
+        { _id: deleted._id },
+        { processType, operator, statusCode, productId, timestamp, deletedAt: new Date() },
+        { upsert: true }
+      );
+    }
     res.status(200).json({ message: 'Item deleted' });
   } catch (err) {
     res.status(400).json({ message: err.message });
+  } finally {
+    endWrite(writeHandle);
   }
 });
 
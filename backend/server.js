@@ -10,8 +10,8 @@ dotenv.config();
 const app = express();
 
 // Middleware
-app.use(express.json());
-app.use(cors());
+app.use(express.json({ limit: '10mb' })); // Room for POST /api/items/bulk batches
+app.use(cors({ exposedHeaders: ['X-Total-Count', 'X-Next-Cursor', 'X-Since-Cursor', 'X-More'] }));
 app.use(morgan('dev')); // Logs incoming HTTP requests
 
 // MongoDB connection with logs
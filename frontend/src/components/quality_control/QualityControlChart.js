@@ -1,8 +1,11 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useEffect } from 'react';
 import {
   PieChart, Pie, Cell, ResponsiveContainer, Tooltip, Legend,
   BarChart, Bar, XAxis, YAxis, CartesianGrid, LineChart, Line
 } from 'recharts';
+import { getQualityStats } from '../../utils/api';
+
+const STATS_REFRESH_INTERVAL_SECONDS = 15;
 
 const DECISION_COLORS = {
   'Yes': '#10b981',      // Green
@@ -25,171 +28,90 @@ const REWORK_SUCCESS_COLORS = {
   'No': '#ef4444'        // Red
 };
 
-function QualityControlChart({ items }) {
+function QualityControlChart() {
   // State for toggling between pass rate and defect rate
   const [showPassRate, setShowPassRate] = useState(false);
-  // Memoize expensive calculations to improve performance
-  const chartData = useMemo(() => {
-    // Prepare decision data
-    const decisionCounts = items.reduce((acc, item) => {
-      const decision = item.decision || 'Unknown';
-      acc[decision] = (acc[decision] || 0) + 1;
-      return acc;
-    }, {});    // Ensure consistent order: Pass, Fail, Goes to Rework
-    const decisionOrder = ['Yes', 'No', 'Goes to Rework'];
-    const decisionData = decisionOrder
-      .filter(key => decisionCounts[key] > 0)
-      .map(key => ({
-        name: key === 'Yes' ? 'Pass' : key === 'No' ? 'Fail' : key, // Map Yes to Pass and No to Fail
-        value: decisionCounts[key],
-        color: DECISION_COLORS[key] || '#9ca3af'
-      }));
-
-    // Prepare reworked data (exclude N/A values)
-    const reworkedCounts = items.reduce((acc, item) => {
-      const reworked = item.reworked || 'No';
-      // Only count Yes and No values, exclude N/A
-      if (reworked === 'Yes' || reworked === 'No') {
-        acc[reworked] = (acc[reworked] || 0) + 1;
-      }
-      return acc;
-    }, {});    // Ensure consistent order: Yes, No
-    const reworkedOrder = ['Yes', 'No'];
-    const reworkedData = reworkedOrder
-      .filter(key => reworkedCounts[key] > 0)
-      .map(key => ({
-        name: key,
-        value: reworkedCounts[key],
-        color: REWORKED_COLORS[key] || '#9ca3af'
-      }));
-
-    // Prepare yield data (only Yes and No from decision field)
-    const yieldCounts = items.reduce((acc, item) => {
-      const decision = item.decision;
-      if (decision === 'Yes' || decision === 'No') {
-        acc[decision] = (acc[decision] || 0) + 1;
-      }
-      return acc;
-    }, {});    // Ensure consistent order: Pass, Fail
-    const yieldOrder = ['Yes', 'No'];
-    const yieldData = yieldOrder
-      .filter(key => yieldCounts[key] > 0)
-      .map(key => ({
-        name: key === 'Yes' ? 'Pass' : 'Fail', // Map Yes to Pass and No to Fail
-        value: yieldCounts[key],
-        color: YIELD_COLORS[key] || '#9ca3af'
-      }));
-
-    // Prepare reworked success data (only records with Reworked = Yes, then their rework outcome)
-    const reworkedItems = items.filter(item => item.reworked === 'Yes');
-    const reworkedSuccessCounts = reworkedItems.reduce((acc, item) => {
-      const outcome = item.reworkOutcome || item.decision; // Fallback to decision if reworkOutcome not available
-      if (outcome === 'Yes' || outcome === 'No') {
-        acc[outcome] = (acc[outcome] || 0) + 1;
-      }
-      return acc;
-    }, {});    // Ensure consistent order: Success, Scrap
-    const reworkedSuccessOrder = ['Yes', 'No'];
-    const reworkedSuccessData = reworkedSuccessOrder
-      .filter(key => reworkedSuccessCounts[key] > 0)
-      .map(key => ({
-        name: key === 'Yes' ? 'Success' : 'Scrap', // Map Yes to Success and No to Scrap
-        value: reworkedSuccessCounts[key],
-        color: REWORK_SUCCESS_COLORS[key] || '#9ca3af'
-      }));
-
-    return {
-      decisionData,
-      reworkedData,
-      yieldData,
-      reworkedSuccessData,
-      reworkedItems
+  // Metrics are aggregated by the backend (GET /api/items/stats/quality)
+  // and refetched on their own interval, independent of the dashboard's items
+  const [stats, setStats] = useState(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    const fetchStats = () => {
+      getQualityStats()
+        .then(data => {
+          if (!cancelled) setStats(data);
+        })
+        .catch(err => console.error('Failed to fetch quality stats:', err.message));
     };
-  }, [items]);
-  const { decisionData, reworkedData, yieldData, reworkedSuccessData } = chartData;
-
-  // Prepare cause of failure data
-  const causeOfFailureCounts = items.reduce((acc, item) => {
-    if (item.causeOfFailure && Array.isArray(item.causeOfFailure)) {
-      item.causeOfFailure.forEach(cause => {
-        acc[cause] = (acc[cause] || 0) + 1;
-      });
-    }
-    return acc;
-  }, {});
-
-  const causeOfFailureData = Object.entries(causeOfFailureCounts)
-    .map(([key, value]) => ({
-      name: key,
-      count: value
-    }))
-    .sort((a, b) => b.count - a.count); // Sort by count descending
+    fetchStats();
+    const interval = setInterval(fetchStats, STATS_REFRESH_INTERVAL_SECONDS * 1000);
+    return () => {
+      cancelled = true;
+      clearInterval(interval);
+    };
+  }, []);
 
-  // Prepare affected output data
-  const affectedOutputCounts = items.reduce((acc, item) => {
-    if (item.affectedOutput && Array.isArray(item.affectedOutput)) {
-      item.affectedOutput.forEach(output => {
-        acc[output] = (acc[output] || 0) + 1;
-      });
-    }
-    return acc;
-  }, {});
+  if (!stats) {
+    return (
+      <div className="bg-white rounded-lg shadow p-6">
+        <h3 className="text-lg font-semibold mb-4">📊 Quality Control Analytics</h3>
+        <div className="flex items-center justify-center h-64 text-gray-500">
+          Loading quality metrics...
+        </div>
+      </div>
+    );
+  }
+
+  // Ensure consistent order: Pass, Fail, Goes to Rework
+  const decisionOrder = ['Yes', 'No', 'Goes to Rework'];
+  const decisionData = decisionOrder
+    .filter(key => stats.decisions[key] > 0)
+    .map(key => ({
+      name: key === 'Yes' ? 'Pass' : key === 'No' ? 'Fail' : key, // Map Yes to Pass and No to Fail
+      value: stats.decisions[key],
+      color: DECISION_COLORS[key] || '#9ca3af'
+    }));
 
-  const affectedOutputData = Object.entries(affectedOutputCounts)
-    .map(([key, value]) => ({
+  // Reworked data (N/A values are not counted by the backend)
+  const reworkedOrder = ['Yes', 'No'];
+  const reworkedData = reworkedOrder
+    .filter(key => stats.reworked[key] > 0)
+    .map(key => ({
       name: key,
-      count: value
-    }))
-    .sort((a, b) => b.count - a.count); // Sort by count descending  // Get all unique operators
-  const allOperators = [...new Set(items.map(item => item.operator).filter(Boolean))];
-
-  // Get all unique causes of failure
-  const allCauses = [...new Set(items.flatMap(item => 
-    item.causeOfFailure && Array.isArray(item.causeOfFailure) ? item.causeOfFailure : []
-  ))];
-
-  // Get all unique affected outputs
-  const allOutputs = [...new Set(items.flatMap(item => 
-    item.affectedOutput && Array.isArray(item.affectedOutput) ? item.affectedOutput : []
-  ))];
+      value: stats.reworked[key],
+      color: REWORKED_COLORS[key] || '#9ca3af'
+    }));
 
-  // Prepare cause of failure data by operator (grouped bar chart format)
-  const causeOfFailureByOperatorData = allOperators.map(operator => {
-    const operatorItems = items.filter(item => item.operator === operator);
-    const operatorCauseCounts = operatorItems.reduce((acc, item) => {
-      if (item.causeOfFailure && Array.isArray(item.causeOfFailure)) {
-        item.causeOfFailure.forEach(cause => {
-          acc[cause] = (acc[cause] || 0) + 1;
-        });
-      }
-      return acc;
-    }, {});
+  // Yield data (only Yes and No from decision field)
+  const yieldOrder = ['Yes', 'No'];
+  const yieldData = yieldOrder
+    .filter(key => stats.decisions[key] > 0)
+    .map(key => ({
+      name: key === 'Yes' ? 'Pass' : 'Fail', // Map Yes to Pass and No to Fail
+      value: stats.decisions[key],
+      color: YIELD_COLORS[key] || '#9ca3af'
+    }));
 
-    const dataPoint = { operator: operator };
-    allCauses.forEach(cause => {
-      dataPoint[cause] = operatorCauseCounts[cause] || 0;
-    });
-    return dataPoint;
-  });
+  // Reworked success data (outcome of records with Reworked = Yes)
+  const reworkedSuccessOrder = ['Yes', 'No'];
+  const reworkedSuccessData = reworkedSuccessOrder
+    .filter(key => stats.reworkOutcome[key] > 0)
+    .map(key => ({
+      name: key === 'Yes' ? 'Success' : 'Scrap', // Map Yes to Success and No to Scrap
+      value: stats.reworkOutcome[key],
+      color: REWORK_SUCCESS_COLORS[key] || '#9ca3af'
+    }));
 
-  // Prepare affected output data by operator (grouped bar chart format)
-  const affectedOutputByOperatorData = allOperators.map(operator => {
-    const operatorItems = items.filter(item => item.operator === operator);
-    const operatorOutputCounts = operatorItems.reduce((acc, item) => {
-      if (item.affectedOutput && Array.isArray(item.affectedOutput)) {
-        item.affectedOutput.forEach(output => {
-          acc[output] = (acc[output] || 0) + 1;
-        });
-      }
-      return acc;
-    }, {});
+  // Cause of failure and affected output, sorted by count descending
+  const causeOfFailureData = stats.causeOfFailure;
+  const affectedOutputData = stats.affectedOutput;
+  const allCauses = stats.causes;
+  const allOutputs = stats.outputs;
 
-    const dataPoint = { operator: operator };
-    allOutputs.forEach(output => {
-      dataPoint[output] = operatorOutputCounts[output] || 0;
-    });
-    return dataPoint;
-  });
+  // Per-operator counts (grouped bar chart format)
+  const causeOfFailureByOperatorData = stats.causeOfFailureByOperator;
+  const affectedOutputByOperatorData = stats.affectedOutputByOperator;
   // Define colors for different causes/outputs
   const CHART_COLORS = [
     '#ef4444', // Red
@@ -204,142 +126,23 @@ function QualityControlChart({ items }) {
     '#14b8a6', // Teal
   ];
 
-  // Prepare defect rate vs speed data
-  const speedDefectData = items
-    .filter(item => item.speed && item.speed.value && item.decision)
-    .map(item => ({
-      speed: parseFloat(item.speed.value),
-      isDefect: item.decision === 'No' || item.decision === 'Goes to Rework' ? 1 : 0
-    }))
-    .sort((a, b) => a.speed - b.speed);
-
-  // Group by speed ranges and calculate defect rate
-  const speedRanges = {};
-  speedDefectData.forEach(item => {
-    const speedRange = Math.floor(item.speed / 2) * 2; // Group by 2 mm/s ranges
-    if (!speedRanges[speedRange]) {
-      speedRanges[speedRange] = { total: 0, defects: 0 };
-    }
-    speedRanges[speedRange].total++;
-    speedRanges[speedRange].defects += item.isDefect;
-  });
-  const speedDefectRateData = Object.entries(speedRanges)
-    .map(([speed, data]) => ({
-      speed: parseFloat(speed),
-      defectRate: data.total > 0 ? (data.defects / data.total) * 100 : 0,
-      passRate: data.total > 0 ? ((data.total - data.defects) / data.total) * 100 : 0,
-      totalSamples: data.total
-    }))
-    .filter(item => item.totalSamples >= 2) // Only include ranges with at least 2 samples
-    .sort((a, b) => a.speed - b.speed);
-
-  // Prepare defect rate vs temperature data
-  const temperatureDefectData = items
-    .filter(item => item.temperature && item.temperature.value && item.decision)
-    .map(item => ({
-      temperature: parseFloat(item.temperature.value),
-      isDefect: item.decision === 'No' || item.decision === 'Goes to Rework' ? 1 : 0
-    }))
-    .sort((a, b) => a.temperature - b.temperature);
-
-  // Group by temperature ranges and calculate defect rate
-  const temperatureRanges = {};
-  temperatureDefectData.forEach(item => {
-    const tempRange = Math.floor(item.temperature); // Group by 1°C ranges
-    if (!temperatureRanges[tempRange]) {
-      temperatureRanges[tempRange] = { total: 0, defects: 0 };
-    }
-    temperatureRanges[tempRange].total++;
-    temperatureRanges[tempRange].defects += item.isDefect;
-  });  const temperatureDefectRateData = Object.entries(temperatureRanges)
-    .map(([temp, data]) => ({
-      temperature: parseFloat(temp),
-      defectRate: data.total > 0 ? (data.defects / data.total) * 100 : 0,
-      passRate: data.total > 0 ? ((data.total - data.defects) / data.total) * 100 : 0,
-      totalSamples: data.total
-    }))
-    .filter(item => item.totalSamples >= 2) // Only include ranges with at least 2 samples
-    .sort((a, b) => a.temperature - b.temperature);
-  // Prepare heatmap data (Temperature vs Speed)
-  const heatmapData = items
-    .filter(item => 
-      item.temperature && item.temperature.value && 
-      item.speed && item.speed.value && 
-      item.decision
-    )
-    .map(item => ({
-      temperature: Math.floor(parseFloat(item.temperature.value)),
-      speed: Math.floor(parseFloat(item.speed.value) / 2) * 2, // Group by 2 mm/s ranges
-      isDefect: item.decision === 'No' || item.decision === 'Goes to Rework' ? 1 : 0
-    }));
-
-  // Group by temperature and speed ranges for heatmap
-  const heatmapRanges = {};
-  heatmapData.forEach(item => {
-    const key = `${item.temperature}-${item.speed}`;
-    if (!heatmapRanges[key]) {
-      heatmapRanges[key] = { 
-        temperature: item.temperature, 
-        speed: item.speed, 
-        total: 0, 
-        defects: 0 
-      };
-    }
-    heatmapRanges[key].total++;
-    heatmapRanges[key].defects += item.isDefect;
-  });  // Memoize binned data calculations for better performance
-  const binnedAnalysisData = useMemo(() => {
-    const createBinnedData = (items, field, binSize) => {
-      const filteredItems = items.filter(item => 
-        item[field] && item[field].value && item.decision
-      );
-      
-      if (filteredItems.length === 0) return [];
-        const values = filteredItems.map(item => parseFloat(item[field].value));
-      const minVal = Math.min(...values);
-      
-      const bins = {};
-      
-      filteredItems.forEach(item => {
-        const value = parseFloat(item[field].value);
-        const binStart = Math.floor((value - minVal) / binSize) * binSize + minVal;
-        const binEnd = binStart + binSize;
-        const binLabel = `${binStart.toFixed(1)}-${binEnd.toFixed(1)}`;
-        
-        if (!bins[binLabel]) {
-          bins[binLabel] = { total: 0, defects: 0, binStart: binStart };
-        }
-        bins[binLabel].total++;
-        if (item.decision === 'No' || item.decision === 'Goes to Rework') {
-          bins[binLabel].defects++;
-        }
-      });
-      
-      return Object.entries(bins)
-        .map(([label, data]) => ({
-          bin: label,
-          binStart: data.binStart,
-          defectRate: (data.defects / data.total) * 100,
-          passRate: ((data.total - data.defects) / data.total) * 100,
-          totalSamples: data.total
-        }))
-        .filter(item => item.totalSamples >= 2)
-        .sort((a, b) => a.binStart - b.binStart);
-    };
+  // Defect rate by 2 mm/s speed range and 1°C temperature range
+  const speedDefectRateData = stats.speedDefectRate;
+  const temperatureDefectRateData = stats.temperatureDefectRate;
 
-    return {
-      temperatureBinData: createBinnedData(items, 'temperature', 2), // 2°C bins
-      speedBinData: createBinnedData(items, 'speed', 5), // 5 mm/s bins
-      squeegeeSpeedBinData: createBinnedData(items, 'squeegeeSpeed', 5), // 5 mm/s bins
-      printPressureBinData: createBinnedData(items, 'printPressure', 1000), // 1000 N/m² bins
-      inkViscosityBinData: createBinnedData(items, 'inkViscosity', 2) // 2 cP bins
-    };  }, [items]);
-  const { temperatureBinData, speedBinData, squeegeeSpeedBinData, printPressureBinData, inkViscosityBinData } = binnedAnalysisData;
+  // Binned pass/defect rates (2°C, 5 mm/s, 1000 N/m² and 2 cP bins)
+  const {
+    temperature: temperatureBinData,
+    speed: speedBinData,
+    squeegeeSpeed: squeegeeSpeedBinData,
+    printPressure: printPressureBinData,
+    inkViscosity: inkViscosityBinData
+  } = stats.bins;
 
 const CustomTooltip = ({ active, payload }) => {
     if (active && payload && payload.length) {
       const data = payload[0];
-      const percentage = items.length > 0 ? ((data.value / items.length) * 100).toFixed(1) : 0;
+      const percentage = stats.total > 0 ? ((data.value / stats.total) * 100).toFixed(1) : 0;
       return (
         <div className="bg-white p-3 border rounded shadow-lg">
           <p className="font-medium">{data.name}</p>
@@ -488,7 +291,7 @@ const CustomTooltip = ({ active, payload }) => {
     return totalReworkItems > 0 ? ((value / totalReworkItems) * 100).toFixed(1) : 0;
   };
 
-  if (items.length === 0) {
+  if (stats.total === 0) {
     return (
       <div className="bg-white rounded-lg shadow p-6">
         <h3 className="text-lg font-semibold mb-4">📊 Quality Control Analytics</h3>
@@ -606,7 +409,7 @@ const CustomTooltip = ({ active, payload }) => {
                 height={36}
                 formatter={(value, entry) => (
                   <span style={{ color: entry.color }}>
-                    {value} ({calculatePercentage(entry.payload.value, items.length)}%)
+                    {value} ({calculatePercentage(entry.payload.value, stats.total)}%)
                   </span>
                 )}
               />
@@ -1107,7 +910,7 @@ const CustomTooltip = ({ active, payload }) => {
       </div>
       
       {/* <div className="mt-6 text-sm text-gray-600 text-center">
-        Total Records: {items.length} | Yield Records: {yieldData.reduce((sum, item) => sum + item.value, 0)} | Reworked Items: {reworkedItems.length}
+        Total Records: {stats.total} | Yield Records: {yieldData.reduce((sum, item) => sum + item.value, 0)} | Reworked Items: {stats.reworked.Yes}
       </div> */}
     </div>
   );
@@ -1,32 +1,71 @@
-import React, { useState, useEffect } from 'react';
-import { getItems, createItem, updateItem } from '../../utils/api';
+import React, { useState, useEffect, useRef } from 'react';
+import { getItems, getItemPage, getItemChanges, createItem, updateItem } from '../../utils/api';
 import { toast } from 'react-toastify';
 import Header from '../common/Header';
 import DataTable from '../common/DataTable';
 import QualityControlForm from './QualityControlForm';
 import QualityControlChart from './QualityControlChart';
 import LiveSensorChart from './LiveSensorChart';
+import SensorTrendChart from './SensorTrendChart';
 import LatestSensorValues from './LatestSensorValues';
 import LatestQualityMetrics from './LatestQualityMetrics';
 
 const REFRESH_INTERVAL_SECONDS = 5;
+// The first fetch loads every QC report but only the newest sensor readings,
+// which is all the live sensor views show
+const RECENT_ITEMS_LIMIT = 1000;
+
+// Replace changed items by _id, add new ones and drop deleted ones
+// (change-feed tombstones { _id, deleted: true }), keeping newest first.
+// Every QC report is kept, other items only up to RECENT_ITEMS_LIMIT.
+function mergeChanges(items, changes) {
+  const changed = new Map(changes.map(item => [item._id, item]));
+  let sensorItems = 0;
+  return [...changed.values(), ...items.filter(item => !changed.has(item._id))]
+    .filter(item => !item.deleted)
+    .sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp))
+    .filter(item => item.processType === 'QualityControl' || ++sensorItems <= RECENT_ITEMS_LIMIT);
+}
 
 function QualityControlDashboard({ user, onLogout }) {
   const [items, setItems] = useState([]);
+  const [totalCount, setTotalCount] = useState(null); // Items in the collection, not only the loaded ones
   const [loading, setLoading] = useState(false);
   const [lastUpdate, setLastUpdate] = useState(new Date());
   const [currentView, setCurrentView] = useState('form'); // 'form', 'analytics', 'liveSensors'
+  const sinceRef = useRef(null); // Change-feed position after the last fetch
 
+  // The first fetch loads every QC report plus the newest items of every process;
+  // later polls only download the items created or updated since the previous one
   const fetchItems = async (showLoading = false) => {
     try {
       if (showLoading) setLoading(true);
-      const data = await getItems();      // Get all items with sensor data (Silvering, Streeting, or QualityControl)
-      const sensorData = data.filter(item => 
-        item.processType === 'QualityControl' || 
-        item.processType === 'Silvering' || 
-        item.processType === 'Streeting'
-      );
-      setItems(sensorData);
+      if (sinceRef.current === null) {
+        // Take the feed position first so nothing written during the first load is missed
+        const { since } = await getItemChanges('now');
+        const [recent, qcReports] = await Promise.all([
+          getItemPage({ limit: RECENT_ITEMS_LIMIT }),
+          getItems({ processType: 'QualityControl' })
+        ]);
+        setItems(mergeChanges(recent.items, qcReports));
+        setTotalCount(recent.total);
+        sinceRef.current = since;
+      } else {
+        let changes = [];
+        let page;
+        do {
+          page = await getItemChanges(sinceRef.current);
+          changes = changes.concat(page.items);
+          sinceRef.current = page.since;
+        } while (page.more);
+        if (changes.length > 0) {
+          setItems(prev => mergeChanges(prev, changes));
+          // Inserts arrive with createdAt === updatedAt, deletions as tombstones
+          const inserted = changes.filter(item => !item.deleted && item.createdAt === item.updatedAt).length;
+          const deleted = changes.filter(item => item.deleted).length;
+          setTotalCount(prev => prev + inserted - deleted);
+        }
+      }
       setLastUpdate(new Date());
     } catch (err) {
       toast.error('Failed to fetch data');
@@ -77,9 +116,7 @@ function QualityControlDashboard({ user, onLogout }) {
       if (existingRecord) {
         // Update existing record
         result = await updateItem(existingRecord._id, payload);
-        setItems(prev => prev.map(item => 
-          item._id === existingRecord._id ? result : item
-        ));
+        setItems(prev => mergeChanges(prev, [result]));
         toast.success('Quality Control report updated successfully!');
       } else {
         // Create new record
@@ -200,7 +237,7 @@ function QualityControlDashboard({ user, onLogout }) {
                   <div className="text-sm text-gray-600 space-y-1">
                     <div className="flex justify-between">
                       <span>Records:</span>
-                      <span className="font-medium">{items.length}</span>
+                      <span className="font-medium">{totalCount === null ? items.length : totalCount}</span>
                     </div>
                     <div className="flex justify-between">
                       <span>Updated:</span>
@@ -227,9 +264,7 @@ function QualityControlDashboard({ user, onLogout }) {
             />
 
             {/* Charts Section */}
-            <QualityControlChart 
-              items={items.filter(item => item.processType === 'QualityControl')}
-            />
+            <QualityControlChart />
 
             {/* Table Section */}
             <DataTable 
@@ -260,7 +295,7 @@ function QualityControlDashboard({ user, onLogout }) {
                   <div className="text-sm text-gray-600 space-y-1">
                     <div className="flex justify-between">
                       <span>Records:</span>
-                      <span className="font-medium">{items.length}</span>
+                      <span className="font-medium">{totalCount === null ? items.length : totalCount}</span>
                     </div>
                     <div className="flex justify-between">
                       <span>Updated:</span>
@@ -288,6 +323,9 @@ function QualityControlDashboard({ user, onLogout }) {
 
             {/* Live Sensor Chart Section */}
             <LiveSensorChart items={items} />
+
+            {/* Long-range trends from the sensor rollups */}
+            <SensorTrendChart />
           </div>
         )}
       </div>
@@ -0,0 +1,135 @@
+import React, { useState, useEffect } from 'react';
+import {
+  LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, Legend, ResponsiveContainer
+} from 'recharts';
+import { getRollups } from '../../utils/api';
+
+const TREND_REFRESH_INTERVAL_SECONDS = 60;
+
+// Sensor fields kept in the rollups (backend/models/SensorRollup.js)
+const SENSOR_FIELDS = {
+  temperature: { label: 'Temperature', unit: '°C' },
+  speed: { label: 'Speed', unit: 'mm/s' },
+  squeegeeSpeed: { label: 'Squeegee Speed', unit: 'mm/s' },
+  printPressure: { label: 'Print Pressure', unit: 'N/m²' },
+  inkViscosity: { label: 'Ink Viscosity', unit: 'cP' }
+};
+
+// Time ranges and the rollup granularity that keeps each one to a few hundred points
+const RANGES = {
+  '24h': { label: 'Last 24 hours', hours: 24, granularity: 'hour' },
+  '7d': { label: 'Last 7 days', hours: 7 * 24, granularity: 'hour' },
+  '90d': { label: 'Last 90 days', hours: 90 * 24, granularity: 'day' }
+};
+
+const PROCESS_COLORS = {
+  Silvering: '#3b82f6',
+  Streeting: '#10b981'
+};
+
+function SensorTrendChart() {
+  const [field, setField] = useState('temperature');
+  const [range, setRange] = useState('7d');
+  const [rows, setRows] = useState(null);
+
+  // Long-range trends come from the pre-aggregated rollups, never the raw readings
+  useEffect(() => {
+    let cancelled = false;
+    const { hours, granularity } = RANGES[range];
+    const fetchTrend = () => {
+      getRollups({ granularity, field, from: Date.now() - hours * 60 * 60 * 1000 })
+        .then(data => {
+          if (!cancelled) setRows(data);
+        })
+        .catch(err => console.error('Failed to fetch sensor trend:', err.message));
+    };
+    fetchTrend();
+    const interval = setInterval(fetchTrend, TREND_REFRESH_INTERVAL_SECONDS * 1000);
+    return () => {
+      cancelled = true;
+      clearInterval(interval);
+    };
+  }, [field, range]);
+
+  // One point per bucket with the mean of each processType
+  const processTypes = [...new Set((rows || []).map(row => row.processType))].sort();
+  const points = new Map();
+  (rows || []).forEach(row => {
+    const time = new Date(row.bucketStart);
+    if (!points.has(row.bucketStart)) {
+      points.set(row.bucketStart, {
+        time: RANGES[range].granularity === 'day' ? time.toLocaleDateString() : time.toLocaleString(),
+        counts: {}
+      });
+    }
+    const point = points.get(row.bucketStart);
+    point[row.processType] = row.mean === null ? null : Number(row.mean.toFixed(2));
+    point.counts[row.processType] = row.count;
+  });
+  const chartData = [...points.values()];
+  const { label, unit } = SENSOR_FIELDS[field];
+
+  return (
+    <div className="bg-white rounded-lg shadow p-6">
+      <div className="flex justify-between items-center mb-6">
+        <h3 className="text-lg font-semibold">📈 Sensor Trends</h3>
+        <div className="flex items-center space-x-4">
+          <select
+            value={field}
+            onChange={(e) => setField(e.target.value)}
+            className="text-sm border border-gray-300 rounded px-2 py-1"
+          >
+            {Object.entries(SENSOR_FIELDS).map(([name, config]) => (
+              <option key={name} value={name}>{config.label}</option>
+            ))}
+          </select>
+          <select
+            value={range}
+            onChange={(e) => setRange(e.target.value)}
+            className="text-sm border border-gray-300 rounded px-2 py-1"
+          >
+            {Object.entries(RANGES).map(([name, config]) => (
+              <option key={name} value={name}>{config.label}</option>
+            ))}
+          </select>
+        </div>
+      </div>
+
+      {rows === null ? (
+        <div className="flex items-center justify-center h-64 text-gray-500">
+          Loading sensor trends...
+        </div>
+      ) : chartData.length === 0 ? (
+        <div className="flex items-center justify-center h-64 text-gray-500">
+          No {label.toLowerCase()} readings in this range
+        </div>
+      ) : (
+        <ResponsiveContainer width="100%" height={350}>
+          <LineChart data={chartData} margin={{ top: 10, right: 30, left: 10, bottom: 30 }}>
+            <CartesianGrid strokeDasharray="3 3" />
+            <XAxis dataKey="time" tick={{ fontSize: 10 }} angle={-30} textAnchor="end" height={60} />
+            <YAxis tick={{ fontSize: 10 }} unit={` ${unit}`} width={90} domain={['auto', 'auto']} />
+            <Tooltip
+              formatter={(value, name, item) =>
+                [`${value} ${unit} (mean of ${item.payload.counts[name]} readings)`, name]}
+            />
+            <Legend />
+            {processTypes.map(processType => (
+              <Line
+                key={processType}
+                type="monotone"
+                dataKey={processType}
+                stroke={PROCESS_COLORS[processType] || '#8b5cf6'}
+                dot={false}
+                connectNulls
+                isAnimationActive={false}
+              />
+            ))}
+          </LineChart>
+        </ResponsiveContainer>
+      )}
+    </div>
+  );
+}
+
+export default SensorTrendChart;
@@ -16,8 +16,7 @@ function SilveringDashboard({ user, onLogout }) {
   const fetchItems = async (showLoading = false) => {
     try {
       if (showLoading) setLoading(true);
-      const data = await getItems();
-      const silveringData = data.filter(item => item.processType === 'Silvering');
+      const silveringData = await getItems({ processType: 'Silvering' });
       setItems(silveringData);
       setLastUpdate(new Date());
     } catch (err) {
@@ -16,8 +16,7 @@ function StreetingDashboard({ user, onLogout }) {
   const fetchItems = async (showLoading = false) => {
     try {
       if (showLoading) setLoading(true);
-      const data = await getItems();
-      const streetingData = data.filter(item => item.processType === 'Streeting');
+      const streetingData = await getItems({ processType: 'Streeting' });
       setItems(streetingData);
       setLastUpdate(new Date());
     } catch (err) {
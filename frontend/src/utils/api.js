@@ -2,11 +2,33 @@ import axios from 'axios';
 
 const BASE = 'http://localhost:5050/api';
 
-export const getItems = async () => {
-  const res = await axios.get(`${BASE}/items`);
+// params: processType, operator, statusCode, productId, from/to (time window),
+// fields (comma-separated projection), limit/cursor (paging)
+export const getItems = async (params = {}) => {
+  const res = await axios.get(`${BASE}/items`, { params });
   return res.data;
 };
 
+// First page of items (params need a limit): returns { items, total }, where
+// total (X-Total-Count) counts every item matching params
+export const getItemPage = async (params = {}) => {
+  const res = await axios.get(`${BASE}/items`, { params });
+  return { items: res.data, total: Number(res.headers['x-total-count']) };
+};
+
+// Items created, updated or deleted after a change-feed position ('now' to
+// start one); deleted items come as { _id, deleted: true, updatedAt }.
+// Returns { items, since, more }: pass since to the next call, and call again
+// right away while more is true.
+export const getItemChanges = async (since, params = {}) => {
+  const res = await axios.get(`${BASE}/items`, { params: { ...params, since } });
+  return {
+    items: res.data,
+    since: res.headers['x-since-cursor'],
+    more: res.headers['x-more'] === 'true'
+  };
+};
+
 export const createItem = async (item) => {
   const res = await axios.post(`${BASE}/items`, item);
   return res.data;
@@ -20,4 +42,19 @@ export const updateItem = async (id, item) => {
 export const deleteItem = async (id) => {
   const res = await axios.delete(`${BASE}/items/${id}`);
   return res.data;
-};
\ No newline at end of file
+};
+
+// QC dashboard metrics aggregated by the backend: decision, rework and
+// cause-of-failure counts plus defect rates by sensor value
+export const getQualityStats = async (processType = 'QualityControl') => {
+  const res = await axios.get(`${BASE}/items/stats/quality`, { params: { processType } });
+  return res.data;
+};
+
+// Pre-aggregated sensor rollups for trend charts (SensorTrendChart): params granularity
+// (minute/hour/day), processType, field, from/to. Rows have count, sum,
+// min, max and mean per bucket.
+export const getRollups = async (params = {}) => {
+  const res = await axios.get(`${BASE}/items/rollups`, { params });
+  return res.data;
+};
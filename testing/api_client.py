@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Client for the Testing Scripts
+
+Every script in this folder sends its requests through one pooled, keep-alive
+requests.Session so connections are reused instead of reopened per call.
+The session applies a default per-request timeout and retries failed
+requests with exponential backoff. It can optionally rate-limit requests
+per host (token bucket) for external APIs with request quotas.
+
+Usage:
+    import api_client
+    response = api_client.post(f"{API_BASE_URL}/items", json=payload)
+
+Call configure() before the first request to change the pool size,
+timeout or retry policy.
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# ===== CONFIGURATION CONSTANTS =====
+POOL_SIZE = 20  # Keep-alive connections kept open per host
+REQUEST_TIMEOUT_SECONDS = 10  # Default timeout applied to every request
+MAX_RETRIES = 3  # Retries for connection errors and retryable status codes
+RETRY_BACKOFF_SECONDS = 0.5  # Backoff factor: waits 0.5s, 1s, 2s, ...
+RETRY_STATUS_CODES = (502, 503, 504)  # Gateway errors worth retrying
+
+_session = None
+
+
+class HostRateLimiter:
+    """Thread-safe token bucket per host: `rate` requests/s, bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+        self.lock = threading.Lock()
+        self.buckets = {}  # host -> [tokens, last refill time]
+
+    def acquire(self, url):
+        """Block until a request to the URL's host may be sent"""
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            tokens, last = self.buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate) - 1
+            self.buckets[host] = [tokens, now]
+        # A negative balance is a reservation: wait until that token refills
+        if tokens < 0:
+            time.sleep(-tokens / self.rate)
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies a default timeout (and optional rate limit) to every request"""
+
+    def __init__(self, timeout, rate_limiter=None):
+        super().__init__()
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(pool_size=POOL_SIZE, timeout=REQUEST_TIMEOUT_SECONDS,
+                   max_retries=MAX_RETRIES, backoff=RETRY_BACKOFF_SECONDS,
+                   rate_limit=None, burst=None):
+    """
+    Build a pooled session with timeout and retry policy
+    rate_limit: optional max requests/s per host, with bursts of up to `burst`
+    Returns: TimeoutSession
+    """
+    # Status and read retries only apply to idempotent methods, so a POST
+    # is retried on connection errors (never sent) but not after the server
+    # may already have stored it
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUS_CODES,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = TimeoutSession(timeout, HostRateLimiter(rate_limit, burst) if rate_limit else None)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+def configure(**kwargs):
+    """
+    Replace the shared session, e.g. configure(pool_size=64, timeout=5)
+    Accepts the same keyword arguments as create_session()
+    """
+    global _session
+    if _session is not None:
+        _session.close()
+    _session = create_session(**kwargs)
+    return _session
+
+
+def get_session():
+    """Return the shared session, creating it on first use"""
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+def get(url, **kwargs):
+    """GET through the shared session"""
+    return get_session().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    """POST through the shared session"""
+    return get_session().post(url, **kwargs)
+
+
+def put(url, **kwargs):
+    """PUT through the shared session"""
+    return get_session().put(url, **kwargs)
+
+
+def delete(url, **kwargs):
+    """DELETE through the shared session"""
+    return get_session().delete(url, **kwargs)
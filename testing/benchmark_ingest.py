@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+End-to-End Ingestion Benchmark
+
+Drives /api/items with ramping concurrency and records per-request latency
+(p50/p95/p99/max plus a histogram), sustained throughput and error rate for
+each stage. Payloads come from a seeded workload profile, so runs against
+different backend versions send identical data.
+
+Scenarios:
+    post    POST /items with one profile record per request
+    get     GET /items?limit=N (first page, newest first)
+
+Each stage runs `concurrency` closed-loop workers for a fixed duration.
+Results are written as JSON; --compare flags stages whose p95 latency or
+throughput regressed against an earlier result file.
+
+Usage:
+    python benchmark_ingest.py --levels 1 4 16 --stage-seconds 20
+    python benchmark_ingest.py --compare benchmark_results/ingest_baseline.json
+    python benchmark_ingest.py --local      # In-process stand-in, no backend or database
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+import api_client
+from latency_stats import summarize, histogram_labels
+from workload_profiles import load_profile, iter_profile_records
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+CONCURRENCY_LEVELS = [1, 2, 4, 8, 16, 32]  # Workers per stage
+STAGE_DURATION_SECONDS = 15  # Measured time per stage
+WARMUP_SECONDS = 2  # Unmeasured time before each stage
+GET_PAGE_SIZE = 50  # Items per GET request in the get scenario
+BENCHMARK_PROFILE = "line_sensors"  # Workload profile supplying POST payloads
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+REGRESSION_THRESHOLD = 0.20  # 20% worse p95 latency or throughput counts as a regression
+
+
+class PayloadSource:
+    """Thread-safe, endless iterator over a workload profile's records"""
+
+    def __init__(self, profile_name):
+        self.profile = load_profile(profile_name)
+        self.lock = threading.Lock()
+        self.records = itertools.cycle(iter_profile_records(self.profile))
+
+    def next(self):
+        with self.lock:
+            return next(self.records)
+
+
+def post_request(api_base_url, payloads):
+    """POST one record; returns True on success"""
+    response = api_client.post(f"{api_base_url}/items", json=payloads.next())
+    return response.status_code == 201
+
+
+def get_request(api_base_url, payloads):
+    """GET the first page of items; returns True on success"""
+    response = api_client.get(f"{api_base_url}/items", params={'limit': GET_PAGE_SIZE})
+    return response.status_code == 200
+
+
+SCENARIOS = {
+    'post': post_request,
+    'get': get_request,
+}
+
+
+def run_stage(scenario, concurrency, duration, warmup, api_base_url, payloads):
+    """
+    Run `concurrency` closed-loop workers for warmup + duration seconds
+    Returns: stage result dict
+    """
+    request = SCENARIOS[scenario]
+    lock = threading.Lock()
+    latencies = []
+    errors = {'count': 0, 'types': {}}
+    start_measuring = time.perf_counter() + warmup
+    stop_at = start_measuring + duration
+
+    def record_error(name):
+        with lock:
+            errors['count'] += 1
+            errors['types'][name] = errors['types'].get(name, 0) + 1
+
+    def worker():
+        local_latencies = []
+        while True:
+            started = time.perf_counter()
+            if started >= stop_at:
+                break
+            try:
+                ok = request(api_base_url, payloads)
+                error_name = None if ok else "HTTP error"
+            except requests.exceptions.RequestException as e:
+                error_name = type(e).__name__
+            finished = time.perf_counter()
+
+            if started < start_measuring:
+                continue  # Warmup request
+            if error_name:
+                record_error(error_name)
+            else:
+                local_latencies.append(finished - started)
+        with lock:
+            latencies.extend(local_latencies)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    total = len(latencies) + errors['count']
+    result = {
+        'scenario': scenario,
+        'concurrency': concurrency,
+        'duration_s': duration,
+        'requests': total,
+        'throughput_rps': round(len(latencies) / duration, 2),
+        'error_rate': round(errors['count'] / total, 4) if total else 0.0,
+        'errors': errors['types'],
+    }
+    result.update(summarize(latencies))
+    return result
+
+
+def print_stage(result):
+    """Print one stage result as a table row"""
+    def fmt(value):
+        return f"{value:8.1f}" if value is not None else "     n/a"
+    print(f"{result['scenario']:5s} {result['concurrency']:4d} | "
+          f"{result['throughput_rps']:9.1f} req/s | err {result['error_rate'] * 100:5.1f}% | "
+          f"p50 {fmt(result['p50_ms'])} | p95 {fmt(result['p95_ms'])} | "
+          f"p99 {fmt(result['p99_ms'])} | max {fmt(result['max_ms'])} ms")
+
+
+def compare_results(results, baseline_path, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare stages against a baseline result file
+    Returns: list of regression messages
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(stage['scenario'], stage['concurrency']): stage for stage in baseline['stages']}
+
+    regressions = []
+    for stage in results['stages']:
+        old = previous.get((stage['scenario'], stage['concurrency']))
+        if not old:
+            continue
+        label = f"{stage['scenario']} x{stage['concurrency']}"
+        if old['p95_ms'] and stage['p95_ms'] and stage['p95_ms'] > old['p95_ms'] * (1 + threshold):
+            regressions.append(f"{label}: p95 {old['p95_ms']:.1f} -> {stage['p95_ms']:.1f} ms")
+        if old['throughput_rps'] and stage['throughput_rps'] < old['throughput_rps'] * (1 - threshold):
+            regressions.append(f"{label}: throughput {old['throughput_rps']:.1f} -> "
+                               f"{stage['throughput_rps']:.1f} req/s")
+        if stage['error_rate'] > old['error_rate'] + 0.01:
+            regressions.append(f"{label}: error rate {old['error_rate'] * 100:.1f}% -> "
+                               f"{stage['error_rate'] * 100:.1f}%")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end ingestion benchmark for /api/items")
+    parser.add_argument("--api-url", default=API_BASE_URL)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--levels", nargs="+", type=int, default=CONCURRENCY_LEVELS,
+                        help="Concurrency levels to ramp through")
+    parser.add_argument("--stage-seconds", type=float, default=STAGE_DURATION_SECONDS)
+    parser.add_argument("--warmup-seconds", type=float, default=WARMUP_SECONDS)
+    parser.add_argument("--profile", default=BENCHMARK_PROFILE, help="Workload profile for POST payloads")
+    parser.add_argument("--output", help="Result file (default: benchmark_results/ingest_<time>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Earlier result file to compare against")
+    parser.add_argument("--local", action="store_true",
+                        help="Benchmark an in-process local_items_server instead of --api-url")
+    args = parser.parse_args()
+
+    local_server = None
+    if args.local:
+        from local_items_server import start_server
+        local_server, args.api_url = start_server(port=0)
+
+    # No retries: a failed request must count as an error, not as a slow success
+    api_client.configure(pool_size=max(args.levels), max_retries=0)
+    payloads = PayloadSource(args.profile)
+
+    print("Ingestion Benchmark")
+    print("=" * 60)
+    print(f"API URL: {args.api_url}")
+    print(f"Scenarios: {', '.join(args.scenarios)} | Levels: {args.levels}")
+    print(f"Stage: {args.warmup_seconds}s warmup + {args.stage_seconds}s measured")
+    print(f"Payload profile: {args.profile} (seed {payloads.profile['seed']})")
+    print("=" * 60)
+
+    results = {
+        'benchmark': 'ingest',
+        'started_at': datetime.now().isoformat(),
+        'api_url': args.api_url,
+        'profile': args.profile,
+        'histogram_buckets': histogram_labels(),
+        'stages': [],
+    }
+
+    try:
+        for scenario in args.scenarios:
+            for concurrency in args.levels:
+                result = run_stage(scenario, concurrency, args.stage_seconds,
+                                   args.warmup_seconds, args.api_url, payloads)
+                results['stages'].append(result)
+                print_stage(result)
+    except KeyboardInterrupt:
+        print("\n⏹️  Benchmark stopped by user - saving completed stages")
+    finally:
+        if local_server:
+            local_server.shutdown()
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"ingest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare_results(results, args.compare)
+        if regressions:
+            print(f"\n⚠️  {len(regressions)} regression(s) against {args.compare}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
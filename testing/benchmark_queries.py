@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Query Latency Benchmark for GET /api/items
+
+Seeds the items collection through the simulators (complete QC records from
+simulate_dashboard.py, live readings from sensor_data_generator.py) and
+times each query shape the dashboards and scripts use. Run it once before
+and once after an index or query change with the same --seed/--label
+scheme, then --compare the two result files.
+
+With --mongo-uri (the backend's database, needs pymongo) the script can also
+produce the "before" numbers itself and show why they differ:
+--hide-indexes hides the secondary indexes of the items collection from the
+query planner for the run (they are still maintained and are unhidden
+afterwards; MongoDB 4.4+), and --explain runs each shape once more with the
+database profiler on and records the plan of every items operation it caused
+(IXSCAN vs COLLSCAN, keys and documents examined). Other traffic on the
+database during an --explain run shows up in the recorded plans.
+
+Query shapes:
+    latest_page          ?limit=50 (unfiltered first page)
+    process_type_page    ?processType=Streeting&limit=50
+    operator_page        ?operator=SensorBot&limit=50
+    process_type_count   ?processType=QualityControl&limit=0 (X-Total-Count only)
+    process_type_full    ?processType=QualityControl (whole list, as dashboards poll it)
+    status_code_page     ?statusCode=<Streeting sensor code>&limit=50
+    product_lookup       ?productId=1001 (one product's records)
+    time_window_page     ?from=<1 day ago>&limit=500
+    projected_window     the same with ?fields=temperature.value,speed.value
+    quality_stats        /items/stats/quality
+
+Usage:
+    python benchmark_queries.py --seed 100000 --label before
+    # ... deploy the indexes ...
+    python benchmark_queries.py --label after --compare benchmark_results/queries_before_<time>.json
+    python benchmark_queries.py --local --seed 20000
+
+    # Before/after on the same data, with plans
+    python benchmark_queries.py --mongo-uri mongodb://localhost/simpleui --explain --hide-indexes --label before
+    python benchmark_queries.py --mongo-uri mongodb://localhost/simpleui --explain --label after \
+        --compare benchmark_results/queries_before_<time>.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+import api_client
+import sensor_data_generator
+import simulate_dashboard
+from bulk_client import RecordBatcher, post_items_bulk
+from latency_stats import summarize, histogram_labels
+from time_utils import to_epoch_ms
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+REPETITIONS = 20  # Timed requests per query shape
+WARMUP_REQUESTS = 2  # Untimed requests per query shape
+SEED_SENSOR_SHARE = 0.5  # Share of seeded items that are live sensor readings
+SEED_TIME_RANGE_DAYS = 30  # Sensor reading timestamps are spread over this many days
+SEED_BATCH_SIZE = 1000  # Records per bulk request while seeding
+SEED_RANDOM_SEED = 42
+WINDOW_DAYS = 1  # Time window of the time_window_page/projected_window shapes
+ITEMS_COLLECTION = "items"  # MongoDB collection of backend/models/Item.js
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+
+# name -> (path below /api, query parameters)
+QUERY_SHAPES = {
+    'latest_page': ("items", {'limit': 50}),
+    'process_type_page': ("items", {'processType': 'Streeting', 'limit': 50}),
+    'operator_page': ("items", {'operator': 'SensorBot', 'limit': 50}),
+    'process_type_count': ("items", {'processType': 'QualityControl', 'limit': 0}),
+    'process_type_full': ("items", {'processType': 'QualityControl'}),
+    'status_code_page': ("items", {'statusCode': sensor_data_generator.STATUS_CODES['Streeting'], 'limit': 50}),
+    'product_lookup': ("items", {'productId': str(simulate_dashboard.START_PRODUCT_ID + 1)}),
+    'time_window_page': ("items", {'from': None, 'limit': 500}),
+    'projected_window': ("items", {'from': None, 'limit': 500, 'fields': 'temperature.value,speed.value'}),
+    'quality_stats': ("items/stats/quality", {}),
+}
+
+
+def seed_items(count, api_base_url):
+    """
+    Insert `count` items: QC records from simulate_dashboard.py and sensor
+    readings from sensor_data_generator.py, through the bulk endpoint
+    Returns: number of items inserted
+    """
+    sensor_count = int(count * SEED_SENSOR_SHARE)
+    simulate_dashboard.API_BASE_URL = api_base_url
+    inserted, _ = simulate_dashboard.simulate_comprehensive_data_batched(count - sensor_count, SEED_BATCH_SIZE)
+
+    rng = random.Random(SEED_RANDOM_SEED)
+    now = datetime.now()
+    totals = {'inserted': 0}
+
+    def send_batch(batch):
+        inserted_ids, failed = post_items_bulk(batch, api_base_url)
+        totals['inserted'] += len(inserted_ids)
+        if failed:
+            print(f"   {len(failed)} sensor readings rejected: {failed[0]['message']}")
+
+    print(f"\nGenerating {sensor_count} sensor readings over the last {SEED_TIME_RANGE_DAYS} days...")
+    batcher = RecordBatcher(send_batch, batch_size=SEED_BATCH_SIZE)
+    try:
+        for _ in range(sensor_count):
+            timestamp = now - timedelta(seconds=rng.uniform(0, SEED_TIME_RANGE_DAYS * 86400))
+            batcher.add(sensor_data_generator.generate_sensor_payload(rng, timestamp))
+    finally:
+        batcher.flush()
+    print(f"   Inserted: {totals['inserted']}")
+    return inserted + totals['inserted']
+
+
+def time_query(api_base_url, path, params, repetitions, warmup):
+    """
+    Run one query shape sequentially
+    Returns: result dict with latency summary, rows and bytes of the last response
+    """
+    url = f"{api_base_url}/{path}"
+    latencies = []
+    response = None
+    for i in range(warmup + repetitions):
+        started = time.perf_counter()
+        response = api_client.get(url, params=params)
+        response.raise_for_status()
+        body = response.content
+        if i >= warmup:
+            latencies.append(time.perf_counter() - started)
+
+    data = response.json()
+    result = {
+        'path': path,
+        'params': params,
+        'rows': len(data) if isinstance(data, list) else None,
+        'bytes': len(body),
+    }
+    result.update(summarize(latencies))
+    return result
+
+
+def connect_database(mongo_uri):
+    """
+    Connect to the backend's MongoDB database (needs pymongo)
+    Returns: pymongo Database named by the URI
+    """
+    try:
+        import pymongo
+        from pymongo.errors import ConfigurationError
+    except ImportError:
+        raise SystemExit("❌ --mongo-uri needs pymongo: pip install pymongo")
+
+    client = pymongo.MongoClient(mongo_uri)
+    try:
+        return client.get_default_database()
+    except ConfigurationError:
+        raise SystemExit("❌ --mongo-uri must name the database, e.g. mongodb://localhost/simpleui")
+
+
+def set_indexes_hidden(db, hidden, names=None):
+    """
+    Hide the secondary indexes of the items collection from the query planner,
+    or unhide them. Hidden indexes are still maintained, so unhiding is instant.
+    Returns: names of the indexes that were changed
+    """
+    if names is None:
+        names = [index['name'] for index in db[ITEMS_COLLECTION].list_indexes()
+                 if index['name'] != '_id_' and bool(index.get('hidden')) != hidden]
+    for name in names:
+        db.command('collMod', ITEMS_COLLECTION, index={'name': name, 'hidden': hidden})
+    return names
+
+
+def explain_query(db, api_base_url, path, params):
+    """
+    Run one query shape once with the database profiler on
+    Returns: list of plan dicts, one per items operation the request caused
+    """
+    profile = db['system.profile']
+    # Server-side position, so the client's clock doesn't matter
+    last = next(iter(profile.find({}, {'ts': 1}).sort('$natural', -1).limit(1)), None)
+    previous_level = db.command('profile', 2)['was']
+    try:
+        api_client.get(f"{api_base_url}/{path}", params=params).raise_for_status()
+    finally:
+        db.command('profile', previous_level)
+
+    query = {'ns': f"{db.name}.{ITEMS_COLLECTION}"}
+    if last is not None:
+        query['ts'] = {'$gt': last['ts']}
+    return [{
+        'operation': next(iter(entry.get('command') or {}), entry.get('op')),
+        'plan': entry.get('planSummary'),
+        'keys_examined': entry.get('keysExamined'),
+        'docs_examined': entry.get('docsExamined'),
+        'returned': entry.get('nreturned'),
+        'millis': entry.get('millis'),
+    } for entry in profile.find(query).sort('ts', 1)]
+
+
+def print_result(name, result):
+    """Print one query shape as a table row, followed by its plans if recorded"""
+    rows = f"{result['rows']:7d}" if result['rows'] is not None else "      -"
+    print(f"{name:20s} rows {rows} | {result['bytes'] / 1024:9.1f} KiB | "
+          f"p50 {result['p50_ms']:8.1f} | p95 {result['p95_ms']:8.1f} | max {result['max_ms']:8.1f} ms")
+    for plan in result.get('plans') or []:
+        print(f"   {plan['operation']:10s} {plan['plan'] or '-'} | keys {plan['keys_examined']} | "
+              f"docs {plan['docs_examined']} | returned {plan['returned']}")
+
+
+def compare_results(results, baseline_path):
+    """Print p50/p95 of each shape next to a baseline result file"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"\nCompared to {baseline_path} ({baseline.get('label') or 'unlabelled'}, "
+          f"{baseline.get('item_count')} items):")
+    for name, result in results['queries'].items():
+        old = baseline['queries'].get(name)
+        if not old:
+            continue
+        speedup = old['p50_ms'] / result['p50_ms'] if result['p50_ms'] else float('inf')
+        print(f"{name:20s} p50 {old['p50_ms']:8.1f} -> {result['p50_ms']:8.1f} ms | "
+              f"p95 {old['p95_ms']:8.1f} -> {result['p95_ms']:8.1f} ms | {speedup:5.1f}x")
+        if old.get('plans') and result.get('plans'):
+            before = sum(plan['docs_examined'] or 0 for plan in old['plans'])
+            after = sum(plan['docs_examined'] or 0 for plan in result['plans'])
+            print(f"{'':20s} plan {old['plans'][0]['plan']} -> {result['plans'][0]['plan']} | "
+                  f"docs examined {before} -> {after}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency of the GET /api/items query shapes")
+    parser.add_argument("--api-url", default=API_BASE_URL)
+    parser.add_argument("--seed", type=int, default=0, metavar="N",
+                        help="Insert N items through the simulators before measuring")
+    parser.add_argument("--shapes", nargs="+", choices=list(QUERY_SHAPES), default=list(QUERY_SHAPES))
+    parser.add_argument("--repetitions", type=int, default=REPETITIONS)
+    parser.add_argument("--warmup", type=int, default=WARMUP_REQUESTS)
+    parser.add_argument("--label", help="Name for this run, e.g. before/after")
+    parser.add_argument("--output", help="Result file (default: benchmark_results/queries_<label>_<time>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Earlier result file to compare against")
+    parser.add_argument("--local", action="store_true",
+                        help="Benchmark an in-process local_items_server instead of --api-url")
+    parser.add_argument("--mongo-uri", help="The backend's MongoDB database, for --explain and --hide-indexes")
+    parser.add_argument("--explain", action="store_true",
+                        help="Record the query plan of each shape with the database profiler")
+    parser.add_argument("--hide-indexes", action="store_true",
+                        help="Hide the secondary items indexes from the planner during the run (a \"before\" run)")
+    args = parser.parse_args()
+    if (args.explain or args.hide_indexes) and (args.local or not args.mongo_uri):
+        parser.error("--explain and --hide-indexes need --mongo-uri and can't be combined with --local")
+
+    local_server = None
+    if args.local:
+        from local_items_server import start_server
+        local_server, args.api_url = start_server(port=0)
+
+    db = connect_database(args.mongo_uri) if args.mongo_uri else None
+    hidden_indexes = []
+    try:
+        if args.seed:
+            seed_items(args.seed, args.api_url)
+        # No retries while timing: a failed request must fail the run, not show up as a slow one
+        api_client.configure(max_retries=0)
+        if args.hide_indexes:
+            hidden_indexes = set_indexes_hidden(db, True)
+            print(f"🙈 Hid {len(hidden_indexes)} index(es) from the planner: {', '.join(hidden_indexes) or '-'}")
+
+        count_response = api_client.get(f"{args.api_url}/items", params={'limit': 0})
+        count_response.raise_for_status()
+        item_count = int(count_response.headers.get('X-Total-Count', 0))
+
+        print("\nQuery Benchmark")
+        print("=" * 60)
+        print(f"API URL: {args.api_url} | Items: {item_count}")
+        print(f"Repetitions: {args.repetitions} (+{args.warmup} warmup) per shape")
+        print("=" * 60)
+
+        results = {
+            'benchmark': 'queries',
+            'label': args.label,
+            'started_at': datetime.now().isoformat(),
+            'api_url': args.api_url,
+            'item_count': item_count,
+            'hidden_indexes': hidden_indexes,
+            'histogram_buckets': histogram_labels(),
+            'queries': {},
+        }
+        window_start = to_epoch_ms(datetime.now() - timedelta(days=WINDOW_DAYS))
+        for name in args.shapes:
+            path, params = QUERY_SHAPES[name]
+            if 'from' in params:
+                params = {**params, 'from': window_start}
+            result = time_query(args.api_url, path, params, args.repetitions, args.warmup)
+            if args.explain:
+                result['plans'] = explain_query(db, args.api_url, path, params)
+            results['queries'][name] = result
+            print_result(name, result)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Request failed: {str(e)}")
+        sys.exit(1)
+    finally:
+        if hidden_indexes:
+            set_indexes_hidden(db, False, hidden_indexes)
+            print(f"👀 Unhid {len(hidden_indexes)} index(es)")
+        if local_server:
+            local_server.shutdown()
+
+    suffix = f"{args.label}_" if args.label else ""
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"queries_{suffix}{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare_results(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Batched Client for POST /api/items/bulk
+
+Sends many items per HTTP round trip. RecordBatcher groups records and
+flushes a batch when it reaches a size limit or when its oldest record
+has waited long enough, whichever comes first.
+
+Usage:
+    from bulk_client import RecordBatcher, post_items_bulk
+    batcher = RecordBatcher(lambda batch: post_items_bulk(batch))
+    for record in records:
+        batcher.add(record)
+    batcher.flush()
+"""
+
+import time
+
+import api_client
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+BATCH_SIZE = 500  # Records per bulk request (server maximum is 5000)
+BATCH_MAX_WAIT_SECONDS = 2.0  # Flush a partial batch once its oldest record is this old
+
+
+def post_items_bulk(records, api_base_url=API_BASE_URL):
+    """
+    POST a list of items in one request
+    Returns: (inserted_ids, failed) where failed is a list of
+             {'index': ..., 'message': ...} for rejected records
+    Raises: requests.exceptions.RequestException on network errors, or when
+            the whole request is rejected (e.g. malformed body)
+    """
+    response = api_client.post(f"{api_base_url}/items/bulk", json=records)
+
+    if response.status_code not in (201, 400):
+        response.raise_for_status()
+
+    # A 400 with a 'failed' list means every record was rejected individually;
+    # without one the request itself was invalid
+    data = response.json()
+    if 'failed' not in data:
+        response.raise_for_status()
+    return data.get('insertedIds', []), data['failed']
+
+
+class RecordBatcher:
+    """Group records and hand full (or aged) batches to a flush callback"""
+
+    def __init__(self, flush_callback, batch_size=BATCH_SIZE, max_wait=BATCH_MAX_WAIT_SECONDS):
+        self.flush_callback = flush_callback
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.records = []
+        self.first_added = None
+
+    def add(self, record):
+        """Add a record, flushing when the batch is full or has waited too long"""
+        if not self.records:
+            self.first_added = time.monotonic()
+        self.records.append(record)
+
+        if len(self.records) >= self.batch_size:
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self):
+        """Flush the pending batch if its oldest record exceeded max_wait"""
+        if self.records and time.monotonic() - self.first_added >= self.max_wait:
+            self.flush()
+
+    def flush(self):
+        """Flush whatever is pending"""
+        if not self.records:
+            return
+        batch, self.records = self.records, []
+        self.first_added = None
+        self.flush_callback(batch)
+
+    def __len__(self):
+        return len(self.records)
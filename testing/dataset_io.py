@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Offline Dataset Files for Generated Records
+
+Writes generated records to disk in streaming chunks so a large dataset can
+be generated once and replayed many times (see replay_dataset.py).
+
+Supported formats, picked from the file extension:
+    .ndjson / .jsonl            one JSON record per line
+    .ndjson.gz / .jsonl.gz      the same, gzip compressed
+    .parquet                    columnar, typed after backend/models/Item.js
+                                (requires pyarrow)
+
+Usage:
+    from dataset_io import write_dataset, iter_dataset
+    write_dataset(records, "qc_1m.ndjson.gz")
+    for record in iter_dataset("qc_1m.ndjson.gz"):
+        ...
+"""
+
+import gzip
+import json
+from itertools import islice
+
+# ===== CONFIGURATION CONSTANTS =====
+DATASET_CHUNK_SIZE = 10000  # Records buffered per write
+PARQUET_COMPRESSION = "zstd"
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+GZIP_EXTENSIONS = (".ndjson.gz", ".jsonl.gz")
+PARQUET_EXTENSIONS = (".parquet",)
+
+
+def dataset_format(path):
+    """Return 'ndjson', 'ndjson.gz' or 'parquet' for a dataset path"""
+    name = str(path).lower()
+    if name.endswith(GZIP_EXTENSIONS):
+        return "ndjson.gz"
+    if name.endswith(NDJSON_EXTENSIONS):
+        return "ndjson"
+    if name.endswith(PARQUET_EXTENSIONS):
+        return "parquet"
+    raise ValueError(f"Unsupported dataset extension for {path} "
+                     f"(use {', '.join(NDJSON_EXTENSIONS + GZIP_EXTENSIONS + PARQUET_EXTENSIONS)})")
+
+
+def iter_chunks(records, size):
+    """Split an iterable into lists of at most `size` records"""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# =============================================================================
+# NDJSON
+# =============================================================================
+
+def _open_ndjson(path, mode):
+    if dataset_format(path) == "ndjson.gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _write_ndjson(records, path, chunk_size):
+    written = 0
+    with _open_ndjson(path, "w") as f:
+        for chunk in iter_chunks(records, chunk_size):
+            f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in chunk))
+            written += len(chunk)
+    return written
+
+
+def _iter_ndjson(path):
+    with _open_ndjson(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# =============================================================================
+# PARQUET
+# =============================================================================
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet datasets require pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def _item_schema(pa):
+    """Arrow schema mirroring the Item model fields"""
+    measurement = pa.struct([
+        ("value", pa.float64()),
+        ("unit", pa.string()),
+        ("deviceSource", pa.string()),
+    ])
+    return pa.schema([
+        ("processType", pa.string()),
+        ("squeegeeSpeed", measurement),
+        ("printPressure", measurement),
+        ("inkViscosity", measurement),
+        ("temperature", measurement),
+        ("speed", measurement),
+        ("processStation", pa.string()),
+        ("productId", pa.string()),
+        ("reworkability", pa.string()),
+        ("affectedOutput", pa.list_(pa.string())),
+        ("priority", pa.string()),
+        ("targetMetricAffected", pa.list_(pa.string())),
+        ("operator", pa.string()),
+        ("statusCode", pa.string()),
+        ("reworked", pa.string()),
+        ("reworkOutcome", pa.string()),  # Emitted by the QC generators, read by /items/stats/quality
+        ("decision", pa.string()),
+        ("causeOfFailure", pa.list_(pa.string())),
+        ("comments", pa.string()),
+        ("timestamp", pa.string()),  # Kept as the generated ISO string
+    ])
+
+
+def _write_parquet(records, path, chunk_size):
+    pa = _import_pyarrow()
+    schema = _item_schema(pa)
+    written = 0
+
+    with pa.parquet.ParquetWriter(path, schema, compression=PARQUET_COMPRESSION) as writer:
+        for chunk in iter_chunks(records, chunk_size):
+            for record in chunk:
+                # Some generators emit numeric status codes; the model stores strings
+                if record.get("statusCode") is not None:
+                    record["statusCode"] = str(record["statusCode"])
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            written += len(chunk)
+    return written
+
+
+def _iter_parquet(path, chunk_size):
+    pa = _import_pyarrow()
+    parquet_file = pa.parquet.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        for row in batch.to_pylist():
+            # Fields absent from the original record come back as nulls
+            yield {key: value for key, value in row.items() if value is not None}
+
+
+# =============================================================================
+# PUBLIC API
+# =============================================================================
+
+def write_dataset(records, path, chunk_size=DATASET_CHUNK_SIZE):
+    """
+    Stream records to a dataset file, `chunk_size` records at a time
+    Returns: number of records written
+    """
+    if dataset_format(path) == "parquet":
+        return _write_parquet(records, path, chunk_size)
+    return _write_ndjson(records, path, chunk_size)
+
+
+def iter_dataset(path, chunk_size=DATASET_CHUNK_SIZE):
+    """Lazily yield the records stored in a dataset file"""
+    if dataset_format(path) == "parquet":
+        return _iter_parquet(path, chunk_size)
+    return _iter_ndjson(path)
@@ -2,101 +2,194 @@
 """
 Database Format Script
 This script fetches all records from the API and deletes them to clear/format the database.
+Deletes run in parallel through a worker pool; --process-type/--operator/--status-code/
+--product-id/--before limit the deletion to matching records. Only item IDs are
+downloaded (?fields=_id), not whole documents.
 Based on the API endpoints defined in frontend/src/utils/api.js
 """
 
 import requests
+import api_client
+import argparse
 import json
+import queue
 import sys
-from typing import List, Dict, Any
+import threading
+import time
+from typing import Dict, Any, Iterable, Optional
+from datetime import datetime
+from items_reader import iter_items, count_items, query_params
+from sensor_data_generator import positive_int
 
 # API Configuration
 BASE_URL = 'http://localhost:5050/api'
 ITEMS_ENDPOINT = f'{BASE_URL}/items'
 
-def get_all_items() -> List[Dict[Any, Any]]:
+# Parallel delete configuration
+DELETE_WORKERS = 16  # Concurrent DELETE requests
+DELETE_QUEUE_SIZE = 1000  # Max item IDs buffered between the reader and the workers
+PROGRESS_INTERVAL_SECONDS = 2  # Time between progress lines
+MAX_REPORTED_ERRORS = 10  # Individual delete errors listed in the summary
+
+def count_all_items(filters: Optional[Dict[str, str]] = None) -> int:
     """
-    Fetch all items from the API
-    Returns: List of items or empty list if error
+    Count the items in the database, optionally filtered (see items_reader.query_params)
+    Returns: Number of items or 0 if error
     """
     try:
-        response = requests.get(ITEMS_ENDPOINT)
-        response.raise_for_status()
-        items = response.json()
-        print(f"✓ Found {len(items)} items in database")
-        return items
+        total = count_items(filters, api_base_url=BASE_URL)
+        print(f"✓ Found {total} items in database")
+        return total
     except requests.exceptions.ConnectionError:
         print("✗ Error: Could not connect to the API server")
         print("  Make sure the backend server is running on localhost:5050")
-        return []
+        return 0
     except requests.exceptions.RequestException as e:
         print(f"✗ Error fetching items: {e}")
-        return []
+        return 0
     except json.JSONDecodeError:
         print("✗ Error: Invalid JSON response from server")
-        return []
+        return 0
 
-def delete_item(item_id: str) -> bool:
+def delete_item(item_id: str, verbose: bool = True) -> bool:
     """
     Delete a single item by ID
     Returns: True if successful, False otherwise
     """
     try:
-        response = requests.delete(f'{ITEMS_ENDPOINT}/{item_id}')
+        response = api_client.delete(f'{ITEMS_ENDPOINT}/{item_id}')
         response.raise_for_status()
         return True
     except requests.exceptions.RequestException as e:
-        print(f"✗ Error deleting item {item_id}: {e}")
+        if verbose:
+            print(f"✗ Error deleting item {item_id}: {e}")
         return False
 
-def format_database():
+def delete_items_parallel(items: Iterable[Dict[Any, Any]], total: Optional[int] = None,
+                          workers: int = DELETE_WORKERS,
+                          queue_size: int = DELETE_QUEUE_SIZE) -> Dict[str, Any]:
     """
-    Main function to format (clear) the database
+    Delete items concurrently with a worker pool fed through a bounded queue.
+    Progress is printed every PROGRESS_INTERVAL_SECONDS instead of per item.
+    Returns: dict with deleted/failed counts and a sample of errors
+    """
+    work_queue = queue.Queue(maxsize=queue_size)
+    lock = threading.Lock()
+    stats = {'deleted': 0, 'failed': 0, 'errors': []}
+    done = threading.Event()
+
+    def record_failure(message):
+        with lock:
+            stats['failed'] += 1
+            if len(stats['errors']) < MAX_REPORTED_ERRORS:
+                stats['errors'].append(message)
+
+    def worker():
+        while True:
+            item_id = work_queue.get()
+            try:
+                if item_id is None:
+                    return
+                if delete_item(item_id, verbose=False):
+                    with lock:
+                        stats['deleted'] += 1
+                else:
+                    record_failure(f"Delete failed for item {item_id}")
+            finally:
+                work_queue.task_done()
+
+    def report_progress():
+        started = time.perf_counter()
+        while not done.wait(PROGRESS_INTERVAL_SECONDS):
+            with lock:
+                processed = stats['deleted'] + stats['failed']
+            elapsed = time.perf_counter() - started
+            of_total = f"/{total}" if total is not None else ""
+            print(f"  ... {processed}{of_total} processed "
+                  f"({processed / elapsed:.0f} items/s, queue: {work_queue.qsize()})")
+
+    # Match the connection pool to the worker count so no worker waits on a socket
+    api_client.configure(pool_size=workers)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    reporter = threading.Thread(target=report_progress, daemon=True)
+    for thread in threads:
+        thread.start()
+    reporter.start()
+
+    try:
+        for item in items:
+            item_id = item.get('_id') or item.get('id')  # Handle both MongoDB _id and regular id
+            if not item_id:
+                record_failure(f"Skipped item without ID: {item}")
+                continue
+            work_queue.put(item_id)  # Blocks while the queue is full
+    finally:
+        for _ in threads:
+            work_queue.put(None)
+        for thread in threads:
+            thread.join()
+        done.set()
+        reporter.join()
+
+    return stats
+
+def format_database(filters: Optional[Dict[str, str]] = None, workers: int = DELETE_WORKERS,
+                    assume_yes: bool = False):
+    """
+    Main function to format (clear) the database, or only the items matching filters
     """
     print("=" * 50)
     print("DATABASE FORMAT SCRIPT")
     print("=" * 50)
-    print("This will delete ALL records from the database!")
+    if filters:
+        scope = ", ".join(f"{key}={value}" for key, value in filters.items())
+        print(f"This will delete all records matching: {scope}")
+    else:
+        print("This will delete ALL records from the database!")
     
     # Ask for confirmation
-    confirmation = input("\nAre you sure you want to proceed? (yes/no): ").lower().strip()
-    if confirmation != 'yes':
-        print("Operation cancelled.")
-        return
+    if not assume_yes:
+        confirmation = input("\nAre you sure you want to proceed? (yes/no): ").lower().strip()
+        if confirmation != 'yes':
+            print("Operation cancelled.")
+            return
     
-    # Get all items
-    print("\n1. Fetching all items...")
-    items = get_all_items()
+    # Count items
+    print("\n1. Counting items...")
+    total = count_all_items(filters)
     
-    if not items:
+    if not total:
         print("No items found or unable to fetch items.")
         return
     
-    # Delete each item
-    print(f"\n2. Deleting {len(items)} items...")
-    deleted_count = 0
-    failed_count = 0
+    # Stream items page by page into the parallel deleter. Paging is
+    # cursor-based, so deleting already-read items doesn't shift later pages
+    print(f"\n2. Deleting {total} items with {workers} workers...")
+    started = time.perf_counter()
+    try:
+        stats = delete_items_parallel(iter_items(filters, api_base_url=BASE_URL, fields=['_id']),
+                                      total=total, workers=workers)
+    except requests.exceptions.RequestException as e:
+        print(f"✗ Error reading items, deletion stopped early: {e}")
+        return
+    elapsed = time.perf_counter() - started
+    deleted_count = stats['deleted']
+    failed_count = stats['failed']
     
-    for item in items:
-        item_id = item.get('_id') or item.get('id')  # Handle both MongoDB _id and regular id
-        if not item_id:
-            print(f"✗ Skipping item without ID: {item}")
-            failed_count += 1
-            continue
-        
-        if delete_item(item_id):
-            deleted_count += 1
-            print(f"✓ Deleted item: {item_id}")
-        else:
-            failed_count += 1
+    for error in stats['errors']:
+        print(f"✗ {error}")
+    if failed_count > len(stats['errors']):
+        print(f"  ... and {failed_count - len(stats['errors'])} more errors")
     
     # Summary
     print("\n" + "=" * 50)
     print("OPERATION SUMMARY")
     print("=" * 50)
-    print(f"Total items found: {len(items)}")
+    print(f"Total items found: {total}")
     print(f"Successfully deleted: {deleted_count}")
     print(f"Failed to delete: {failed_count}")
+    print(f"Elapsed time: {elapsed:.1f}s")
     
     if failed_count == 0:
         print("\n✓ Database successfully formatted!")
@@ -108,7 +201,7 @@ def test_connection():
     Test if the API server is reachable
     """
     try:
-        response = requests.get(f'{BASE_URL}/items')
+        response = api_client.get(f'{BASE_URL}/items', params={'limit': 0})
         print(f"✓ API server is reachable (Status: {response.status_code})")
         return True
     except requests.exceptions.ConnectionError:
@@ -120,14 +213,30 @@ def test_connection():
         return False
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1] == "--test":
+    parser = argparse.ArgumentParser(description="Delete records from the SimpleUI database")
+    parser.add_argument("--test", action="store_true", help="Only check the API connection")
+    parser.add_argument("--process-type", help="Only delete items with this processType")
+    parser.add_argument("--operator", help="Only delete items with this operator")
+    parser.add_argument("--status-code", help="Only delete items with this statusCode")
+    parser.add_argument("--product-id", help="Only delete items with this productId")
+    parser.add_argument("--before", type=datetime.fromisoformat, metavar="ISO_DATE",
+                        help="Only delete items older than this local time, e.g. 2025-01-31T00:00")
+    parser.add_argument("--workers", type=positive_int, default=DELETE_WORKERS,
+                        help="Number of concurrent delete workers")
+    parser.add_argument("--yes", action="store_true", help="Skip the confirmation prompt")
+    args = parser.parse_args()
+
+    filters = query_params(process_type=args.process_type, operator=args.operator,
+                           status_code=args.status_code, product_id=args.product_id, time_to=args.before)
+
+    if args.test:
         # Test mode - just check connection
         print("Testing API connection...")
         test_connection()
     else:
         # Format database
         if test_connection():
-            format_database()
+            format_database(filters or None, workers=args.workers, assume_yes=args.yes)
         else:
             print("\nCannot proceed without API connection.")
             sys.exit(1)
@@ -7,10 +7,13 @@ It creates realistic data scenarios with proper relationships between fields.
 """
 
 import requests
+import api_client
+import argparse
 import random
 import json
 from datetime import datetime, timedelta
 import time
+from dataset_io import write_dataset
 
 # Configuration Variables
 NUM_RECORDS = 100           # Number of records to insert
@@ -41,6 +44,27 @@ AFFECTED_OUTPUT_OPTIONS = [
     'Other'
 ]
 
+# Weighted probabilities
+DECISION_WEIGHTS = [0.7, 0.05, 0.25]  # 70% Yes, 5% No, 25% Goes to Rework
+REWORKABILITY_WEIGHTS_REWORK = [0.9, 0.1]  # 90% Yes, 10% No for Goes to Rework
+REWORKED_WEIGHTS_HIGH = [0.85, 0.15]  # 85% Yes, 15% No for Goes to Rework with Yes reworkability
+REWORKED_WEIGHTS_LOW = [0.3, 0.7]  # 30% Yes, 70% No for other cases
+DECISION_UPDATE_WEIGHTS = [0.8, 0.2]  # 80% become Yes, 20% keep original decision after rework
+
+COMMENTS_OPTIONS = [
+    "",  # Empty comment (most common)
+    "Standard inspection completed without issues",
+    "Minor surface imperfections noted but within tolerance",
+    "Requires attention from supervisor",
+    "Follow-up inspection recommended",
+    "Quality issue resolved through process adjustment",
+    "Equipment calibration may be needed",
+    "Material batch variation observed",
+    "Process parameters adjusted during run",
+    "Additional testing performed to verify quality"
+]
+COMMENT_WEIGHTS = [0.5] + [0.05] * 9  # 50% empty, 50% with content
+
 def generate_status_code(process_station):
     """Generate status code based on process station"""
     # Always return 3100 for Quality Control
@@ -58,9 +82,8 @@ def generate_realistic_timestamp():
 
 def generate_quality_control_record(product_id):
     """Generate a single quality control record with realistic data"""
-      # Random decision with weighted probabilities (more Yes than No/Rework)
-    decision_weights = [0.7, 0.05, 0.25]  # 70% Yes, 5% No, 25% Goes to Rework
-    decision = random.choices(DECISIONS, weights=decision_weights)[0]
+    # Random decision with weighted probabilities (more Yes than No/Rework)
+    decision = random.choices(DECISIONS, weights=DECISION_WEIGHTS)[0]
     
     # Generate cause of failure and affected output based on decision
     cause_of_failure = []
@@ -78,8 +101,7 @@ def generate_quality_control_record(product_id):
     if decision in ['No', 'Goes to Rework']:
         if decision == 'Goes to Rework':
             # 90% chance of being Yes for Goes to Rework
-            reworkability_weights = [0.9, 0.1]  # 90% Yes, 10% No
-            reworkability = random.choices(REWORKABILITY_OPTIONS, weights=reworkability_weights)[0]
+            reworkability = random.choices(REWORKABILITY_OPTIONS, weights=REWORKABILITY_WEIGHTS_REWORK)[0]
         else:
             # Regular random choice for No decision
             reworkability = random.choice(REWORKABILITY_OPTIONS)
@@ -89,36 +111,19 @@ def generate_quality_control_record(product_id):
     if decision == 'No' or (decision == 'Goes to Rework' and reworkability == 'Yes'):
         if decision == 'Goes to Rework' and reworkability == 'Yes':
             # 85% chance of being Yes for Goes to Rework with Yes reworkability
-            reworked_weights = [0.85, 0.15]  # 85% Yes, 15% No
-            reworked = random.choices(REWORKED_OPTIONS, weights=reworked_weights)[0]
+            reworked = random.choices(REWORKED_OPTIONS, weights=REWORKED_WEIGHTS_HIGH)[0]
         else:
             # Regular weighted choice for other cases
-            reworked_weights = [0.3, 0.7]  # 30% Yes, 70% No
-            reworked = random.choices(REWORKED_OPTIONS, weights=reworked_weights)[0]
+            reworked = random.choices(REWORKED_OPTIONS, weights=REWORKED_WEIGHTS_LOW)[0]
     
     # Update decision if reworked is Yes (80% chance of becoming Yes)
     if reworked == 'Yes':
-        final_decision_weights = [0.8, 0.2]  # 80% Yes, 20% keep original decision
-        should_update_decision = random.choices([True, False], weights=final_decision_weights)[0]
+        should_update_decision = random.choices([True, False], weights=DECISION_UPDATE_WEIGHTS)[0]
         if should_update_decision:
             decision = 'Yes'
     
     # Generate comments with realistic scenarios
-    comments_options = [
-        "",  # Empty comment (most common)
-        "Standard inspection completed without issues",
-        "Minor surface imperfections noted but within tolerance",
-        "Requires attention from supervisor",
-        "Follow-up inspection recommended",
-        "Quality issue resolved through process adjustment",
-        "Equipment calibration may be needed",
-        "Material batch variation observed",
-        "Process parameters adjusted during run",
-        "Additional testing performed to verify quality"    ]
-    
-    # Weight comments - 50% empty, 50% with content
-    comment_weights = [0.5] + [0.05] * 9
-    comments = random.choices(comments_options, weights=comment_weights)[0]
+    comments = random.choices(COMMENTS_OPTIONS, weights=COMMENT_WEIGHTS)[0]
     
     process_station = random.choice(PROCESS_STATIONS)
     
@@ -139,6 +144,18 @@ def generate_quality_control_record(product_id):
     
     return record
 
+def export_data(num_records, path):
+    """Write generated records to a dataset file instead of the API"""
+    print(f"Writing {num_records} quality control records to {path}...")
+    
+    records = (generate_quality_control_record(START_PRODUCT_ID + i) for i in range(num_records))
+    started = time.perf_counter()
+    written = write_dataset(records, path)
+    elapsed = time.perf_counter() - started
+    
+    print(f"Wrote {written} records in {elapsed:.1f}s")
+    print(f"Replay with: python replay_dataset.py {path}")
+
 def inject_data():
     """Main function to inject test data"""
     print(f"Starting Quality Control Data Injection")
@@ -160,7 +177,7 @@ def inject_data():
             record = generate_quality_control_record(product_id)
             
             # Send POST request
-            response = requests.post(f"{BASE_URL}/items", json=record, timeout=10)
+            response = api_client.post(f"{BASE_URL}/items", json=record, timeout=10)
             
             if response.status_code == 201:
                 success_count += 1
@@ -194,7 +211,7 @@ def inject_data():
 def test_connection():
     """Test if the backend API is accessible"""
     try:
-        response = requests.get(f"{BASE_URL}/items", timeout=5)
+        response = api_client.get(f"{BASE_URL}/items", params={'limit': 0}, timeout=5)
         if response.status_code == 200:
             print("Backend API is accessible")
             return True
@@ -207,6 +224,17 @@ def test_connection():
         return False
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quality Control test data injection")
+    parser.add_argument("--records", type=int, default=NUM_RECORDS, help="Number of records")
+    parser.add_argument("--export", metavar="PATH",
+                        help="Write records to a .ndjson(.gz)/.parquet file instead of the API")
+    args = parser.parse_args()
+    NUM_RECORDS = args.records
+    
+    if args.export:
+        export_data(NUM_RECORDS, args.export)
+        exit(0)
+    
     print("Quality Control Test Data Injection Script")
     print("=" * 50)
     
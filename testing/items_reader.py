@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Paginated Reader for GET /api/items
+
+Iterates over items page by page using the server's ?limit=/?cursor= mode,
+so memory use stays constant no matter how large the collection is.
+Filtering (?from=/?to= time window, statusCode, productId, ...) and field
+projection (?fields=) happen on the server, so only the needed data is sent.
+
+Usage:
+    from items_reader import iter_items, count_items, query_params
+    for item in iter_items({'processType': 'Streeting'}):
+        ...
+    params = query_params(status_code='1201', time_from=datetime.now() - timedelta(hours=1))
+    for item in iter_items(params, fields=['statusCode', 'squeegeeSpeed.value']):
+        ...
+    total = count_items()
+"""
+
+import api_client
+from time_utils import to_epoch_ms
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+PAGE_SIZE = 500  # Items per page (server maximum is 5000)
+
+
+def query_params(process_type=None, operator=None, status_code=None, product_id=None,
+                 time_from=None, time_to=None):
+    """
+    Build GET /api/items filter parameters, leaving out the unset ones
+    Returns: params dict; time_from is inclusive, time_to exclusive
+    """
+    params = {
+        'processType': process_type,
+        'operator': operator,
+        'statusCode': status_code,
+        'productId': product_id,
+        'from': to_epoch_ms(time_from) if time_from is not None else None,
+        'to': to_epoch_ms(time_to) if time_to is not None else None,
+    }
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def iter_pages(params=None, page_size=PAGE_SIZE, api_base_url=API_BASE_URL, fields=None):
+    """
+    Yield successive pages (lists of items), newest first; with fields, items
+    only carry _id, timestamp and those (dotted) paths
+    Raises: requests.exceptions.RequestException on network or HTTP errors
+    """
+    url = f"{api_base_url}/items"
+    query = dict(params or {})
+    query['limit'] = page_size
+    if fields:
+        query['fields'] = ','.join(fields)
+
+    while True:
+        response = api_client.get(url, params=query)
+        response.raise_for_status()
+        yield response.json()
+
+        # A server without pagination support returns everything at once
+        # and never sets a cursor, so this also ends after one page there
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return
+        query['cursor'] = cursor
+
+
+def iter_items(params=None, page_size=PAGE_SIZE, api_base_url=API_BASE_URL, fields=None):
+    """
+    Yield items one at a time, newest first, holding at most one page in memory
+    Raises: requests.exceptions.RequestException on network or HTTP errors
+    """
+    for page in iter_pages(params, page_size, api_base_url, fields):
+        yield from page
+
+
+def count_items(params=None, api_base_url=API_BASE_URL):
+    """
+    Return the number of items matching params without downloading them
+    Raises: requests.exceptions.RequestException on network or HTTP errors
+    """
+    query = dict(params or {})
+    query['limit'] = 0
+
+    response = api_client.get(f"{api_base_url}/items", params=query)
+    response.raise_for_status()
+    return total_count(response)
+
+
+def total_count(response):
+    """Read the item count from a GET /api/items response"""
+    total = response.headers.get('X-Total-Count')
+    if total is not None:
+        return int(total)
+    # Server without pagination support: fall back to the full list
+    return len(response.json())
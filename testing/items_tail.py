@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Tail Client for the GET /api/items?since= Change Feed
+
+Polls only for items created or updated since the previous poll, so the cost
+of a poll scales with the new data instead of the size of the collection.
+Run as a script it measures how long new items take to become visible:
+
+- created_to_visible: from a new item's server-side createdAt to the moment
+  this client received it (assumes the client and server clocks agree,
+  e.g. both on one host); updates of older items are not counted
+- ack_to_visible: with --probe-rate, this script also POSTs its own probe
+  readings and measures from the POST's response to seeing the item in the
+  feed, entirely on the client's clock
+
+Usage:
+    from items_tail import tail_items
+    for item in tail_items({'processType': 'Streeting'}):
+        ...
+
+    python items_tail.py --duration 60
+    python items_tail.py --duration 30 --probe-rate 20 --local
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+import api_client
+import sensor_data_generator
+from latency_stats import summarize, histogram_labels
+from sensor_spool import new_object_id
+from time_utils import to_epoch_ms
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+POLL_INTERVAL_SECONDS = 0.5  # Wait between polls that returned a partial page
+PAGE_SIZE = 1000  # Items per poll (server maximum is 5000)
+DURATION_SECONDS = 30  # Default measurement time of the CLI
+PROBE_RATE = 0  # Probe readings POSTed per second by the CLI (0 = off)
+DRAIN_SECONDS = 2.0  # Keep tailing this long after the last probe so it can show up
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+
+
+def fetch_changes(since, params=None, fields=None, limit=PAGE_SIZE, api_base_url=API_BASE_URL):
+    """
+    One poll of the change feed
+    Returns: (items, next since cursor, more pages waiting, response size in bytes)
+    Raises: requests.exceptions.RequestException on network or HTTP errors
+    """
+    query = dict(params or {})
+    query.update({'since': since, 'limit': limit})
+    if fields:
+        query['fields'] = ','.join(fields)
+
+    response = api_client.get(f"{api_base_url}/items", params=query)
+    response.raise_for_status()
+    return (response.json(), response.headers['X-Since-Cursor'],
+            response.headers.get('X-More') == 'true', len(response.content))
+
+
+def tail_items(params=None, since='now', fields=None, poll_interval=POLL_INTERVAL_SECONDS,
+               page_size=PAGE_SIZE, api_base_url=API_BASE_URL, stop_event=None, stats=None):
+    """
+    Yield items as they are created, updated or deleted, oldest change first,
+    until stop_event is set. Deleted items are yielded as tombstones
+    {'_id', 'deleted': True, 'updatedAt'}. since='now' skips the existing
+    items; a date or epoch ms replays changes after that time. When given,
+    stats counts polls, empty polls, items (tombstones included) and bytes.
+    Raises: requests.exceptions.RequestException on network or HTTP errors
+    """
+    stop_event = stop_event or threading.Event()
+    stats = stats if stats is not None else {}
+    for key in ('polls', 'empty_polls', 'items', 'bytes'):
+        stats.setdefault(key, 0)
+
+    while not stop_event.is_set():
+        items, since, more, size = fetch_changes(since, params, fields, page_size, api_base_url)
+        stats['polls'] += 1
+        stats['empty_polls'] += not items
+        stats['items'] += len(items)
+        stats['bytes'] += size
+        yield from items
+        if not more:
+            stop_event.wait(poll_interval)
+
+
+def run_probe_writer(rate, api_base_url, acked, stop_event, stats):
+    """POST `rate` probe readings per second, recording when each one was acknowledged"""
+    rng = random.Random()
+    interval = 1.0 / rate
+    next_due = time.monotonic()
+    while not stop_event.is_set():
+        payload = sensor_data_generator.generate_sensor_payload(rng)
+        payload['_id'] = new_object_id()
+        try:
+            response = api_client.post(f"{api_base_url}/items", json=payload)
+            if response.status_code == 201:
+                acked[payload['_id']] = time.time()
+                stats['probes_sent'] += 1
+            else:
+                stats['probes_failed'] += 1
+        except requests.exceptions.RequestException:
+            stats['probes_failed'] += 1
+
+        next_due += interval
+        stop_event.wait(max(0.0, next_due - time.monotonic()))
+
+
+def measure(duration, probe_rate, params, fields, poll_interval, api_base_url):
+    """
+    Tail the feed for `duration` seconds, optionally while writing probes
+    Returns: results dict with poll stats and latency summaries
+    """
+    stop_event = threading.Event()
+    writer_stop = threading.Event()
+    stats = {'probes_sent': 0, 'probes_failed': 0, 'deletions': 0}
+    acked, seen = {}, {}
+    created_to_visible = []
+
+    # Take the current position before the first probe is written
+    _, since, _, _ = fetch_changes('now', params, api_base_url=api_base_url)
+    writer = None
+    if probe_rate:
+        writer = threading.Thread(target=run_probe_writer, name="tail-probe-writer", daemon=True,
+                                  args=(probe_rate, api_base_url, acked, writer_stop, stats))
+        writer.start()
+    timers = [threading.Timer(duration, writer_stop.set),
+              threading.Timer(duration + (DRAIN_SECONDS if probe_rate else 0), stop_event.set)]
+    for timer in timers:
+        timer.start()
+
+    try:
+        for item in tail_items(params, since, fields, poll_interval, api_base_url=api_base_url,
+                               stop_event=stop_event, stats=stats):
+            if item.get('deleted'):
+                stats['deletions'] += 1
+                continue
+            now = time.time()
+            seen.setdefault(item['_id'], now)
+            # Only inserts: an update's createdAt says nothing about how fast the change arrived
+            if item.get('createdAt') and item['createdAt'] == item.get('updatedAt'):
+                created_to_visible.append(max(0.0, now - to_epoch_ms(item['createdAt']) / 1000))
+    finally:
+        writer_stop.set()
+        stop_event.set()
+        for timer in timers:
+            timer.cancel()
+        if writer is not None:
+            writer.join()
+
+    ack_to_visible = [max(0.0, seen[item_id] - acked_at) for item_id, acked_at in acked.items() if item_id in seen]
+    results = {
+        'benchmark': 'items_tail',
+        'started_at': datetime.now().isoformat(),
+        'api_url': api_base_url,
+        'duration_s': duration,
+        'poll_interval_s': poll_interval,
+        'probe_rate': probe_rate,
+        'params': params,
+        'fields': fields,
+        'stats': stats,
+        'probes_not_seen': len(acked) - len(ack_to_visible),
+        'histogram_buckets': histogram_labels(),
+        'created_to_visible': summarize(created_to_visible),
+        'ack_to_visible': summarize(ack_to_visible),
+    }
+    return results
+
+
+def print_results(results):
+    """Print the poll cost and latency summaries"""
+    stats = results['stats']
+    polls = stats['polls'] or 1
+    print(f"\n📡 Polls: {stats['polls']} ({stats['empty_polls']} empty) | Items: {stats['items']} "
+          f"({stats['deletions']} deletions) | "
+          f"{stats['bytes'] / 1024:.1f} KiB total, {stats['bytes'] / polls / 1024:.2f} KiB per poll")
+    if results['probe_rate']:
+        print(f"🧪 Probes sent: {stats['probes_sent']} | failed: {stats['probes_failed']} | "
+              f"not seen: {results['probes_not_seen']}")
+    for name in ('created_to_visible', 'ack_to_visible'):
+        summary = results[name]
+        if summary.get('count'):
+            print(f"⏱️  {name:20s} n={summary['count']:6d} | p50 {summary['p50_ms']:8.1f} | "
+                  f"p95 {summary['p95_ms']:8.1f} | max {summary['max_ms']:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tail GET /api/items?since= and measure ingest-to-visible latency")
+    parser.add_argument("--api-url", default=API_BASE_URL)
+    parser.add_argument("--duration", type=float, default=DURATION_SECONDS, help="Seconds to tail")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL_SECONDS)
+    parser.add_argument("--probe-rate", type=float, default=PROBE_RATE,
+                        help="Probe readings to POST per second while tailing (0 = only observe)")
+    parser.add_argument("--process-type", help="Only tail items with this processType")
+    parser.add_argument("--fields", nargs="+", help="Only download these fields, e.g. temperature.value")
+    parser.add_argument("--output", help="Result file (default: benchmark_results/tail_<time>.json)")
+    parser.add_argument("--local", action="store_true",
+                        help="Tail an in-process local_items_server instead of --api-url")
+    args = parser.parse_args()
+
+    local_server = None
+    if args.local:
+        from local_items_server import start_server
+        local_server, args.api_url = start_server(port=0)
+
+    params = {'processType': args.process_type} if args.process_type else {}
+    # createdAt is needed for the latency measurement (the feed always adds updatedAt)
+    fields = args.fields + ['createdAt'] if args.fields else None
+
+    print("\nItems Change Feed Tail")
+    print("=" * 60)
+    print(f"API URL: {args.api_url} | Duration: {args.duration}s | Poll interval: {args.poll_interval}s")
+    print(f"Probe rate: {args.probe_rate}/s" if args.probe_rate else "Probe writer: off")
+    print("=" * 60)
+
+    try:
+        results = measure(args.duration, args.probe_rate, params, fields, args.poll_interval, args.api_url)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Request failed: {str(e)}")
+        sys.exit(1)
+    finally:
+        if local_server:
+            local_server.shutdown()
+
+    print_results(results)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"tail_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
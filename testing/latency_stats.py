@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Latency Statistics Helpers
+
+Shared by the benchmark scripts to turn raw per-request latencies (seconds)
+into percentiles and a fixed-bucket histogram that can be merged across runs,
+threads or processes.
+"""
+
+import math
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def histogram(latencies):
+    """Count latencies (seconds) into HISTOGRAM_BOUNDS_MS buckets"""
+    counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    for latency in latencies:
+        latency_ms = latency * 1000
+        for i, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+            if latency_ms <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    return counts
+
+
+def histogram_labels():
+    """Human-readable labels matching histogram() buckets"""
+    labels = [f"<={bound}ms" for bound in HISTOGRAM_BOUNDS_MS]
+    labels.append(f">{HISTOGRAM_BOUNDS_MS[-1]}ms")
+    return labels
+
+
+def summarize(latencies):
+    """
+    Summarize latencies in seconds
+    Returns: dict with count, mean/p50/p95/p99/max in milliseconds and the histogram
+    """
+    ordered = sorted(latencies)
+
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        'count': len(ordered),
+        'mean_ms': ms(sum(ordered) / len(ordered)) if ordered else None,
+        'p50_ms': ms(percentile(ordered, 0.50)),
+        'p95_ms': ms(percentile(ordered, 0.95)),
+        'p99_ms': ms(percentile(ordered, 0.99)),
+        'max_ms': ms(ordered[-1]) if ordered else None,
+        'histogram': histogram(ordered),
+    }
@@ -0,0 +1,1039 @@
+#!/usr/bin/env python3
+"""
+Local Stand-in for the Items API
+
+A lightweight server implementing the /api/items contract of
+backend/routes/itemRoutes.js on top of SQLite (in memory by default), so the
+load and benchmark scripts can run on an isolated machine without MongoDB,
+and client-side overhead can be measured separately from database cost.
+
+Implemented:
+    POST   /api/items          same validation rules and defaults as the backend
+    POST   /api/items/bulk     per-item validation, rejected items reported by index
+                               (client-supplied _id values are kept; a repeated
+                               _id is rejected with a duplicate key error)
+    GET    /api/items          processType/operator/statusCode/productId filters,
+                               ?from=/?to= time window, ?fields= projection, newest
+                               first, ?limit=/?cursor= paging with X-Total-Count/X-Next-Cursor,
+                               ?since= change feed with X-Since-Cursor/X-More (deleted
+                               items as { _id, deleted: true, updatedAt } tombstones)
+    GET    /api/items/stats/quality
+                               QC dashboard metrics, grouped in SQL like the
+                               backend's $facet aggregation
+    GET    /api/items/rollups  per-minute/hour/day sensor rollups, updated on insert
+    PUT    /api/items/rollups  replace the rollups of whole UTC days (rebuild job), folding
+                               in the items created after the job's asOf
+    PUT    /api/items/:id      same field merge rules as the backend
+    DELETE /api/items/:id      leaves a tombstone for the change feed
+
+Usage:
+    python local_items_server.py                       # in-memory, port 5050
+    python local_items_server.py --db items.sqlite --port 5051
+
+    # In-process, e.g. from a benchmark
+    from local_items_server import start_server
+    server, base_url = start_server(port=0)
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import time_utils
+from time_utils import from_epoch_ms
+
+# ===== CONFIGURATION CONSTANTS =====
+DEFAULT_PORT = 5050
+MAX_PAGE_SIZE = 5000  # Same as backend/routes/itemRoutes.js
+MAX_BULK_ITEMS = 5000  # Same as backend/routes/itemRoutes.js
+EQUALITY_FILTERS = ('processType', 'operator', 'statusCode', 'productId')  # Exact-match GET filters
+ZERO_OBJECT_ID = '0' * 24  # Id part of a bare time position in a since cursor
+FIELD_PATH = re.compile(r'^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$')  # Paths accepted by ?fields=
+
+# ===== ITEM SCHEMA (mirrors backend/models/Item.js) =====
+MEASUREMENT_DEFAULTS = {
+    'squeegeeSpeed': {'unit': 'mm/s', 'deviceSource': 'clicker'},
+    'printPressure': {'unit': 'N/m²', 'deviceSource': 'load_cell'},
+    'inkViscosity': {'unit': 'cP', 'deviceSource': 'viscometer'},
+    'temperature': {'unit': '°C', 'deviceSource': 'thermometer'},
+    'speed': {'unit': 'mm/s', 'deviceSource': 'encoder'},
+}
+ENUMS = {
+    'processType': ['Silvering', 'Streeting', 'QualityControl'],
+    'processStation': ['Silvering', 'Streeting', 'Final Product check'],
+    'reworkability': ['Yes', 'No', 'N/A'],
+    'priority': ['L', 'M', 'H'],
+    'reworked': ['Yes', 'No', 'N/A'],
+    'decision': ['Yes', 'No', 'Goes to Rework'],
+}
+ARRAY_FIELDS = ['affectedOutput', 'targetMetricAffected', 'causeOfFailure']
+OBJECT_ID_PATTERN = re.compile(r'^[0-9a-fA-F]{24}$')
+# GET /stats/quality (same as backend/routes/itemRoutes.js)
+QUALITY_BIN_SIZES = {'temperature': 2, 'speed': 5, 'squeegeeSpeed': 5, 'printPressure': 1000, 'inkViscosity': 2}
+DEFECT_DECISIONS = ('No', 'Goes to Rework')
+MIN_RATE_SAMPLES = 2
+# Sensor rollups (same as backend/models/SensorRollup.js)
+ROLLUP_GRANULARITIES = {'minute': 60 * 1000, 'hour': 60 * 60 * 1000, 'day': 24 * 60 * 60 * 1000}
+ROLLUP_FIELDS = ['temperature', 'speed', 'squeegeeSpeed', 'printPressure', 'inkViscosity']
+MAX_ROLLUP_ROWS = 20000  # Same as backend/routes/itemRoutes.js
+MAX_ROLLUP_REBUILD_ROWS = 50000  # Same as backend/routes/itemRoutes.js
+# Sensor type digit (Z of a sensor data status code XYZW with Y=2) -> measurement field
+SENSOR_FIELDS = {'1': 'squeegeeSpeed', '2': 'printPressure', '3': 'inkViscosity',
+                 '4': 'temperature', '5': 'speed'}
+
+
+ITEM_COLUMNS = '(id, process_type, operator, ts_ms, doc, updated_ms) VALUES (?, ?, ?, ?, ?, ?)'
+
+
+class ValidationError(Exception):
+    """Raised for payloads the backend would answer with 400"""
+
+
+# =============================================================================
+# DOCUMENT HELPERS
+# =============================================================================
+
+_object_id_lock = threading.Lock()
+_object_id_counter = int.from_bytes(os.urandom(3), 'big')
+_object_id_process = os.urandom(5).hex()
+
+
+def new_object_id():
+    """24-hex id ordered by creation time, like a Mongo ObjectId"""
+    global _object_id_counter
+    with _object_id_lock:
+        _object_id_counter = (_object_id_counter + 1) % 0xFFFFFF
+        counter = _object_id_counter
+    return f"{int(time.time()):08x}{_object_id_process}{counter:06x}"
+
+
+def to_epoch_ms(value):
+    """Parse a timestamp like Mongoose casts to Date (missing means now); naive ISO strings are local time"""
+    if value is None or value == '':
+        return int(time.time() * 1000)
+    try:
+        return time_utils.to_epoch_ms(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f'Cast to date failed for value "{value}" at path "timestamp"')
+
+
+def parse_time_bound(name, value):
+    """Parse a ?from= / ?to= bound (epoch ms or ISO date) to epoch ms"""
+    if value.isdigit():
+        return int(value)
+    try:
+        return to_epoch_ms(value)
+    except ValidationError:
+        raise ValidationError(f'{name} must be an ISO date or epoch milliseconds')
+
+
+def build_item_filters(query, defaults=None):
+    """Filters of a GET /api/items query; from/to become epoch ms bounds (from inclusive, to exclusive)"""
+    filters = dict(defaults or {})
+    filters.update({key: query[key] for key in EQUALITY_FILTERS if query.get(key)})
+    for name in ('from', 'to'):
+        if query.get(name):
+            filters[name] = parse_time_bound(name, query[name])
+    return filters
+
+
+def parse_fields(fields):
+    """?fields=a,b.c -> list of paths, always including timestamp; None for full documents"""
+    if not fields:
+        return None
+    paths = [path.strip() for path in fields.split(',') if path.strip()]
+    for path in paths:
+        if not FIELD_PATH.match(path):
+            raise ValidationError(f'Invalid field "{path}"')
+    return list(dict.fromkeys(paths + ['timestamp']))
+
+
+def project(item, paths):
+    """Keep _id and the given dotted paths of an item, like a Mongo inclusion projection"""
+    result = {'_id': item['_id']}
+    for path in paths:
+        source, target = item, result
+        *parents, leaf = path.split('.')
+        for key in parents:
+            source = source.get(key) if isinstance(source, dict) else None
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(key, {})
+        else:
+            if leaf in source:
+                target[leaf] = source[leaf]
+    return result
+
+
+def parse_rollup_filters(query):
+    """granularity/processType/field/from/to of a rollup query; from/to become epoch ms"""
+    if query.get('granularity') and query['granularity'] not in ROLLUP_GRANULARITIES:
+        raise ValidationError(f"granularity must be one of {', '.join(ROLLUP_GRANULARITIES)}")
+    if query.get('field') and query['field'] not in ROLLUP_FIELDS:
+        raise ValidationError(f"field must be one of {', '.join(ROLLUP_FIELDS)}")
+    filters = {key: query[key] for key in ('granularity', 'processType', 'field') if query.get(key)}
+    for name in ('from', 'to'):
+        if query.get(name) not in (None, ''):
+            filters[name] = parse_time_bound(name, str(query[name]))
+    return filters
+
+
+def sensor_field_for_status_code(status_code):
+    """Measurement field of a single-sensor status code, e.g. 2240 -> temperature"""
+    code = str(status_code if status_code is not None else '')
+    if len(code) == 4 and code[0] in '12' and code[1] == '2' and code[2] in SENSOR_FIELDS and code[3].isdigit():
+        return SENSOR_FIELDS[code[2]]
+    return None
+
+
+def validate_item_payload(payload):
+    """Port of validateItemPayload() in itemRoutes.js"""
+    if not isinstance(payload, dict):
+        raise ValidationError('Missing processType')
+
+    def value(field):
+        measurement = payload.get(field)
+        return measurement.get('value') if isinstance(measurement, dict) else None
+
+    process_type = payload.get('processType')
+    if not process_type:
+        raise ValidationError('Missing processType')
+
+    # Single-sensor readings (e.g. 2240 thermometer) only carry their own measurement
+    sensor_field = process_type != 'QualityControl' and sensor_field_for_status_code(payload.get('statusCode'))
+    if sensor_field and value(sensor_field) in (None, ''):
+        raise ValidationError(f"Missing {sensor_field} value for sensor status code {payload.get('statusCode')}")
+
+    if process_type == 'Silvering' and not sensor_field:
+        if not value('squeegeeSpeed') or not value('printPressure') or not value('inkViscosity'):
+            raise ValidationError('Missing required silvering sensor values')
+
+    if process_type == 'Streeting' and not sensor_field:
+        if not value('temperature') or not value('speed'):
+            raise ValidationError('Missing required streeting sensor values')
+
+    if process_type == 'QualityControl':
+        if not payload.get('processStation') or not payload.get('productId'):
+            raise ValidationError('Missing required quality control fields')
+
+    if payload.get('decision') in ('No', 'Goes to Rework') and not payload.get('causeOfFailure'):
+        raise ValidationError('Cause of failure is required when decision is No or Goes to Rework')
+
+
+def build_item(payload):
+    """Port of buildItemFields() plus the Item schema defaults and casts"""
+    item = {'_id': build_object_id(payload.get('_id')), 'processType': payload.get('processType')}
+
+    for field, defaults in MEASUREMENT_DEFAULTS.items():
+        measurement = dict(defaults)
+        if isinstance(payload.get(field), dict):
+            measurement.update(payload[field])
+        item[field] = cast_measurement(field, measurement)
+
+    for field in ('processStation', 'productId', 'reworkability'):
+        if payload.get(field) is not None:
+            item[field] = str(payload[field])
+
+    item['affectedOutput'] = payload.get('affectedOutput') or []
+    item['priority'] = payload.get('priority') or 'M'
+    item['targetMetricAffected'] = payload.get('targetMetricAffected') or []
+    item['operator'] = payload.get('operator') or 'Unknown'
+    if payload.get('statusCode') is not None:
+        item['statusCode'] = str(payload['statusCode'])
+    item['reworked'] = payload.get('reworked') or 'No'
+    item['decision'] = payload.get('decision') or 'Yes'
+    item['causeOfFailure'] = payload.get('causeOfFailure') or []
+    item['comments'] = ''  # The backend route does not store comments on create
+    item['timestamp'] = from_epoch_ms(to_epoch_ms(payload.get('timestamp')))
+    item['createdAt'] = item['updatedAt'] = from_epoch_ms(int(time.time() * 1000))
+    item['__v'] = 0
+
+    validate_schema(item)
+    return item
+
+
+def build_object_id(value):
+    """Keep a client-supplied ObjectId (cast like Mongoose) or create a new one"""
+    if value is None:
+        return new_object_id()
+    if not isinstance(value, str) or not OBJECT_ID_PATTERN.match(value):
+        raise ValidationError(f'Item validation failed: _id: Cast to ObjectId failed '
+                              f'for value "{value}" at path "_id"')
+    return value.lower()
+
+
+def rate_rows(groups, key):
+    """(bucket, total, defects) groups -> rate rows, like rateRows() in the backend"""
+    result = [{key: bucket, 'defectRate': defects / total * 100,
+               'passRate': (total - defects) / total * 100, 'totalSamples': total}
+              for bucket, total, defects in groups]
+    return sorted((row for row in result if row['totalSamples'] >= MIN_RATE_SAMPLES), key=lambda row: row[key])
+
+
+def operator_breakdown(groups, operators):
+    """(operator, name, count) groups -> totals, names and per-operator rows, like operatorBreakdown()"""
+    totals, per_operator = {}, {}
+    for operator, name, count in groups:
+        totals[name] = totals.get(name, 0) + count
+        if operator:
+            per_operator.setdefault(operator, {})[name] = count
+    names = sorted(totals)
+    return {
+        'totals': [{'name': name, 'count': count}
+                   for name, count in sorted(totals.items(), key=lambda entry: (-entry[1], entry[0]))],
+        'names': names,
+        'byOperator': [{'operator': operator, **{name: per_operator.get(operator, {}).get(name, 0) for name in names}}
+                       for operator in operators],
+    }
+
+
+def build_quality_stats(groups):
+    """Shape ItemStore.quality_stats() groups into the GET /stats/quality response"""
+    reworked = dict(groups['reworked'])
+    causes = operator_breakdown(groups['causeOfFailure'], groups['operators'])
+    outputs = operator_breakdown(groups['affectedOutput'], groups['operators'])
+    bins = {}
+    for name, size in QUALITY_BIN_SIZES.items():
+        rows = rate_rows(groups['bins'].get(name, []), 'binStart')
+        bins[name] = [{'bin': f"{row['binStart']:.1f}-{row['binStart'] + size:.1f}", **row} for row in rows]
+    return {
+        'total': groups['total'],
+        'decisions': dict(groups['decisions']),
+        'reworked': {'Yes': reworked.get('Yes', 0), 'No': reworked.get('No', 0)},
+        'reworkOutcome': dict(groups['reworkOutcome']),
+        'causeOfFailure': causes['totals'],
+        'affectedOutput': outputs['totals'],
+        'operators': groups['operators'],
+        'causes': causes['names'],
+        'outputs': outputs['names'],
+        'causeOfFailureByOperator': causes['byOperator'],
+        'affectedOutputByOperator': outputs['byOperator'],
+        'speedDefectRate': rate_rows(groups['speed'], 'speed'),
+        'temperatureDefectRate': rate_rows(groups['temperature'], 'temperature'),
+        'bins': bins,
+    }
+
+
+def cast_measurement(field, measurement):
+    """Cast a measurement value to a number like Mongoose does"""
+    raw = measurement.get('value')
+    if raw is not None and not isinstance(raw, (int, float)):
+        try:
+            measurement['value'] = float(raw)
+        except (TypeError, ValueError):
+            raise ValidationError(f'Item validation failed: {field}.value: Cast to Number failed '
+                                  f'for value "{raw}" at path "{field}.value"')
+    return measurement
+
+
+def validate_schema(item):
+    """Required fields and enums from the Item model"""
+    for field in ('processType', 'statusCode'):
+        if not item.get(field):
+            raise ValidationError(f'Item validation failed: {field}: Path `{field}` is required.')
+    for field, allowed in ENUMS.items():
+        if field in item and item[field] not in allowed:
+            raise ValidationError(f'Item validation failed: {field}: `{item[field]}` is not a '
+                                  f'valid enum value for path `{field}`.')
+    for field in ARRAY_FIELDS:
+        if not isinstance(item[field], list):
+            item[field] = [item[field]]
+
+
+def combine_rollups(items):
+    """
+    Aggregate items per rollup bucket, like combineItems in backend/models/SensorRollup.js
+    Returns: dict of (granularity, processType, field, bucket ms) -> [count, sum, min, max]
+    """
+    buckets = {}
+    for item in items:
+        if not item.get('processType') or not item.get('timestamp'):
+            continue
+        ts_ms = to_epoch_ms(item['timestamp'])
+        for field in ROLLUP_FIELDS:
+            value = (item.get(field) or {}).get('value')
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+                continue
+            for granularity, width in ROLLUP_GRANULARITIES.items():
+                key = (granularity, item['processType'], field, ts_ms - ts_ms % width)
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = [1, value, value, value]
+                else:
+                    bucket[0] += 1
+                    bucket[1] += value
+                    bucket[2] = min(bucket[2], value)
+                    bucket[3] = max(bucket[3], value)
+    return buckets
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class ItemStore:
+    """SQLite-backed item store; filter columns are indexed, documents kept as JSON"""
+
+    def __init__(self, db_path=':memory:'):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS items (
+                id TEXT PRIMARY KEY,
+                process_type TEXT,
+                operator TEXT,
+                ts_ms INTEGER,
+                doc TEXT NOT NULL,
+                updated_ms INTEGER
+            )''')
+        if 'updated_ms' not in [row[1] for row in self.db.execute('PRAGMA table_info(items)')]:
+            self.db.execute('ALTER TABLE items ADD COLUMN updated_ms INTEGER')
+        self.db.execute('CREATE INDEX IF NOT EXISTS items_ts ON items (ts_ms DESC, id DESC)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS items_process_ts ON items (process_type, ts_ms DESC)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS items_operator_ts ON items (operator, ts_ms DESC)')
+        self.db.execute("CREATE INDEX IF NOT EXISTS items_status_ts ON items "
+                        "(json_extract(doc, '$.statusCode'), ts_ms DESC)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS items_product ON items (json_extract(doc, '$.productId'))")
+        self.db.execute('CREATE INDEX IF NOT EXISTS items_updated ON items (updated_ms, id)')
+        # Tombstones of deleted items (backend/models/DeletedItem.js); same filter columns as items
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS deleted_items (
+                id TEXT PRIMARY KEY,
+                process_type TEXT,
+                operator TEXT,
+                ts_ms INTEGER,
+                doc TEXT NOT NULL,
+                deleted_ms INTEGER
+            )''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS deleted_items_deleted ON deleted_items (deleted_ms, id)')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS rollups (
+                granularity TEXT,
+                process_type TEXT,
+                field TEXT,
+                bucket_ms INTEGER,
+                count INTEGER,
+                sum REAL,
+                min REAL,
+                max REAL,
+                rebuilt_at INTEGER,
+                PRIMARY KEY (granularity, process_type, field, bucket_ms)
+            )''')
+        self.db.commit()
+        self.db.create_function('floor', 1, math.floor, deterministic=True)
+        # Start times of the writes in progress, by handle (see settled_ms)
+        self.in_flight = {}
+        self.in_flight_lock = threading.Lock()
+        self.next_write_handle = 0
+
+    def begin_write(self):
+        """
+        Register a write before it stamps updatedAt, like beginWrite() in the backend
+        Returns: handle for end_write()
+        """
+        with self.in_flight_lock:
+            handle = self.next_write_handle
+            self.next_write_handle += 1
+            self.in_flight[handle] = int(time.time() * 1000)
+        return handle
+
+    def end_write(self, handle):
+        with self.in_flight_lock:
+            self.in_flight.pop(handle, None)
+
+    def settled_ms(self):
+        """Latest change time the feed may return: every write stamped at or before it has completed"""
+        with self.in_flight_lock:
+            return min([int(time.time() * 1000), *self.in_flight.values()]) - 1
+
+    @staticmethod
+    def _row(item):
+        return (item['_id'], item['processType'], item['operator'], to_epoch_ms(item['timestamp']),
+                json.dumps(item, ensure_ascii=False), to_epoch_ms(item.get('updatedAt')))
+
+    def insert_many(self, items):
+        """
+        Insert items unordered, like insertMany({ ordered: false })
+        Returns: list of (index, message) for items whose _id already exists
+        """
+        duplicates, inserted = [], []
+        with self.lock:
+            for index, item in enumerate(items):
+                try:
+                    self.db.execute(f'INSERT INTO items {ITEM_COLUMNS}', self._row(item))
+                    inserted.append(item)
+                except sqlite3.IntegrityError:
+                    duplicates.append((index, f'E11000 duplicate key error collection: items '
+                                              f'index: _id_ dup key: {{ _id: ObjectId(\'{item["_id"]}\') }}'))
+            self._record_rollups(inserted)
+            self.db.commit()
+        return duplicates
+
+    def _record_rollups(self, items):
+        """Fold inserted items into the rollups, like SensorRollup.recordItems (caller holds the lock)"""
+        self.db.executemany('''
+            INSERT INTO rollups (granularity, process_type, field, bucket_ms, count, sum, min, max)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT DO UPDATE SET count = count + excluded.count, sum = sum + excluded.sum,
+                min = MIN(min, excluded.min), max = MAX(max, excluded.max)''',
+            [(*key, *bucket) for key, bucket in combine_rollups(items).items()])
+
+    def rollups(self, filters, limit):
+        """Rollup rows matching filters (granularity, processType, field, from/to ms), oldest bucket first"""
+        clauses, params = [], []
+        for key, column in (('granularity', 'granularity'), ('processType', 'process_type'), ('field', 'field')):
+            if filters.get(key):
+                clauses.append(f'{column} = ?')
+                params.append(filters[key])
+        if filters.get('from') is not None:
+            clauses.append('bucket_ms >= ?')
+            params.append(filters['from'])
+        if filters.get('to') is not None:
+            clauses.append('bucket_ms < ?')
+            params.append(filters['to'])
+        where = (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+        with self.lock:
+            rows = self.db.execute(
+                f'SELECT granularity, bucket_ms, process_type, field, count, sum, min, max FROM rollups{where} '
+                f'ORDER BY bucket_ms, process_type, field LIMIT ?', [*params, limit]).fetchall()
+        return [{'granularity': granularity, 'bucketStart': from_epoch_ms(bucket_ms), 'processType': process_type,
+                 'field': field, 'count': count, 'sum': total, 'min': low, 'max': high,
+                 'mean': total / count if count else None}
+                for granularity, bucket_ms, process_type, field, count, total, low, high in rows]
+
+    def replace_rollups(self, from_ms, to_ms, as_of_ms, rows):
+        """
+        Replace every rollup row of [from_ms, to_ms) with rows, which cover the
+        items created at or before as_of_ms; items created later are folded in
+        Returns: (rows written, stale rows deleted, late items folded in)
+        """
+        buckets = {(row['granularity'], row['processType'], row['field'], row['bucket_ms']):
+                   [row['count'], row['sum'], row['min'], row['max']] for row in rows}
+        # The lock also covers insert_many and its rollup update, so no increment lands in between
+        with self.lock:
+            late = [item for item in (json.loads(doc) for (doc,) in self.db.execute(
+                        'SELECT doc FROM items WHERE ts_ms >= ? AND ts_ms < ?', (from_ms, to_ms)))
+                    if item.get('createdAt') and to_epoch_ms(item['createdAt']) > as_of_ms]
+            for key, (count, total, low, high) in combine_rollups(late).items():
+                bucket = buckets.setdefault(key, [0, 0.0, low, high])
+                bucket[0] += count
+                bucket[1] += total
+                bucket[2] = min(bucket[2], low)
+                bucket[3] = max(bucket[3], high)
+
+            existing = set(self.db.execute('SELECT granularity, process_type, field, bucket_ms FROM rollups '
+                                           'WHERE bucket_ms >= ? AND bucket_ms < ?', (from_ms, to_ms)).fetchall())
+            self.db.execute('DELETE FROM rollups WHERE bucket_ms >= ? AND bucket_ms < ?', (from_ms, to_ms))
+            rebuilt_at = int(time.time() * 1000)
+            self.db.executemany('INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                [(*key, *bucket, rebuilt_at) for key, bucket in buckets.items()])
+            self.db.commit()
+        return len(buckets), len(existing - set(buckets)), len(late)
+
+    def replace(self, item):
+        with self.lock:
+            self.db.execute(f'REPLACE INTO items {ITEM_COLUMNS}', self._row(item))
+            self.db.commit()
+
+    def get(self, item_id):
+        with self.lock:
+            row = self.db.execute('SELECT doc FROM items WHERE id = ?', (item_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, item_id):
+        """Delete an item and leave a tombstone with its filter fields"""
+        with self.lock:
+            row = self.db.execute('SELECT process_type, operator, ts_ms, doc FROM items WHERE id = ?',
+                                  (item_id,)).fetchone()
+            if row is None:
+                return
+            process_type, operator, ts_ms, doc = row
+            doc = json.loads(doc)
+            filter_doc = {key: doc.get(key) for key in ('statusCode', 'productId')}
+            self.db.execute('DELETE FROM items WHERE id = ?', (item_id,))
+            self.db.execute('REPLACE INTO deleted_items VALUES (?, ?, ?, ?, ?, ?)',
+                            (item_id, process_type, operator, ts_ms, json.dumps(filter_doc), int(time.time() * 1000)))
+            self.db.commit()
+
+    @staticmethod
+    def _where(filters, cursor=None):
+        clauses, params = [], []
+        if filters.get('processType'):
+            clauses.append('process_type = ?')
+            params.append(filters['processType'])
+        if filters.get('operator'):
+            clauses.append('operator = ?')
+            params.append(filters['operator'])
+        for key in ('statusCode', 'productId'):
+            if filters.get(key):
+                clauses.append(f"json_extract(doc, '$.{key}') = ?")
+                params.append(filters[key])
+        if filters.get('from') is not None:
+            clauses.append('ts_ms >= ?')
+            params.append(filters['from'])
+        if filters.get('to') is not None:
+            clauses.append('ts_ms < ?')
+            params.append(filters['to'])
+        if cursor:
+            ts_ms, item_id = cursor
+            clauses.append('(ts_ms < ? OR (ts_ms = ? AND id < ?))')
+            params.extend([ts_ms, ts_ms, item_id])
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def count(self, filters):
+        where, params = self._where(filters)
+        with self.lock:
+            return self.db.execute(f'SELECT COUNT(*) FROM items{where}', params).fetchone()[0]
+
+    def quality_stats(self, filters):
+        """Groups behind GET /stats/quality, computed in SQL like the backend's $facet stages"""
+        where, params = self._where(filters)
+        where = where or ' WHERE 1'
+
+        def field(path):
+            return f"json_extract(doc, '$.{path}')"
+
+        def measured(name):
+            value = field(f'{name}.value')
+            return f"{value} IS NOT NULL AND {value} != 0 AND COALESCE({field('decision')}, '') != ''"
+
+        defects = f"SUM({field('decision')} IN {DEFECT_DECISIONS})"
+
+        def rows(sql, select_params=()):
+            with self.lock:
+                return self.db.execute(sql, [*select_params, *params]).fetchall()
+
+        groups = {
+            'total': rows(f"SELECT COUNT(*) FROM items{where}")[0][0],
+            'decisions': rows(f"SELECT COALESCE({field('decision')}, 'Unknown'), COUNT(*) "
+                              f"FROM items{where} GROUP BY 1"),
+            'reworked': rows(f"SELECT COALESCE({field('reworked')}, 'No'), COUNT(*) FROM items{where} GROUP BY 1"),
+            'reworkOutcome': rows(f"SELECT COALESCE({field('reworkOutcome')}, {field('decision')}), COUNT(*) "
+                                  f"FROM items{where} AND {field('reworked')} = 'Yes' GROUP BY 1"),
+            'operators': [row[0] for row in rows(
+                f"SELECT DISTINCT operator FROM items{where} AND COALESCE(operator, '') != '' ORDER BY 1")],
+            'speed': rows(f"SELECT floor({field('speed.value')} / 2) * 2, COUNT(*), {defects} "
+                          f"FROM items{where} AND {measured('speed')} GROUP BY 1"),
+            'temperature': rows(f"SELECT floor({field('temperature.value')}), COUNT(*), {defects} "
+                                f"FROM items{where} AND {measured('temperature')} GROUP BY 1"),
+            'bins': {},
+        }
+        for array_field in ('causeOfFailure', 'affectedOutput'):
+            groups[array_field] = rows(
+                f"SELECT items.operator, entry.value, COUNT(*) "
+                f"FROM items, json_each(items.doc, '$.{array_field}') AS entry{where} GROUP BY 1, 2")
+        for name, size in QUALITY_BIN_SIZES.items():
+            value = field(f'{name}.value')
+            minimum = rows(f"SELECT MIN({value}) FROM items{where} AND {measured(name)}")[0][0]
+            if minimum is not None:
+                groups['bins'][name] = rows(
+                    f"SELECT floor(({value} - ?) / ?) * ? + ?, COUNT(*), {defects} "
+                    f"FROM items{where} AND {measured(name)} GROUP BY 1",
+                    (minimum, size, size, minimum))
+        return groups
+
+    def changes(self, filters, since, settled_ms, limit, fields=None):
+        """
+        Items changed or deleted after since=(updated_ms, id) and at or before
+        settled_ms, oldest change first; deletions are tombstones
+        """
+        where, params = self._where(filters)
+        updated_ms, item_id = since
+        after = ' AND ({0} > ? OR ({0} = ? AND id > ?)) AND {0} <= ?'
+        params.extend([updated_ms, updated_ms, item_id, settled_ms, limit])
+        with self.lock:
+            rows = self.db.execute(f"SELECT updated_ms, id, doc FROM items{where or ' WHERE 1'}"
+                                   f"{after.format('updated_ms')} ORDER BY updated_ms, id LIMIT ?", params).fetchall()
+            rows += [(deleted_ms, deleted_id, None) for deleted_ms, deleted_id in self.db.execute(
+                f"SELECT deleted_ms, id FROM deleted_items{where or ' WHERE 1'}"
+                f"{after.format('deleted_ms')} ORDER BY deleted_ms, id LIMIT ?", params).fetchall()]
+
+        changes = []
+        for changed_ms, changed_id, doc in sorted(rows, key=lambda row: row[:2])[:limit]:
+            if doc is None:
+                changes.append({'_id': changed_id, 'deleted': True, 'updatedAt': from_epoch_ms(changed_ms)})
+            else:
+                item = json.loads(doc)
+                changes.append(project(item, fields + ['updatedAt']) if fields else item)
+        return changes
+
+    def find(self, filters, limit=None, cursor=None, fields=None):
+        """Items matching filters, newest first, projected to `fields` when given"""
+        where, params = self._where(filters, cursor)
+        sql = f'SELECT doc FROM items{where} ORDER BY ts_ms DESC, id DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+        items = (json.loads(row[0]) for row in rows)
+        return [project(item, fields) for item in items] if fields else list(items)
+
+
+# =============================================================================
+# HTTP HANDLER
+# =============================================================================
+
+class ItemsHandler(BaseHTTPRequestHandler):
+    """Routes /api/items requests to the store"""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive, as pooled clients expect
+    disable_nagle_algorithm = True  # Otherwise small responses wait on delayed ACKs (~40 ms)
+    store = None
+    quiet = False
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    # ----- plumbing -----
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'X-Total-Count, X-Next-Cursor, X-Since-Cursor, X-More')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            raise ValidationError('Invalid JSON body')
+
+    def route(self):
+        """Split the path into (segments after /api/items, query dict) or None"""
+        parsed = urlparse(self.path)
+        parts = [part for part in parsed.path.split('/') if part]
+        if parts[:2] != ['api', 'items']:
+            return None, None
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        return parts[2:], query
+
+    def not_found(self):
+        self.send_json(404, {'message': 'Endpoint not found'})
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    # ----- routes -----
+
+    def do_POST(self):
+        segments, _ = self.route()
+        if segments == []:
+            return self.create_item()
+        if segments == ['bulk']:
+            return self.create_items_bulk()
+        self.not_found()
+
+    def do_GET(self):
+        segments, query = self.route()
+        if segments == []:
+            return self.list_items(query)
+        if segments == ['rollups']:
+            return self.list_rollups(query)
+        if segments == ['stats', 'quality']:
+            try:
+                filters = build_item_filters(query, {'processType': 'QualityControl'})
+            except ValidationError as e:
+                return self.send_json(400, {'message': str(e)})
+            try:
+                return self.send_json(200, build_quality_stats(self.store.quality_stats(filters)))
+            except sqlite3.Error as e:
+                print(f"❌ Quality stats failed: {e}")
+                return self.send_json(500, {'message': str(e)})
+        self.not_found()
+
+    def do_PUT(self):
+        segments, _ = self.route()
+        if segments == ['rollups']:
+            return self.rebuild_rollups()
+        if segments is not None and len(segments) == 1:
+            return self.update_item(segments[0])
+        self.not_found()
+
+    def do_DELETE(self):
+        segments, _ = self.route()
+        if segments is not None and len(segments) == 1:
+            handle = self.store.begin_write()
+            try:
+                self.store.delete(segments[0])
+            finally:
+                self.store.end_write(handle)
+            return self.send_json(200, {'message': 'Item deleted'})
+        self.not_found()
+
+    def create_item(self):
+        try:
+            payload = self.read_json()
+            validate_item_payload(payload)
+            handle = self.store.begin_write()
+            try:
+                item = build_item(payload)
+                duplicates = self.store.insert_many([item])
+            finally:
+                self.store.end_write(handle)
+            for _, message in duplicates:
+                raise ValidationError(message)
+            self.send_json(201, item)
+        except ValidationError as e:
+            self.send_json(400, {'message': str(e)})
+
+    def create_items_bulk(self):
+        try:
+            body = self.read_json()
+            if not isinstance(body, (list, dict)):
+                raise ValidationError('Expected a non-empty array of items')
+            payloads = body if isinstance(body, list) else body.get('items')
+            if not isinstance(payloads, list) or not payloads:
+                raise ValidationError('Expected a non-empty array of items')
+            if len(payloads) > MAX_BULK_ITEMS:
+                raise ValidationError(f'A bulk request may contain at most {MAX_BULK_ITEMS} items')
+        except ValidationError as e:
+            return self.send_json(400, {'message': str(e)})
+
+        items, item_indexes, failed = [], [], []
+        handle = self.store.begin_write()
+        try:
+            for index, payload in enumerate(payloads):
+                try:
+                    validate_item_payload(payload)
+                    items.append(build_item(payload))
+                    item_indexes.append(index)
+                except ValidationError as e:
+                    failed.append({'index': index, 'message': str(e)})
+
+            duplicates = self.store.insert_many(items) if items else []
+        finally:
+            self.store.end_write(handle)
+        for i, message in duplicates:
+            failed.append({'index': item_indexes[i], 'message': message})
+        duplicate_items = {i for i, _ in duplicates}
+        inserted_ids = [item['_id'] for i, item in enumerate(items) if i not in duplicate_items]
+        self.send_json(201 if inserted_ids else 400, {
+            'insertedCount': len(inserted_ids),
+            'insertedIds': inserted_ids,
+            'failed': sorted(failed, key=lambda f: f['index']),
+        })
+
+    def list_changes(self, query):
+        """?since= change feed, see backend/routes/itemRoutes.js sendChangesSince"""
+        try:
+            limit = int(query.get('limit', MAX_PAGE_SIZE))
+        except ValueError:
+            limit = -1
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            raise ValidationError(f'limit must be an integer between 1 and {MAX_PAGE_SIZE}')
+        settled_ms = self.store.settled_ms()
+        since = query['since']
+        if since == 'now':
+            return self.send_json(200, [], {'X-Since-Cursor': f'{settled_ms}_{ZERO_OBJECT_ID}'})
+
+        if '_' in since:
+            try:
+                updated_ms, item_id = since.split('_')
+                position = (int(updated_ms), item_id)
+            except ValueError:
+                raise ValidationError('Invalid since cursor')
+            if not OBJECT_ID_PATTERN.match(item_id):
+                raise ValidationError('Invalid since cursor')
+        else:
+            # A bare time matches items updated strictly after it
+            position = (parse_time_bound('since', since), 'g' * 24)
+
+        items = self.store.changes(build_item_filters(query), position, settled_ms, limit,
+                                   parse_fields(query.get('fields')))
+        headers = {'X-Since-Cursor': f"{to_epoch_ms(items[-1]['updatedAt'])}_{items[-1]['_id']}" if items else since}
+        if len(items) == limit:
+            headers['X-More'] = 'true'
+        self.send_json(200, items, headers)
+
+    def list_items(self, query):
+        try:
+            if query.get('since'):
+                return self.list_changes(query)
+            filters = build_item_filters(query)
+            fields = parse_fields(query.get('fields'))
+            if 'limit' not in query:
+                return self.send_json(200, self.store.find(filters, fields=fields))
+
+            try:
+                limit = int(query['limit'])
+            except ValueError:
+                limit = -1
+            if limit < 0 or limit > MAX_PAGE_SIZE:
+                raise ValidationError(f'limit must be an integer between 0 and {MAX_PAGE_SIZE}')
+
+            headers = {}
+            cursor = None
+            if query.get('cursor'):
+                try:
+                    ts_ms, item_id = query['cursor'].split('_')
+                    cursor = (int(ts_ms), item_id)
+                except ValueError:
+                    raise ValidationError('Invalid cursor')
+            else:
+                headers['X-Total-Count'] = str(self.store.count(filters))
+            if limit == 0:
+                return self.send_json(200, [], headers)
+
+            items = self.store.find(filters, limit, cursor, fields)
+            if len(items) == limit:
+                last = items[-1]
+                headers['X-Next-Cursor'] = f"{to_epoch_ms(last['timestamp'])}_{last['_id']}"
+            self.send_json(200, items, headers)
+        except ValidationError as e:
+            self.send_json(400, {'message': str(e)})
+
+    def list_rollups(self, query):
+        """GET /rollups, see backend/routes/itemRoutes.js"""
+        try:
+            filters = parse_rollup_filters({'granularity': 'hour', **query})
+        except ValidationError as e:
+            return self.send_json(400, {'message': str(e)})
+        rows = self.store.rollups(filters, MAX_ROLLUP_ROWS + 1)
+        headers = {}
+        if len(rows) > MAX_ROLLUP_ROWS:
+            rows.pop()
+            headers['X-More'] = 'true'
+        self.send_json(200, rows, headers)
+
+    def rebuild_rollups(self):
+        """PUT /rollups: replace the rollups of a window of whole UTC days"""
+        try:
+            body = self.read_json()
+            if not isinstance(body, dict):
+                raise ValidationError('Expected a rebuild object')
+            window = parse_rollup_filters({'from': body.get('from'), 'to': body.get('to')})
+            day_ms = ROLLUP_GRANULARITIES['day']
+            if (window.get('from') is None or window.get('to') is None
+                    or window['from'] % day_ms or window['to'] % day_ms):
+                raise ValidationError('from and to must both be UTC midnights')
+            if body.get('asOf') is None:
+                raise ValidationError('asOf is required')
+            as_of_ms = parse_time_bound('asOf', str(body['asOf']))
+            rows = body.get('rows')
+            if not isinstance(rows, list) or len(rows) > MAX_ROLLUP_REBUILD_ROWS:
+                raise ValidationError(f'rows must be an array of at most {MAX_ROLLUP_REBUILD_ROWS} rollups')
+            parsed = []
+            for index, row in enumerate(rows):
+                try:
+                    if not isinstance(row, dict):
+                        raise ValidationError('expected a rollup object')
+                    parse_rollup_filters({'granularity': row['granularity'], 'field': row['field']})
+                    if not row.get('processType'):
+                        raise ValidationError('processType is required')
+                    bucket_ms = to_epoch_ms(row['bucketStart'])
+                    parsed.append({**row, 'bucket_ms': bucket_ms,
+                                   'count': int(row['count']), 'sum': float(row['sum']),
+                                   'min': float(row['min']), 'max': float(row['max'])})
+                except (KeyError, TypeError, ValueError, ValidationError) as e:
+                    raise ValidationError(f'rows[{index}]: {e}')
+                if (not window['from'] <= bucket_ms < window['to']
+                        or bucket_ms % ROLLUP_GRANULARITIES[row['granularity']]):
+                    raise ValidationError(f"rows[{index}]: bucketStart is not a {row['granularity']} "
+                                          f"bucket inside the window")
+        except ValidationError as e:
+            return self.send_json(400, {'message': str(e)})
+        replaced, deleted, late_items = self.store.replace_rollups(window['from'], window['to'], as_of_ms, parsed)
+        self.send_json(200, {'replaced': replaced, 'deleted': deleted, 'lateItems': late_items})
+
+    def update_item(self, item_id):
+        handle = None
+        try:
+            existing = self.store.get(item_id)
+            if existing is None:
+                return self.send_json(404, {'message': 'Item not found'})
+            body = self.read_json()
+            if not isinstance(body, dict):
+                raise ValidationError('Expected an item object')
+
+            for field in ('processType', 'processStation', 'productId', 'reworkability',
+                          'affectedOutput', 'priority', 'targetMetricAffected', 'operator', 'statusCode'):
+                value = body.get(field) or existing.get(field)
+                if value is not None:
+                    existing[field] = value
+            for field in ('reworked', 'decision', 'causeOfFailure'):
+                if field in body:
+                    existing[field] = body[field]
+            handle = self.store.begin_write()
+            existing['timestamp'] = existing['updatedAt'] = from_epoch_ms(int(time.time() * 1000))
+
+            if existing.get('decision') in ('No', 'Goes to Rework') and not existing.get('causeOfFailure'):
+                raise ValidationError('Cause of failure is required when decision is No or Goes to Rework')
+
+            for field in MEASUREMENT_DEFAULTS:
+                if body.get(field):
+                    existing[field] = cast_measurement(field, {**existing.get(field, {}), **body[field]})
+
+            validate_schema(existing)
+            self.store.replace(existing)
+            self.send_json(200, existing)
+        except ValidationError as e:
+            self.send_json(400, {'message': str(e)})
+        finally:
+            if handle is not None:
+                self.store.end_write(handle)
+
+
+# =============================================================================
+# ENTRY POINTS
+# =============================================================================
+
+def start_server(port=DEFAULT_PORT, db_path=':memory:', host='127.0.0.1', quiet=True):
+    """
+    Start the stand-in on a background thread (port=0 picks a free port)
+    Returns: (server, api_base_url); call server.shutdown() to stop it
+    """
+    handler = type('BoundItemsHandler', (ItemsHandler,), {'store': ItemStore(db_path), 'quiet': quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/api"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the /api/items backend")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--db", default=":memory:", help="SQLite file (default: in memory)")
+    parser.add_argument("--quiet", action="store_true", help="Don't log each request")
+    args = parser.parse_args()
+
+    handler = type('BoundItemsHandler', (ItemsHandler,), {'store': ItemStore(args.db), 'quiet': args.quiet})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    print(f"🚀 Local items API running on http://{args.host}:{args.port}/api/items "
+          f"(store: {'memory' if args.db == ':memory:' else args.db})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Server stopped")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
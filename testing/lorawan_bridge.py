@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+LoRaWAN to Items Bridge
+
+Long-running daemon that polls SenseCAP telemetry (see lorewan_data_api.py)
+and posts new readings to /api/items in bulk. It keeps the time of the last
+reading forwarded per device and channel, so each poll only asks the
+SenseCAP API for readings newer than that and only new data reaches the
+backend.
+
+Readings are mapped by measurement ID (MEASUREMENT_MAPPINGS) to an Item
+sensor field and single-sensor status code from backend/models/Item.js;
+e.g. Air Temperature (4097) becomes a Streeting temperature reading with
+status code 2240 (Streeting, sensor data, thermometer). Unmapped
+measurements are skipped.
+
+The last-seen state is written to a JSON file after every successful batch,
+so a restarted bridge continues where it stopped.
+
+Usage:
+    python lorawan_bridge.py                       # poll every 60 seconds
+    python lorawan_bridge.py --once --lookback-minutes 1440
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+
+import api_client
+import lorewan_data_api
+from bulk_client import post_items_bulk
+from dataset_io import iter_chunks
+from telemetry_columns import parse_telemetry_columns
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+POLL_INTERVAL_SECONDS = 60  # Time between polls
+INITIAL_LOOKBACK_MINUTES = 60  # How far back a device with no state starts
+POLL_PAGE_LIMIT = 500  # Readings per channel per SenseCAP request
+POLL_WORKERS = 8  # Devices fetched concurrently
+BRIDGE_RATE_LIMIT = 10  # Requests/s to the SenseCAP host
+BRIDGE_BATCH_SIZE = 500  # Items per bulk request
+STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lorawan_bridge_state.json")
+
+# ===== MEASUREMENT MAPPINGS =====
+# SenseCAP measurement ID -> Item fields (status codes per backend/models/Item.js)
+MEASUREMENT_MAPPINGS = {
+    "4097": {  # Air Temperature
+        'processType': 'Streeting',
+        'field': 'temperature',
+        'statusCode': 2240,  # Streeting, sensor data, thermometer
+        'unit': '°C',
+        'deviceSource': 'thermometer',
+    },
+}
+
+
+# =============================================================================
+# STATE
+# =============================================================================
+
+def load_state(path=STATE_PATH):
+    """Load last-seen times ({"eui:channel:measurement_id": epoch ms})"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(state, path=STATE_PATH):
+    """Write the state atomically"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def state_key(device_eui, channel, measurement_id):
+    return f"{device_eui}:{channel}:{measurement_id}"
+
+
+# =============================================================================
+# POLLING
+# =============================================================================
+
+def fetch_new_readings(device_eui, since_ms, until_ms, limit=POLL_PAGE_LIMIT):
+    """
+    Fetch all mapped readings in [since_ms, until_ms], paging backwards from
+    until_ms while some channel comes back full
+    Returns: list of (TelemetryColumns, newer-than time_ms) pages, or None on error
+    """
+    pages = []
+    time_end = until_ms
+    while time_end >= since_ms:
+        telemetry_data = lorewan_data_api.get_telemetry_data(
+            device_eui, limit=limit, time_start=since_ms, time_end=time_end, verbose=False)
+        if telemetry_data is None:
+            return None
+
+        columns = parse_telemetry_columns(telemetry_data)
+        full = [key for key, count in columns.counts().items()
+                if count >= limit and key[1] in MEASUREMENT_MAPPINGS]
+        if not full:
+            pages.append((columns, since_ms - 1))
+            break
+
+        # Keep what is newer than where the fullest channel was cut off, then page on
+        cutoff = min(max(columns.oldest(key) for key in full), time_end - 1)
+        pages.append((columns, cutoff))
+        time_end = cutoff
+    return pages
+
+
+def reading_to_item(device_eui, device_name, measurement_id, value, time_ms):
+    """Build an /api/items payload for one mapped reading"""
+    mapping = MEASUREMENT_MAPPINGS[measurement_id]
+    return {
+        'processType': mapping['processType'],
+        'statusCode': mapping['statusCode'],
+        mapping['field']: {
+            'value': value,
+            'unit': mapping['unit'],
+            'deviceSource': mapping['deviceSource'],
+        },
+        'operator': device_name or device_eui,
+        'timestamp': datetime.fromtimestamp(time_ms / 1000, tz=timezone.utc).isoformat(),
+    }
+
+
+def poll_device(device, state, now_ms, lookback_ms):
+    """
+    Fetch one device's readings newer than its last-seen state
+    Returns: list of (state key, time_ms, item payload), or None on error
+    """
+    device_eui = device['device_eui']
+    device_keys = [key for key in state if key.startswith(f"{device_eui}:")]
+    # Ask from the oldest last-seen channel; newer channels are filtered below
+    since_ms = min((state[key] + 1 for key in device_keys), default=now_ms - lookback_ms)
+
+    pages = fetch_new_readings(device_eui, since_ms, now_ms)
+    if pages is None:
+        return None
+
+    pending = []
+    for columns, after_ms in pages:
+        for (channel, measurement_id), series in columns.series.items():
+            if measurement_id not in MEASUREMENT_MAPPINGS:
+                continue
+            key = state_key(device_eui, channel, measurement_id)
+            start = series.since(max(after_ms, state.get(key, since_ms - 1)))
+            for i in range(start, len(series)):
+                item = reading_to_item(device_eui, device.get('device_name'), measurement_id,
+                                       series.values[i], series.times[i])
+                pending.append((key, series.times[i], item))
+    return pending
+
+
+def run_poll(devices, state, state_path=STATE_PATH, api_base_url=API_BASE_URL,
+             lookback_minutes=INITIAL_LOOKBACK_MINUTES, workers=POLL_WORKERS,
+             batch_size=BRIDGE_BATCH_SIZE):
+    """
+    Poll every device once and forward new readings
+    Returns: dict with fetched/posted/rejected/failed_devices counts
+    """
+    now_ms = int(time.time() * 1000)
+    lookback_ms = int(lookback_minutes * 60 * 1000)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda device: poll_device(device, state, now_ms, lookback_ms), devices))
+
+    stats = {'fetched': 0, 'posted': 0, 'rejected': 0,
+             'failed_devices': sum(1 for pending in results if pending is None)}
+    pending = sorted((entry for result in results if result for entry in result), key=lambda entry: entry[1])
+    stats['fetched'] = len(pending)
+
+    # Oldest first, so every batch only moves each channel's last-seen time forward
+    for batch in iter_chunks(pending, batch_size):
+        try:
+            inserted_ids, failed = post_items_bulk([item for _, _, item in batch], api_base_url)
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Bulk post failed, {len(batch)} readings will be retried next poll: {e}")
+            break
+        stats['posted'] += len(inserted_ids)
+        stats['rejected'] += len(failed)
+        for failure in failed[:3]:
+            print(f"   ⚠️  Rejected reading: {failure['message']}")
+
+        # Rejected readings advance the state too; they would be rejected again
+        for key, time_ms, _ in batch:
+            state[key] = max(state.get(key, 0), time_ms)
+        save_state(state, state_path)
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forward new SenseCAP readings to /api/items")
+    parser.add_argument("--api-url", default=API_BASE_URL)
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL_SECONDS, help="Seconds between polls")
+    parser.add_argument("--lookback-minutes", type=float, default=INITIAL_LOOKBACK_MINUTES,
+                        help="History fetched for channels seen for the first time")
+    parser.add_argument("--state", default=STATE_PATH, help="Last-seen state file")
+    parser.add_argument("--workers", type=int, default=POLL_WORKERS)
+    parser.add_argument("--once", action="store_true", help="Poll once and exit")
+    args = parser.parse_args()
+
+    api_client.configure(pool_size=args.workers, rate_limit=BRIDGE_RATE_LIMIT)
+    state = load_state(args.state)
+
+    print("LoRaWAN Bridge")
+    print("=" * 60)
+    print(f"SenseCAP: {lorewan_data_api.BASE_URL} -> {args.api_url}")
+    print(f"Mapped measurements: {', '.join(lorewan_data_api.MEASUREMENT_NAMES.get(m, m) for m in MEASUREMENT_MAPPINGS)}")
+    print(f"Poll interval: {args.interval}s | Known channels: {len(state)}")
+    print("=" * 60)
+
+    next_poll = time.time()
+    try:
+        while True:
+            devices = [device for device in (lorewan_data_api.get_devices(device_type="2", verbose=False) or [])
+                       if device.get('device_eui')]
+            started = time.time()
+            stats = run_poll(devices, state, args.state, args.api_url, args.lookback_minutes, args.workers)
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] 📡 {len(devices)} devices | "
+                  f"{stats['fetched']} new readings | ✅ {stats['posted']} posted | "
+                  f"⚠️  {stats['rejected']} rejected | ❌ {stats['failed_devices']} devices failed | "
+                  f"{time.time() - started:.1f}s")
+            if args.once:
+                break
+
+            next_poll += args.interval
+            time.sleep(max(0, next_poll - time.time()))
+    except KeyboardInterrupt:
+        print("\n⏹️  Bridge stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,14 @@
+import argparse
 import requests
+import api_client
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from requests.auth import HTTPBasicAuth
+from response_cache import ResponseCache
+from telemetry_columns import parse_telemetry_columns
+from time_utils import from_epoch_ms
 
 # API Configuration
 API_ID = "Z864D4Y76M21WZEX"  # API ID (username)
@@ -16,6 +23,25 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
+# Fleet polling configuration
+FETCH_WORKERS = 16  # Concurrent telemetry requests
+HOST_RATE_LIMIT = 20  # Max requests per second to the SenseCAP host
+STATUS_BATCH_SIZE = 50  # Max devices per view_device_running_status request (API limit)
+TELEMETRY_LIMIT = 50  # Readings per device per poll
+
+# Response cache TTLs per endpoint; device metadata rarely changes
+CACHE_TTLS = {
+    "list_devices": 3600,
+    "view_device_running_status": 60
+}
+response_cache = ResponseCache(ttls=CACHE_TTLS)
+
+def configure_cache(persist_path=None, **kwargs):
+    """Replace the response cache, e.g. to persist it across runs"""
+    global response_cache
+    response_cache = ResponseCache(ttls=CACHE_TTLS, persist_path=persist_path, **kwargs)
+    return response_cache
+
 # Measurement ID mappings for better readability
 MEASUREMENT_NAMES = {
     "4097": "Air Temperature",
@@ -25,9 +51,10 @@ MEASUREMENT_NAMES = {
     "5001": "WiFi Scan"
 }
 
-def handle_response(response, endpoint_name):
-    """Handle SenseCap API response format"""
-    print(f"[{datetime.now()}] {endpoint_name} - Status Code: {response.status_code}")
+def handle_response(response, endpoint_name, verbose=True):
+    """Handle SenseCap API response format (verbose=False only prints errors)"""
+    if verbose:
+        print(f"[{datetime.now()}] {endpoint_name} - Status Code: {response.status_code}")
     
     if response.status_code == 200:
         try:
@@ -38,7 +65,8 @@ def handle_response(response, endpoint_name):
                 code = response_data.get("code")
                 
                 if code == "0":  # Successful response
-                    print(f"SUCCESS: {endpoint_name}")
+                    if verbose:
+                        print(f"SUCCESS: {endpoint_name}")
                     return response_data.get("data")
                 else:  # Error response
                     error_msg = response_data.get("msg", "Unknown error")
@@ -58,111 +86,123 @@ def handle_response(response, endpoint_name):
         print(f"Response text: {response.text}")
         return None
 
-def get_devices(device_type="2", group_uuid=None):
-    """Get all devices from SenseCap dashboard"""
-    try:
-        url = f"{BASE_URL}/list_devices"
-        
-        # Query parameters based on API documentation
-        params = {
-            "device_type": device_type  # 1-gateway, 2-node(default)
-        }
-        
-        if group_uuid:
-            params["group_uuid"] = group_uuid
-        
-        response = requests.get(url, headers=HEADERS, params=params, auth=AUTH)
-        
-        devices_data = handle_response(response, "GET Devices")
-        
-        if devices_data is not None:
-            # Print device summary
-            if isinstance(devices_data, list):
-                device_type_name = "Gateways" if device_type == "1" else "Nodes"
-                print(f"\n=== {device_type_name} ===")
-                print(f"Found {len(devices_data)} device(s):")
-                for i, device in enumerate(devices_data, 1):
-                    device_eui = device.get('device_eui', 'N/A')
-                    device_name = device.get('device_name', 'N/A')
-                    print(f"  {i}. {device_name}")
-                    print(f"     EUI: {device_eui}")
-                    if 'be_quota' in device:
-                        print(f"     Quota: {device['be_quota']}")
-                    if 'expired_time' in device:
-                        print(f"     Expires: {device['expired_time']}")
-                    print()
-            
-            return devices_data
+def get_devices(device_type="2", group_uuid=None, verbose=True, use_cache=True):
+    """Get all devices from SenseCap dashboard (verbose=False skips the device listing)"""
+    url = f"{BASE_URL}/list_devices"
+    
+    # Query parameters based on API documentation
+    params = {
+        "device_type": device_type  # 1-gateway, 2-node(default)
+    }
+    
+    if group_uuid:
+        params["group_uuid"] = group_uuid
+    
+    def fetch():
+        try:
+            response = api_client.get(url, headers=HEADERS, params=params, auth=AUTH)
+            return handle_response(response, "GET Devices", verbose)
+        except requests.exceptions.RequestException as e:
+            print(f"Request failed for GET Devices: {e}")
+            return None
+    
+    devices_data = response_cache.get_or_fetch("list_devices", params, fetch) if use_cache else fetch()
+    
+    if devices_data is not None:
+        # Print device summary
+        if verbose and isinstance(devices_data, list):
+            device_type_name = "Gateways" if device_type == "1" else "Nodes"
+            print(f"\n=== {device_type_name} ===")
+            print(f"Found {len(devices_data)} device(s):")
+            for i, device in enumerate(devices_data, 1):
+                device_eui = device.get('device_eui', 'N/A')
+                device_name = device.get('device_name', 'N/A')
+                print(f"  {i}. {device_name}")
+                print(f"     EUI: {device_eui}")
+                if 'be_quota' in device:
+                    print(f"     Quota: {device['be_quota']}")
+                if 'expired_time' in device:
+                    print(f"     Expires: {device['expired_time']}")
+                print()
         
-        return None
-            
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed for GET Devices: {e}")
-        return None
+        return devices_data
+    
+    return None
 
-def get_device_running_status(device_euis):
-    """Get device running status for up to 50 devices"""
-    try:
-        url = f"{BASE_URL}/view_device_running_status"
-        
-        # Ensure device_euis is a list and limit to 50 devices
-        if isinstance(device_euis, str):
-            device_euis = [device_euis]
-        
-        if len(device_euis) > 50:
-            print(f"WARNING: Limiting request to first 50 devices (provided {len(device_euis)})")
-            device_euis = device_euis[:50]
-        
-        # Request body
-        request_body = {
-            "device_euis": device_euis
-        }
-        
-        response = requests.post(url, headers=HEADERS, json=request_body, auth=AUTH)
-        
-        status_data = handle_response(response, f"POST Device Running Status")
-        
-        if status_data is not None:
-            print(f"\n=== Device Running Status ===")
-            print("Device EUI\t\t\tOnline Status\tBattery Status\tLast Message\t\t\tReport Frequency")
-            print("-" * 120)
-            
-            if isinstance(status_data, list):
-                for device_status in status_data:
-                    device_eui = device_status.get('device_eui', 'N/A')
-                    latest_message_time = device_status.get('latest_message_time', 'N/A')
-                    online_status = device_status.get('online_status', -1)
-                    battery_status = device_status.get('battery_status', -1)
-                    report_frequency = device_status.get('report_frequency', -1)
-                    
-                    # Format status values
-                    online_text = "Online" if online_status == 1 else "Offline" if online_status == 0 else "Unknown"
-                    battery_text = "Good" if battery_status == 1 else "Low" if battery_status == 0 else "Unknown"
-                    
-                    # Format last message time
-                    if latest_message_time and latest_message_time != 'N/A':
-                        try:
-                            formatted_time = datetime.fromisoformat(latest_message_time.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
-                        except:
-                            formatted_time = latest_message_time
-                    else:
-                        formatted_time = 'N/A'
-                    
-                    # Format report frequency
-                    freq_text = f"{report_frequency}/min" if report_frequency != -1 else "Unknown"
-                    
-                    print(f"{device_eui}\t{online_text}\t\t{battery_text}\t\t{formatted_time}\t{freq_text}")
-            else:
-                print("Unexpected data format")
-                print(json.dumps(status_data, indent=2))
-            
-            return status_data
-        
-        return None
-            
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed for POST Device Running Status: {e}")
+def get_device_running_status(device_euis, verbose=True, use_cache=True):
+    """Get device running status, requesting STATUS_BATCH_SIZE devices at a time"""
+    url = f"{BASE_URL}/view_device_running_status"
+
+    # Ensure device_euis is a list
+    if isinstance(device_euis, str):
+        device_euis = [device_euis]
+
+    status_data = []
+    failed_batches = 0
+    for start in range(0, len(device_euis), STATUS_BATCH_SIZE):
+        request_body = {"device_euis": device_euis[start:start + STATUS_BATCH_SIZE]}
+
+        def fetch():
+            try:
+                response = api_client.post(url, headers=HEADERS, json=request_body, auth=AUTH)
+                return handle_response(response, f"POST Device Running Status ({start + 1}-"
+                                                 f"{start + len(request_body['device_euis'])})", verbose)
+            except requests.exceptions.RequestException as e:
+                print(f"Request failed for POST Device Running Status: {e}")
+                return None
+
+        if use_cache:
+            batch_data = response_cache.get_or_fetch("view_device_running_status", request_body, fetch)
+        else:
+            batch_data = fetch()
+
+        if batch_data is None:
+            failed_batches += 1
+        elif isinstance(batch_data, list):
+            status_data.extend(batch_data)
+        else:
+            print("Unexpected data format")
+            print(json.dumps(batch_data, indent=2))
+
+    if failed_batches and not status_data:
         return None
+    if failed_batches:
+        print(f"WARNING: {failed_batches} status batch(es) failed")
+
+    if verbose:
+        print_running_status(status_data)
+    return status_data
+
+def print_running_status(status_data):
+    """Print device running status as a table"""
+    print(f"\n=== Device Running Status ===")
+    print("Device EUI\t\t\tOnline Status\tBattery Status\tLast Message\t\t\tReport Frequency")
+    print("-" * 120)
+
+    for device_status in status_data:
+        device_eui = device_status.get('device_eui', 'N/A')
+        latest_message_time = device_status.get('latest_message_time', 'N/A')
+        online_status = device_status.get('online_status', -1)
+        battery_status = device_status.get('battery_status', -1)
+        report_frequency = device_status.get('report_frequency', -1)
+
+        # Format status values
+        online_text = "Online" if online_status == 1 else "Offline" if online_status == 0 else "Unknown"
+        battery_text = "Good" if battery_status == 1 else "Low" if battery_status == 0 else "Unknown"
+
+        # Format last message time
+        if latest_message_time and latest_message_time != 'N/A':
+            try:
+                formatted_time = datetime.fromisoformat(latest_message_time.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
+            except:
+                formatted_time = latest_message_time
+        else:
+            formatted_time = 'N/A'
+
+        # Format report frequency
+        freq_text = f"{report_frequency}/min" if report_frequency != -1 else "Unknown"
+
+        print(f"{device_eui}\t{online_text}\t\t{battery_text}\t\t{formatted_time}\t{freq_text}")
 
 def get_latest_telemetry_data(device_eui, channel_index=None, measurement_id=None):
     """Get the latest telemetry data from a specific device"""
@@ -180,7 +220,7 @@ def get_latest_telemetry_data(device_eui, channel_index=None, measurement_id=Non
         if measurement_id is not None:
             params["measurement_id"] = measurement_id
         
-        response = requests.get(url, headers=HEADERS, params=params, auth=AUTH)
+        response = api_client.get(url, headers=HEADERS, params=params, auth=AUTH)
         
         latest_data = handle_response(response, f"GET Latest Telemetry Data for {device_eui}")
         
@@ -195,23 +235,7 @@ def get_latest_telemetry_data(device_eui, channel_index=None, measurement_id=Non
                     timestamp = item.get('time', 'N/A')
                     
                     sensor_name = MEASUREMENT_NAMES.get(measurement_id, f"Sensor {measurement_id}")
-                    
-                    # Format the value
-                    if measurement_id == "4097":  # Temperature
-                        formatted_value = f"{measurement_value}°C"
-                    elif measurement_id == "4200":  # Motion
-                        formatted_value = "Motion Detected" if measurement_value == 1 else "No Motion"
-                    elif measurement_id == "4199":  # Light
-                        formatted_value = f"{measurement_value} lux"
-                    elif measurement_id == "4209":  # Accelerometer
-                        formatted_value = f"{measurement_value} m/s²"
-                    elif measurement_id == "5001":  # WiFi Scan
-                        if isinstance(measurement_value, list):
-                            formatted_value = f"{len(measurement_value)} WiFi networks"
-                        else:
-                            formatted_value = str(measurement_value)
-                    else:
-                        formatted_value = str(measurement_value)
+                    formatted_value = format_measurement(measurement_id, measurement_value)
                     
                     print(f"Channel {channel_index}: {sensor_name} = {formatted_value} (at {timestamp})")
             else:
@@ -224,93 +248,77 @@ def get_latest_telemetry_data(device_eui, channel_index=None, measurement_id=Non
         print(f"Request failed for GET Latest Telemetry Data: {e}")
         return None
 
-def parse_telemetry_data(telemetry_data, device_eui):
-    """Parse and display telemetry data in a clean format"""
+def format_measurement(measurement_id, value):
+    """Format a reading for display based on its measurement type"""
+    if measurement_id == "4097":  # Temperature
+        return f"{value}°C"
+    if measurement_id == "4200":  # Motion
+        return "Motion Detected" if value == 1 else "No Motion"
+    if measurement_id == "4199":  # Light
+        return f"{value} lux"
+    if measurement_id == "4209":  # Accelerometer
+        return f"{value} m/s²"
+    if measurement_id == "5001" and isinstance(value, list):  # WiFi Scan
+        return f"{len(value)} WiFi networks"
+    return str(value)
+
+def parse_telemetry_data(telemetry_data, device_eui, recent_count=5):
+    """Display the most recent readings of every channel in a clean format"""
     if not isinstance(telemetry_data, dict) or 'list' not in telemetry_data:
         print(f"Unexpected telemetry data format for device {device_eui}")
         return
     
-    data_list = telemetry_data['list']
-    if len(data_list) < 2:
+    columns = parse_telemetry_columns(telemetry_data)
+    if not columns.series and not columns.scans:
         print(f"No telemetry data available for device {device_eui}")
         return
     
-    # First element contains channel info (measurement IDs)
-    channel_info = data_list[0]
-    # Second element contains the actual measurements
-    measurements_data = data_list[1]
-    
     print(f"\n=== Telemetry Data for Device: {device_eui} ===")
     
     # Display available sensors
     print("Available Sensors:")
-    for i, sensor_info in enumerate(channel_info):
-        if isinstance(sensor_info, list) and len(sensor_info) >= 2:
-            channel = sensor_info[0]
-            measurement_id = sensor_info[1]
-            sensor_name = MEASUREMENT_NAMES.get(measurement_id, f"Unknown Sensor ({measurement_id})")
-            print(f"  Channel {channel}: {sensor_name} (ID: {measurement_id})")
+    for channel, measurement_id in list(columns.series) + list(columns.scans):
+        sensor_name = MEASUREMENT_NAMES.get(measurement_id, f"Unknown Sensor ({measurement_id})")
+        print(f"  Channel {channel}: {sensor_name} (ID: {measurement_id})")
     
     print(f"\nSensor Readings:")
     print("-" * 80)
     
-    # Process each sensor's data
-    for i, sensor_data in enumerate(measurements_data):
-        if i >= len(channel_info):
-            break
-            
-        channel = channel_info[i][0]
-        measurement_id = channel_info[i][1]
+    # Numeric channels, newest first
+    for (channel, measurement_id), series in columns.series.items():
         sensor_name = MEASUREMENT_NAMES.get(measurement_id, f"Sensor {measurement_id}")
-        
         print(f"\n{sensor_name} (Channel {channel}):")
-        
-        if isinstance(sensor_data, list) and len(sensor_data) > 0:
-            # Display recent readings
-            recent_count = min(5, len(sensor_data))
-            for j in range(recent_count):
-                reading = sensor_data[j]
-                if isinstance(reading, list) and len(reading) >= 2:
-                    value = reading[0]
-                    timestamp = reading[1]
-                    
-                    # Format the value based on sensor type
-                    if measurement_id == "4097":  # Temperature
-                        formatted_value = f"{value}°C"
-                    elif measurement_id == "4200":  # Motion
-                        formatted_value = "Motion Detected" if value == 1 else "No Motion"
-                    elif measurement_id == "4199":  # Light
-                        formatted_value = f"{value} lux"
-                    elif measurement_id == "4209":  # Accelerometer
-                        formatted_value = f"{value} m/s²"
-                    elif measurement_id == "5001":  # WiFi Scan
-                        if isinstance(value, list):
-                            formatted_value = f"{len(value)} WiFi networks detected"
-                            # Show WiFi details
-                            print(f"    {timestamp}: {formatted_value}")
-                            for wifi in value[:3]:  # Show first 3 networks
-                                if isinstance(wifi, dict):
-                                    mac = wifi.get('mac', 'Unknown')
-                                    rssi = wifi.get('rssi', 'Unknown')
-                                    print(f"      - MAC: {mac}, Signal: {rssi} dBm")
-                            if len(value) > 3:
-                                print(f"      ... and {len(value) - 3} more networks")
-                            continue
-                        else:
-                            formatted_value = str(value)
-                    else:
-                        formatted_value = str(value)
-                    
-                    print(f"    {timestamp}: {formatted_value}")
-            
-            if len(sensor_data) > recent_count:
-                print(f"    ... and {len(sensor_data) - recent_count} more readings")
-        else:
+        if not len(series):
             print("    No data available")
+            continue
+        for i in range(len(series) - 1, max(-1, len(series) - 1 - recent_count), -1):
+            timestamp = from_epoch_ms(series.times[i])
+            print(f"    {timestamp}: {format_measurement(measurement_id, series.values[i])}")
+        if len(series) > recent_count:
+            print(f"    ... and {len(series) - recent_count} more readings")
+    
+    # WiFi scans, newest first, with the strongest networks of each scan
+    for (channel, measurement_id), series in columns.scans.items():
+        sensor_name = MEASUREMENT_NAMES.get(measurement_id, f"Sensor {measurement_id}")
+        print(f"\n{sensor_name} (Channel {channel}):")
+        if not len(series):
+            print("    No data available")
+            continue
+        for i in range(len(series) - 1, max(-1, len(series) - 1 - recent_count), -1):
+            networks = series.scans[i]
+            print(f"    {from_epoch_ms(series.times[i])}: {format_measurement(measurement_id, networks)} detected")
+            if isinstance(networks, list):
+                for wifi in networks[:3]:  # Show first 3 networks
+                    if isinstance(wifi, dict):
+                        print(f"      - MAC: {wifi.get('mac', 'Unknown')}, Signal: {wifi.get('rssi', 'Unknown')} dBm")
+                if len(networks) > 3:
+                    print(f"      ... and {len(networks) - 3} more networks")
+        if len(series) > recent_count:
+            print(f"    ... and {len(series) - recent_count} more readings")
 
 def get_telemetry_data(device_eui, channel_index=None, measurement_id=None, 
-                      limit=100, time_start=None, time_end=None):
-    """Get telemetry data from a specific device"""
+                      limit=100, time_start=None, time_end=None, verbose=True):
+    """Get telemetry data from a specific device (verbose=False skips the printout)"""
     try:
         url = f"{BASE_URL}/list_telemetry_data"
         
@@ -334,13 +342,14 @@ def get_telemetry_data(device_eui, channel_index=None, measurement_id=None,
         if measurement_id is not None:
             params["measurement_id"] = measurement_id
         
-        response = requests.get(url, headers=HEADERS, params=params, auth=AUTH)
+        response = api_client.get(url, headers=HEADERS, params=params, auth=AUTH)
         
-        telemetry_data = handle_response(response, f"GET Telemetry Data for {device_eui}")
+        telemetry_data = handle_response(response, f"GET Telemetry Data for {device_eui}", verbose)
         
         if telemetry_data is not None:
             # Parse and display the data in a clean format
-            parse_telemetry_data(telemetry_data, device_eui)
+            if verbose:
+                parse_telemetry_data(telemetry_data, device_eui)
             return telemetry_data
         
         return None
@@ -349,11 +358,52 @@ def get_telemetry_data(device_eui, channel_index=None, measurement_id=None,
         print(f"Request failed for GET Telemetry Data: {e}")
         return None
 
-def main():
+def fetch_fleet_telemetry(device_euis, workers=FETCH_WORKERS, limit=TELEMETRY_LIMIT,
+                          time_start=None, time_end=None):
+    """
+    Fetch list_telemetry_data for every device concurrently
+    Requests go through the shared session, so configure() its rate limit first
+    Returns: (dict of device_eui -> telemetry data, list of failed device EUIs)
+    """
+    # One time window for the whole poll, so every device covers the same period
+    if time_end is None:
+        time_end = int(datetime.now().timestamp() * 1000)
+    if time_start is None:
+        time_start = int((datetime.now() - timedelta(days=1)).timestamp() * 1000)
+
+    results = {}
+    failed = []
+    start_time = time.time()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(get_telemetry_data, device_eui, limit=limit, time_start=time_start,
+                            time_end=time_end, verbose=False): device_eui
+            for device_eui in device_euis
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            device_eui = futures[future]
+            telemetry_data = future.result()
+            if telemetry_data is None:
+                failed.append(device_eui)
+            else:
+                results[device_eui] = telemetry_data
+            if done % 25 == 0 or done == len(futures):
+                print(f"📡 Telemetry: {done}/{len(futures)} devices ({time.time() - start_time:.1f}s)")
+
+    return results, failed
+
+def main(workers=FETCH_WORKERS, rate_limit=HOST_RATE_LIMIT, limit=TELEMETRY_LIMIT, verbose=False,
+         cache_file=None):
     """Main function to run API requests"""
     print("=== SenseCap LoRaWAN API Client ===")
     print(f"Using API ID: {API_ID[:10]}...")
     print(f"Base URL: {BASE_URL}")
+    print(f"Workers: {workers} | Rate limit: {rate_limit} req/s")
+
+    api_client.configure(pool_size=workers, rate_limit=rate_limit)
+    if cache_file:
+        configure_cache(persist_path=cache_file)
     
     # Get all devices (nodes by default)
     print("\n1. Fetching all node devices...")
@@ -371,12 +421,30 @@ def main():
             print(f"\n3. Fetching device running status...")
             running_status = get_device_running_status(device_euis)
             
-            # Get telemetry data from the first device
-            first_device_eui = device_euis[0]
-            print(f"\n4. Fetching telemetry data for device {first_device_eui}...")
-            telemetry_data = get_telemetry_data(first_device_eui, limit=50)
+            print(f"\n4. Fetching telemetry data for {len(device_euis)} device(s)...")
+            poll_start = time.time()
+            telemetry, failed = fetch_fleet_telemetry(device_euis, workers=workers, limit=limit)
+            print(f"✅ Fetched telemetry for {len(telemetry)}/{len(device_euis)} devices "
+                  f"in {time.time() - poll_start:.1f}s")
+            if failed:
+                print(f"❌ Failed: {', '.join(failed[:10])}{' ...' if len(failed) > 10 else ''}")
+
+            if verbose:
+                for device_eui, telemetry_data in telemetry.items():
+                    parse_telemetry_data(telemetry_data, device_eui)
     else:
         print("\nWARNING: No devices found or devices data is not in expected format")
 
+    cache_stats = response_cache.stats()
+    print(f"\nResponse cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="SenseCAP LoRaWAN fleet telemetry client")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS, help="Concurrent telemetry requests")
+    parser.add_argument("--rate", type=float, default=HOST_RATE_LIMIT, help="Max requests/s to the API host")
+    parser.add_argument("--limit", type=int, default=TELEMETRY_LIMIT, help="Readings per device")
+    parser.add_argument("--verbose", action="store_true", help="Print every device's telemetry")
+    parser.add_argument("--cache-file", help="Persist cached device/status responses to this JSON file")
+    args = parser.parse_args()
+    main(workers=args.workers, rate_limit=args.rate, limit=args.limit, verbose=args.verbose,
+         cache_file=args.cache_file)
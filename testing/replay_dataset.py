@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Dataset Replay Script
+
+Replays a dataset written by dataset_io.write_dataset() (e.g. from
+`simulate_dashboard.py --export` or `inject_quality_control_data.py --export`)
+into /api/items at a controlled rate, so the same data can be used as a fixed
+benchmark fixture across runs.
+
+Usage:
+    python replay_dataset.py qc_1m.ndjson.gz --rate 2000 --batch-size 500
+    python replay_dataset.py qc_1m.ndjson.gz --rate 20 --batch-size 1   # one POST per record
+"""
+
+import argparse
+import time
+from itertools import islice
+
+import requests
+
+import api_client
+from bulk_client import post_items_bulk
+from dataset_io import iter_dataset, iter_chunks
+from sensor_data_generator import positive_int
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+REPLAY_RATE = 1000.0  # Records/s, 0 for as fast as possible
+REPLAY_BATCH_SIZE = 500  # Records per request; 1 uses POST /items instead of /items/bulk
+PROGRESS_INTERVAL_SECONDS = 5  # Time between progress lines
+
+
+def send_batch(batch, api_base_url):
+    """
+    Send one batch through POST /items/bulk, or POST /items for single records
+    Returns: (successful, failed)
+    """
+    if len(batch) == 1:
+        response = api_client.post(f"{api_base_url}/items", json=batch[0])
+        return (1, 0) if response.status_code == 201 else (0, 1)
+
+    inserted_ids, failed = post_items_bulk(batch, api_base_url)
+    return len(inserted_ids), len(failed)
+
+
+def replay_records(records, rate=REPLAY_RATE, batch_size=REPLAY_BATCH_SIZE,
+                   api_base_url=API_BASE_URL):
+    """
+    Send records to the API, pacing batches so the overall rate stays at
+    `rate` records/s
+    Returns: dict with successful/failed/elapsed
+    """
+    stats = {'successful': 0, 'failed': 0}
+    started = time.perf_counter()
+    last_report = started
+    sent = 0
+
+    for batch in iter_chunks(records, batch_size):
+        # Schedule each batch from the start time so pacing errors don't accumulate
+        if rate:
+            delay = started + sent / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        try:
+            successful, failed = send_batch(batch, api_base_url)
+        except requests.exceptions.RequestException as e:
+            successful, failed = 0, len(batch)
+            print(f"❌ Batch starting at record {sent} failed: {str(e)}")
+        stats['successful'] += successful
+        stats['failed'] += failed
+        sent += len(batch)
+
+        now = time.perf_counter()
+        if now - last_report >= PROGRESS_INTERVAL_SECONDS:
+            print(f"   ... {sent} records replayed ({sent / (now - started):.0f} records/s)")
+            last_report = now
+
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
+
+
+def replay_dataset(path, rate=REPLAY_RATE, batch_size=REPLAY_BATCH_SIZE,
+                   limit=None, api_base_url=API_BASE_URL):
+    """
+    Replay a dataset file into the API at `rate` records/s
+    Returns: dict with successful/failed/elapsed
+    """
+    records = iter_dataset(path)
+    if limit is not None:
+        records = islice(records, limit)
+    return replay_records(records, rate, batch_size, api_base_url)
+
+
+def print_replay_summary(stats):
+    """Print the replay summary"""
+    total = stats['successful'] + stats['failed']
+    print("=" * 50)
+    print("📊 REPLAY SUMMARY")
+    print(f"✅ Successful: {stats['successful']}")
+    print(f"❌ Failed: {stats['failed']}")
+    if total > 0:
+        print(f"📈 Success rate: {stats['successful'] / total * 100:.1f}%")
+        print(f"⚡ Achieved rate: {total / stats['elapsed']:.0f} records/s")
+    print(f"⏱️  Elapsed: {stats['elapsed']:.1f}s")
+    print("=" * 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a generated dataset into /api/items")
+    parser.add_argument("path", help="Dataset file (.ndjson, .ndjson.gz, .jsonl(.gz) or .parquet)")
+    parser.add_argument("--rate", type=float, default=REPLAY_RATE,
+                        help="Target records/s (0 = unthrottled)")
+    parser.add_argument("--batch-size", type=positive_int, default=REPLAY_BATCH_SIZE,
+                        help="Records per request (1 = POST /items per record)")
+    parser.add_argument("--limit", type=int, default=None, help="Replay at most this many records")
+    parser.add_argument("--api-url", default=API_BASE_URL, help="API base URL")
+    args = parser.parse_args()
+
+    print("Dataset Replay")
+    print("=" * 50)
+    print(f"Dataset: {args.path}")
+    print(f"API URL: {args.api_url}")
+    print(f"Rate: {'unthrottled' if not args.rate else f'{args.rate:.0f} records/s'}")
+    print(f"Batch size: {args.batch_size}")
+    print("=" * 50)
+
+    try:
+        stats = replay_dataset(args.path, args.rate, args.batch_size, args.limit, args.api_url)
+    except KeyboardInterrupt:
+        print("\n⏹️  Replay stopped by user")
+        return
+
+    print_replay_summary(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+TTL + LRU Cache for API Responses
+
+Caches decoded API responses keyed by endpoint and request parameters.
+Every endpoint has its own time-to-live, and the least recently used
+entries are evicted once the cache is full. With a persist_path the
+entries are also kept in a JSON file, so metadata fetched by one run is
+reused by the next one until it expires.
+
+Usage:
+    from response_cache import ResponseCache
+    cache = ResponseCache(ttls={'list_devices': 3600}, persist_path="sensecap_cache.json")
+    devices = cache.get_or_fetch('list_devices', params, lambda: fetch_devices(params))
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# ===== CONFIGURATION CONSTANTS =====
+CACHE_MAX_ENTRIES = 256  # Entries kept before the least recently used is evicted
+CACHE_DEFAULT_TTL_SECONDS = 60  # TTL for endpoints without their own entry in `ttls`
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache of JSON-serializable responses"""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, default_ttl=CACHE_DEFAULT_TTL_SECONDS,
+                 ttls=None, persist_path=None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.persist_path = persist_path
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (expires_at, endpoint, value), oldest use first
+        self.hits = 0
+        self.misses = 0
+        if persist_path:
+            self.load()
+
+    @staticmethod
+    def make_key(endpoint, params=None):
+        """Cache key from the endpoint and its (order-independent) parameters"""
+        return f"{endpoint}?{json.dumps(params or {}, sort_keys=True, default=str)}"
+
+    def get(self, endpoint, params=None):
+        """
+        Look up a cached response
+        Returns: (True, value) on a hit, (False, None) on a miss or expired entry
+        """
+        key = self.make_key(endpoint, params)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[2]
+
+    def set(self, endpoint, params, value):
+        """Store a response with the endpoint's TTL"""
+        key = self.make_key(endpoint, params)
+        ttl = self.ttls.get(endpoint, self.default_ttl)
+        with self.lock:
+            self.entries[key] = (time.time() + ttl, endpoint, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        if self.persist_path:
+            self.save()
+
+    def get_or_fetch(self, endpoint, params, fetch):
+        """
+        Return the cached response, or call fetch() and cache its result.
+        None results (failed requests) are not cached.
+        """
+        hit, value = self.get(endpoint, params)
+        if hit:
+            return value
+        value = fetch()
+        if value is not None:
+            self.set(endpoint, params, value)
+        return value
+
+    def invalidate(self, endpoint=None):
+        """Drop all entries, or only those of one endpoint"""
+        with self.lock:
+            for key in [k for k, entry in self.entries.items() if endpoint in (None, entry[1])]:
+                del self.entries[key]
+        if self.persist_path:
+            self.save()
+
+    def save(self):
+        """Write unexpired entries to persist_path atomically"""
+        now = time.time()
+        with self.lock:
+            entries = [[key, *entry] for key, entry in self.entries.items() if entry[0] > now]
+        tmp_path = self.persist_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.persist_path)
+
+    def load(self):
+        """Load unexpired entries from persist_path, if it exists"""
+        if not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Ignoring unreadable cache file {self.persist_path}: {str(e)}")
+            return
+        now = time.time()
+        with self.lock:
+            for key, expires_at, endpoint, value in entries[-self.max_entries:]:
+                if expires_at > now:
+                    self.entries[key] = (expires_at, endpoint, value)
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Sensor Rollup Rebuild Job
+
+The backend keeps per-minute, per-hour and per-day count/sum/min/max of each
+measurement field per processType (GET /api/items/rollups) and updates them
+as items are inserted. Item updates and deletes are not subtracted, and a
+failed rollup update is only logged, so this job recomputes whole UTC days
+from the raw items and replaces their rollup rows (PUT /api/items/rollups).
+
+Only the fields the rollups need are downloaded (?fields=), one day at a
+time, so memory use is bounded by the number of buckets, not of readings.
+Before reading a day the job takes the change feed's current position
+(?since=now) as asOf and only counts items created at or before it; the
+backend folds the items created later (live inserts, spool redeliveries,
+backfills into past days) into the rows it replaces, so the rebuild is safe
+to run while data keeps arriving.
+
+Usage:
+    python rollup_rebuild.py                    # Rebuild the last 7 closed days
+    python rollup_rebuild.py --from 2025-01-01 --to 2025-02-01
+    python rollup_rebuild.py --days 30 --check  # Only compare the stored rollups with the raw items
+    python rollup_rebuild.py --local --seed 20000 --check
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+import api_client
+import items_reader
+import sensor_data_generator
+from bulk_client import RecordBatcher, post_items_bulk
+from local_items_server import ROLLUP_FIELDS, ROLLUP_GRANULARITIES, combine_rollups
+from time_utils import to_epoch_ms, from_epoch_ms
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+REBUILD_DAYS = 7  # Closed UTC days rebuilt by default (today is left alone)
+PAGE_SIZE = 5000  # Items per page while reading a day
+FLOAT_TOLERANCE = 1e-6  # Relative tolerance of --check for sums and means
+SEED_BATCH_SIZE = 1000  # Records per bulk request while seeding
+SEED_RANDOM_SEED = 42
+
+DAY_MS = ROLLUP_GRANULARITIES['day']
+
+
+def current_position(api_base_url):
+    """
+    The change feed's current position: every item created at or before it is readable
+    Returns: epoch ms (server clock)
+    """
+    response = api_client.get(f"{api_base_url}/items", params={'since': 'now'})
+    response.raise_for_status()
+    return int(response.headers['X-Since-Cursor'].split('_')[0])
+
+
+def read_day(day_ms, as_of_ms, api_base_url):
+    """
+    Download the items of one UTC day created at or before as_of_ms (None: all
+    of them), only with the fields the rollups use
+    Returns: (rollup buckets, number of items read)
+    """
+    params = items_reader.query_params(time_from=day_ms, time_to=day_ms + DAY_MS)
+    fields = ['processType', 'createdAt', *(f'{field}.value' for field in ROLLUP_FIELDS)]
+    counter = {'items': 0}
+
+    def counted(items):
+        for item in items:
+            # Items created later are folded in by the backend when the day is replaced
+            if as_of_ms is not None and item.get('createdAt') and to_epoch_ms(item['createdAt']) > as_of_ms:
+                continue
+            counter['items'] += 1
+            yield item
+
+    buckets = combine_rollups(counted(items_reader.iter_items(params, PAGE_SIZE, api_base_url, fields)))
+    return buckets, counter['items']
+
+
+def replace_day(day_ms, as_of_ms, buckets, api_base_url):
+    """
+    Replace the stored rollups of one UTC day with buckets computed from the
+    items created at or before as_of_ms
+    Returns: response dict with replaced/deleted/lateItems counts
+    """
+    rows = [{'granularity': granularity, 'processType': process_type, 'field': field,
+             'bucketStart': from_epoch_ms(bucket_ms), 'count': count, 'sum': total, 'min': low, 'max': high}
+            for (granularity, process_type, field, bucket_ms), (count, total, low, high) in buckets.items()]
+    response = api_client.put(f"{api_base_url}/items/rollups",
+                              json={'from': day_ms, 'to': day_ms + DAY_MS, 'asOf': as_of_ms, 'rows': rows})
+    if response.status_code == 400:
+        raise ValueError(response.json().get('message'))
+    response.raise_for_status()
+    return response.json()
+
+
+def stored_rollups(day_ms, api_base_url):
+    """
+    Read the stored rollups of one UTC day, one granularity and field at a time
+    (a day of minute rows for every field can exceed the endpoint's row limit)
+    Returns: dict shaped like combine_rollups()
+    """
+    stored = {}
+    for granularity in ROLLUP_GRANULARITIES:
+        for field in ROLLUP_FIELDS:
+            response = api_client.get(f"{api_base_url}/items/rollups", params={
+                'granularity': granularity, 'field': field, 'from': day_ms, 'to': day_ms + DAY_MS})
+            response.raise_for_status()
+            for row in response.json():
+                key = (granularity, row['processType'], field, to_epoch_ms(row['bucketStart']))
+                stored[key] = [row['count'], row['sum'], row['min'], row['max']]
+    return stored
+
+
+def compare_day(expected, actual):
+    """
+    Compare recomputed and stored rollups of one day
+    Returns: list of mismatch descriptions
+    """
+    mismatches = []
+    for key in sorted(set(expected) | set(actual)):
+        granularity, process_type, field, bucket_ms = key
+        name = f"{granularity} {process_type} {field} {from_epoch_ms(bucket_ms)}"
+        if key not in actual:
+            mismatches.append(f"{name}: missing (expected count {expected[key][0]})")
+        elif key not in expected:
+            mismatches.append(f"{name}: stored count {actual[key][0]} but no readings")
+        elif expected[key][0] != actual[key][0] or not all(
+                math.isclose(e, a, rel_tol=FLOAT_TOLERANCE, abs_tol=FLOAT_TOLERANCE)
+                for e, a in zip(expected[key][1:], actual[key][1:])):
+            mismatches.append(f"{name}: stored {actual[key]}, expected {expected[key]}")
+    return mismatches
+
+
+def day_range(args):
+    """UTC midnights (epoch ms) of the days to process"""
+    if args.date_from:
+        first = to_epoch_ms(f"{args.date_from}T00:00:00+00:00")
+        last = to_epoch_ms(f"{args.date_to}T00:00:00+00:00") if args.date_to else first + DAY_MS
+    else:
+        last = int(time.time() * 1000) // DAY_MS * DAY_MS
+        first = last - args.days * DAY_MS
+    return list(range(first, last, DAY_MS))
+
+
+def seed_readings(count, days, api_base_url):
+    """Insert `count` sensor readings spread over the last `days` days"""
+    rng = random.Random(SEED_RANDOM_SEED)
+    now = datetime.now(timezone.utc)
+    totals = {'inserted': 0}
+
+    def send_batch(batch):
+        inserted_ids, _ = post_items_bulk(batch, api_base_url)
+        totals['inserted'] += len(inserted_ids)
+
+    print(f"🌱 Seeding {count} sensor readings over the last {days} days...")
+    batcher = RecordBatcher(send_batch, batch_size=SEED_BATCH_SIZE)
+    try:
+        for _ in range(count):
+            timestamp = now - timedelta(seconds=rng.uniform(0, days * 86400))
+            batcher.add(sensor_data_generator.generate_sensor_payload(rng, timestamp))
+    finally:
+        batcher.flush()
+    print(f"   Inserted: {totals['inserted']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute the sensor rollups from the raw items")
+    parser.add_argument("--api-url", default=API_BASE_URL)
+    parser.add_argument("--days", type=int, default=REBUILD_DAYS, help="Closed UTC days to process, ending today")
+    parser.add_argument("--from", dest="date_from", metavar="YYYY-MM-DD", help="First UTC day (instead of --days)")
+    parser.add_argument("--to", dest="date_to", metavar="YYYY-MM-DD",
+                        help="Day after the last one (default: --from + 1)")
+    parser.add_argument("--check", action="store_true", help="Only compare the stored rollups, write nothing")
+    parser.add_argument("--seed", type=int, default=0, metavar="N",
+                        help="Insert N sensor readings over the processed days first")
+    parser.add_argument("--local", action="store_true",
+                        help="Use an in-process local_items_server instead of --api-url")
+    args = parser.parse_args()
+
+    local_server = None
+    if args.local:
+        from local_items_server import start_server
+        local_server, args.api_url = start_server(port=0)
+
+    days = day_range(args)
+    print("\nSensor Rollup " + ("Check" if args.check else "Rebuild"))
+    print("=" * 60)
+    print(f"API URL: {args.api_url} | Days: {from_epoch_ms(days[0])[:10]} to {from_epoch_ms(days[-1])[:10]} (UTC)")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    totals = {'items': 0, 'rows': 0, 'deleted': 0, 'mismatches': 0}
+    try:
+        if args.seed:
+            seed_readings(args.seed, len(days), args.api_url)
+
+        for day_ms in days:
+            as_of_ms = None if args.check else current_position(args.api_url)
+            buckets, item_count = read_day(day_ms, as_of_ms, args.api_url)
+            totals['items'] += item_count
+            totals['rows'] += len(buckets)
+            day = from_epoch_ms(day_ms)[:10]
+            if args.check:
+                mismatches = compare_day(buckets, stored_rollups(day_ms, args.api_url))
+                totals['mismatches'] += len(mismatches)
+                print(f"{'✅' if not mismatches else '❌'} {day}: {item_count} items, {len(buckets)} rollup rows, "
+                      f"{len(mismatches)} mismatch(es)")
+                for mismatch in mismatches[:10]:
+                    print(f"   {mismatch}")
+            else:
+                result = replace_day(day_ms, as_of_ms, buckets, args.api_url)
+                totals['deleted'] += result['deleted']
+                print(f"🔁 {day}: {item_count} items + {result['lateItems']} late -> "
+                      f"{result['replaced']} rollup rows ({result['deleted']} stale deleted)")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"❌ Rollup job failed: {str(e)}")
+        sys.exit(2)
+    finally:
+        if local_server:
+            local_server.shutdown()
+
+    elapsed = time.perf_counter() - started
+    print(f"\n📊 {totals['items']} items -> {totals['rows']} rollup rows in {elapsed:.1f}s")
+    if args.check:
+        if totals['mismatches']:
+            print(f"❌ {totals['mismatches']} rollup row(s) differ from the raw items; run without --check to repair")
+            sys.exit(1)
+        print("✅ Stored rollups match the raw items")
+    else:
+        print(f"✅ Rollups rebuilt ({totals['deleted']} stale rows deleted)")
+
+
+if __name__ == "__main__":
+    main()
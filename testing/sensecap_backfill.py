@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+SenseCAP Telemetry Backfill
+
+Walks a device's history backwards from --end to --start in time windows,
+calling list_telemetry_data once per window. A window that comes back full
+(some channel returned `limit` readings) may have been truncated, so it is
+halved and fetched again; sparse windows grow the next window instead, which
+keeps the number of API calls low across quiet periods.
+
+Readings are appended to an NDJSON file as they arrive, one line per reading:
+    {"device_eui": ..., "channel": "1", "measurement_id": "4097",
+     "time": "2026-01-05T08:00:00.000Z", "value": 21.5}
+
+After every window the progress is saved to a checkpoint file together with
+the output file's size. An interrupted run resumes from the checkpoint and
+first truncates the output back to that size, so no reading is written twice.
+If the output is missing or shorter than that, the readings the checkpoint
+counts as done are gone and the run refuses to resume.
+
+Usage:
+    python sensecap_backfill.py --start 2025-10-01 --output history.ndjson
+    python sensecap_backfill.py --start 2025-10-01 --devices 2CF7F1C04430012B --output history.ndjson
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import api_client
+import lorewan_data_api
+from telemetry_columns import parse_telemetry_columns
+from time_utils import to_epoch_ms, from_epoch_ms
+
+# ===== CONFIGURATION CONSTANTS =====
+PAGE_LIMIT = 500  # Readings requested per channel per window
+INITIAL_WINDOW_HOURS = 24  # First window size
+MIN_WINDOW_SECONDS = 60  # Full windows are never split below this
+MAX_WINDOW_HOURS = 24 * 14  # Sparse windows never grow beyond this
+SPARSE_FRACTION = 0.25  # Grow the window when the fullest channel is below this fraction of PAGE_LIMIT
+BACKFILL_RATE_LIMIT = 5  # Requests/s to the SenseCAP host
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+
+# =============================================================================
+# CHECKPOINT
+# =============================================================================
+
+def load_checkpoint(path):
+    """Load the checkpoint, or an empty one if the file doesn't exist"""
+    if not os.path.exists(path):
+        return {'devices': {}, 'output_bytes': 0}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_checkpoint(checkpoint, path):
+    """Write the checkpoint atomically so a crash never leaves half a file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# =============================================================================
+# BACKFILL
+# =============================================================================
+
+def fetch_window(device_eui, window_start, window_end, limit):
+    """
+    Fetch one window of telemetry
+    Returns: TelemetryColumns, or None if the request failed
+    """
+    telemetry_data = lorewan_data_api.get_telemetry_data(
+        device_eui, limit=limit, time_start=window_start, time_end=window_end, verbose=False)
+    if telemetry_data is None:
+        return None
+    return parse_telemetry_columns(telemetry_data)
+
+
+def write_readings(output, device_eui, columns, after_ms):
+    """
+    Append the readings newer than after_ms as NDJSON lines
+    Returns: number of lines written
+    """
+    lines = []
+    for (channel, measurement_id), series in columns.series.items():
+        for i in range(series.since(after_ms), len(series)):
+            lines.append(json.dumps({
+                'device_eui': device_eui,
+                'channel': channel,
+                'measurement_id': measurement_id,
+                'time': from_epoch_ms(series.times[i]),
+                'value': series.values[i],
+            }))
+    for (channel, measurement_id), series in columns.scans.items():
+        for i in range(series.since(after_ms), len(series)):
+            lines.append(json.dumps({
+                'device_eui': device_eui,
+                'channel': channel,
+                'measurement_id': measurement_id,
+                'time': from_epoch_ms(series.times[i]),
+                'value': series.scans[i],
+            }))
+    if lines:
+        output.write(("\n".join(lines) + "\n").encode("utf-8"))
+    return len(lines)
+
+
+def backfill_device(device_eui, time_start, time_end, output, checkpoint, checkpoint_path,
+                    limit=PAGE_LIMIT):
+    """
+    Backfill one device from time_end back to time_start (epoch ms),
+    resuming from the checkpoint if the device was started before
+    Returns: readings written in this run, or None if the device stopped on an error
+    """
+    state = checkpoint['devices'].get(device_eui)
+    if not state or state['time_start'] != time_start:
+        state = {'time_start': time_start, 'next_end': time_end,
+                 'window_ms': INITIAL_WINDOW_HOURS * 3600 * 1000, 'readings': 0, 'done': False}
+        checkpoint['devices'][device_eui] = state
+    if state['done']:
+        print(f"⏭️  {device_eui}: already complete ({state['readings']} readings)")
+        return 0
+
+    min_window = MIN_WINDOW_SECONDS * 1000
+    max_window = MAX_WINDOW_HOURS * 3600 * 1000
+    written = 0
+    requests_made = 0
+
+    while state['next_end'] >= time_start:
+        window_end = state['next_end']
+        window_start = max(time_start, window_end - state['window_ms'])
+
+        columns = fetch_window(device_eui, window_start, window_end, limit)
+        requests_made += 1
+        if columns is None:
+            print(f"❌ {device_eui}: request failed at {datetime.fromtimestamp(window_end / 1000)} - "
+                  f"rerun to resume")
+            return None
+
+        counts = columns.counts()
+        fullest = max(counts.values(), default=0)
+        if fullest >= limit:
+            # Some channel may have been truncated
+            if window_end - window_start > min_window:
+                # Retry the same end with half the window
+                state['window_ms'] = max(min_window, (window_end - window_start) // 2)
+                continue
+            # Even the smallest window is full: keep what is newer than the
+            # point where the fullest channel was cut off and continue from there
+            cutoff = max(columns.oldest(key) for key, count in counts.items() if count >= limit)
+            window_start = min(cutoff, window_end - 1) + 1
+        elif fullest < limit * SPARSE_FRACTION:
+            state['window_ms'] = min(max_window, state['window_ms'] * 2)
+
+        count = write_readings(output, device_eui, columns, window_start - 1)
+        output.flush()
+
+        written += count
+        state['readings'] += count
+        # Window bounds are inclusive, so the next window ends just before this one
+        state['next_end'] = window_start - 1
+        checkpoint['output_bytes'] = output.tell()
+        save_checkpoint(checkpoint, checkpoint_path)
+
+    state['done'] = True
+    save_checkpoint(checkpoint, checkpoint_path)
+    print(f"✅ {device_eui}: {written} readings in {requests_made} requests")
+    return written
+
+
+def run_backfill(device_euis, time_start, time_end, output_path, checkpoint_path=None, limit=PAGE_LIMIT):
+    """
+    Backfill several devices into one NDJSON file, resuming from the checkpoint
+    Returns: dict of device_eui -> readings written (None for devices that failed)
+    Raises: ValueError if the output is shorter than the checkpoint says
+    """
+    checkpoint_path = checkpoint_path or output_path + CHECKPOINT_SUFFIX
+    checkpoint = load_checkpoint(checkpoint_path)
+
+    # Resuming would skip the windows whose readings are missing from the output
+    output_bytes = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+    if output_bytes < checkpoint['output_bytes']:
+        raise ValueError(f"{output_path} has {output_bytes} bytes, but {checkpoint_path} was saved at "
+                         f"{checkpoint['output_bytes']} - restore the output or delete the checkpoint to start over")
+
+    # Drop anything written after the last checkpoint so resumed windows aren't duplicated
+    mode = "r+b" if os.path.exists(output_path) else "wb"
+    results = {}
+    with open(output_path, mode) as output:
+        output.truncate(checkpoint['output_bytes'])
+        output.seek(checkpoint['output_bytes'])
+        for device_eui in device_euis:
+            results[device_eui] = backfill_device(device_eui, time_start, time_end, output,
+                                                  checkpoint, checkpoint_path, limit)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill SenseCAP telemetry history to NDJSON")
+    parser.add_argument("--start", required=True, help="Oldest time to fetch (ISO date/time)")
+    parser.add_argument("--end", help="Newest time to fetch (default: now)")
+    parser.add_argument("--devices", nargs="+", help="Device EUIs (default: all nodes)")
+    parser.add_argument("--output", required=True, help="NDJSON file readings are appended to")
+    parser.add_argument("--checkpoint", help=f"Checkpoint file (default: <output>{CHECKPOINT_SUFFIX})")
+    parser.add_argument("--limit", type=int, default=PAGE_LIMIT, help="Readings per channel per request")
+    parser.add_argument("--rate", type=float, default=BACKFILL_RATE_LIMIT, help="Max requests/s")
+    args = parser.parse_args()
+
+    api_client.configure(rate_limit=args.rate)
+    time_start = to_epoch_ms(datetime.fromisoformat(args.start))
+    time_end = to_epoch_ms(datetime.fromisoformat(args.end) if args.end else datetime.now())
+
+    device_euis = args.devices
+    if not device_euis:
+        devices = lorewan_data_api.get_devices(device_type="2") or []
+        device_euis = [device['device_eui'] for device in devices if device.get('device_eui')]
+    if not device_euis:
+        print("❌ No devices to backfill")
+        return
+
+    print(f"Backfilling {len(device_euis)} device(s) from {args.start} to {args.end or 'now'} into {args.output}")
+    started = time.time()
+    try:
+        results = run_backfill(device_euis, time_start, time_end, args.output, args.checkpoint, args.limit)
+    except ValueError as e:
+        print(f"❌ Cannot resume: {e}")
+        return
+
+    failed = [device_eui for device_eui, written in results.items() if written is None]
+    total = sum(written for written in results.values() if written)
+    print(f"\n📊 {total} readings written in {time.time() - started:.1f}s")
+    if failed:
+        print(f"❌ {len(failed)} device(s) incomplete, rerun to resume: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,33 @@
 import requests
+import api_client
+import bulk_client
+import items_reader
+import sensor_spool
+import argparse
+import asyncio
+import queue
+import threading
 import time
 import random
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # ===== CONFIGURATION CONSTANTS =====
 API_BASE_URL = "http://localhost:5050/api"  # Change this for production
-REQUEST_INTERVAL_SECONDS = 2  # Time between requests
+REQUEST_INTERVAL_SECONDS = 2  # Sampling period; readings are taken on this fixed cadence
 TOTAL_REQUESTS = False  # Set to False for continuous generation, or a number for limited requests
+SPOOL_PATH = "sensor_spool.sqlite"  # Readings that could not be sent are queued here (None to drop them)
+SPOOL_DRAIN_TIMEOUT_SECONDS = 10  # Time given to the spool to empty on exit
+SPOOLED = "spooled"  # make_post_request() outcome for readings queued in the spool
+SEND_QUEUE_SIZE = 50  # Readings buffered between the sampler and the sender
+SEND_BATCH_SIZE = 50  # Readings sent together via /items/bulk once the sender falls behind
+
+# ===== LOAD MODE (--load) =====
+LOAD_SENSOR_STREAMS = 24  # Number of simulated sensors posting concurrently
+LOAD_TARGET_RATE = 50.0  # Total records/s across all streams
+LOAD_MAX_IN_FLIGHT = 32  # Cap on outstanding POST requests
+LOAD_DURATION_SECONDS = 60  # Set to False to run until Ctrl+C
+LOAD_REQUEST_TIMEOUT_SECONDS = 10  # Per-request timeout in load mode
+LOAD_REPORT_INTERVAL_SECONDS = 1  # Time between progress lines
 
 # ===== SENSOR VALUE RANGES =====
 TEMPERATURE_RANGE = (25.0, 45.0)  # °C - Industrial temperature range
@@ -34,32 +55,35 @@ STATUS_CODES = {
     'Streeting': 2100
 }
 
-def generate_sensor_payload():
-    """Generate a realistic sensor data payload with correlated values"""
+def generate_sensor_payload(rng=random, timestamp=None):
+    """
+    Generate a realistic sensor data payload with correlated values.
+    Pass a seeded random.Random as rng and a fixed timestamp for reproducible output.
+    """
     
     # Generate sensor readings with realistic correlations
-    base_temp = random.uniform(*TEMPERATURE_RANGE)
+    base_temp = rng.uniform(*TEMPERATURE_RANGE)
     
     # Speed might be affected by temperature (higher temp = slightly lower speed)
     temp_factor = (base_temp - TEMPERATURE_RANGE[0]) / (TEMPERATURE_RANGE[1] - TEMPERATURE_RANGE[0])
     speed_adjustment = (1 - temp_factor * 0.1)  # Up to 10% reduction at high temps
-    speed_value = random.uniform(*SPEED_RANGE) * speed_adjustment
+    speed_value = rng.uniform(*SPEED_RANGE) * speed_adjustment
     
     # Squeegee speed typically correlates with main speed
-    squeegee_ratio = random.uniform(0.7, 0.9)  # 70-90% of main speed
+    squeegee_ratio = rng.uniform(0.7, 0.9)  # 70-90% of main speed
     squeegee_speed = speed_value * squeegee_ratio
     
     # Print pressure might vary with speed
-    pressure_base = random.uniform(*PRINT_PRESSURE_RANGE)
+    pressure_base = rng.uniform(*PRINT_PRESSURE_RANGE)
     pressure_variation = (speed_value / max(SPEED_RANGE)) * 1000  # Up to 1000 N/m² variation
-    print_pressure = pressure_base + random.uniform(-pressure_variation, pressure_variation)
+    print_pressure = pressure_base + rng.uniform(-pressure_variation, pressure_variation)
       # Ink viscosity affected by temperature
     visc_temp_factor = (base_temp - TEMPERATURE_RANGE[0]) / (TEMPERATURE_RANGE[1] - TEMPERATURE_RANGE[0])
-    base_viscosity = random.uniform(*INK_VISCOSITY_RANGE)
+    base_viscosity = rng.uniform(*INK_VISCOSITY_RANGE)
     ink_viscosity = base_viscosity * (1 - visc_temp_factor * 0.15)  # Lower viscosity at higher temps
     
     # Select process type and corresponding status code
-    process_type = random.choice(PROCESS_TYPES)
+    process_type = rng.choice(PROCESS_TYPES)
     status_code = STATUS_CODES[process_type]
     
     payload = {
@@ -68,41 +92,65 @@ def generate_sensor_payload():
         "temperature": {
             "value": round(base_temp, 1),
             "unit": "°C",
-            "deviceSource": random.choice(DEVICE_SOURCES['temperature'])
+            "deviceSource": rng.choice(DEVICE_SOURCES['temperature'])
         },
         "speed": {
             "value": round(speed_value, 1),
             "unit": "mm/s",
-            "deviceSource": random.choice(DEVICE_SOURCES['speed'])
+            "deviceSource": rng.choice(DEVICE_SOURCES['speed'])
         },
         "squeegeeSpeed": {
             "value": round(squeegee_speed, 1),
             "unit": "mm/s",
-            "deviceSource": random.choice(DEVICE_SOURCES['squeegee_speed'])
+            "deviceSource": rng.choice(DEVICE_SOURCES['squeegee_speed'])
         },
         "printPressure": {
             "value": round(print_pressure, 0),
             "unit": "N/m²",
-            "deviceSource": random.choice(DEVICE_SOURCES['print_pressure'])
+            "deviceSource": rng.choice(DEVICE_SOURCES['print_pressure'])
         },
         "inkViscosity": {
             "value": round(ink_viscosity, 1),
             "unit": "cP",
-            "deviceSource": random.choice(DEVICE_SOURCES['ink_viscosity'])
+            "deviceSource": rng.choice(DEVICE_SOURCES['ink_viscosity'])
         },
-        "operator": random.choice(TEST_OPERATORS),
-        "timestamp": datetime.now().isoformat()
+        "operator": rng.choice(TEST_OPERATORS),
+        "timestamp": (timestamp or datetime.now()).isoformat()
     }
     
     return payload
 
+# Write-ahead spool for readings the backend could not take (set up by main())
+spool = None
+
+# Readings that overflowed the full send queue; the sender spools them behind
+# the older readings still queued or in flight (see spool_overflow())
+overflow_lock = threading.Lock()
+overflow_readings = []
+
+def spool_reading(payload, reason):
+    """Queue a reading in the spool; it is sent by the spool's drain thread"""
+    spool.append(payload)
+    print(f"📦 Sensor reading spooled ({reason}) - {len(spool)} waiting")
+    return SPOOLED
+
 def make_post_request(payload):
-    """Make POST request to the API"""
+    """
+    Make POST request to the API
+    Returns: True on success, SPOOLED if the reading was queued in the spool, False otherwise
+    """
     url = f"{API_BASE_URL}/items"
     headers = {"Content-Type": "application/json"}
     
+    if spool is not None:
+        # A fixed _id makes re-sending from the spool safe if this POST did reach the backend
+        payload.setdefault('_id', sensor_spool.new_object_id())
+        # Keep readings in order: while older ones are spooled, new ones queue behind them
+        if len(spool) > 0:
+            return spool_reading(payload, "backlog")
+    
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = api_client.post(url, json=payload, headers=headers)
         
         if response.status_code == 201:
             data = response.json()
@@ -118,20 +166,151 @@ def make_post_request(payload):
             print(f"   Response: {response.text}")
             return False
             
-    except requests.exceptions.ConnectionError:
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        if spool is not None:
+            return spool_reading(payload, type(e).__name__)
         print(f"❌ Connection failed - Is the server running at {API_BASE_URL}?")
         return False
     except requests.exceptions.RequestException as e:
         print(f"❌ Request failed: {str(e)}")
         return False
 
+def make_bulk_request(payloads):
+    """
+    POST several queued readings in one /items/bulk request
+    Returns: (successful, spooled, failed) counts
+    """
+    if spool is not None:
+        for payload in payloads:
+            payload.setdefault('_id', sensor_spool.new_object_id())
+        if len(spool) > 0:
+            for payload in payloads:
+                spool.append(payload)
+            print(f"📦 {len(payloads)} sensor readings spooled (backlog) - {len(spool)} waiting")
+            return 0, len(payloads), 0
+    
+    try:
+        inserted_ids, failed = bulk_client.post_items_bulk(payloads, API_BASE_URL)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        if spool is not None:
+            for payload in payloads:
+                spool.append(payload)
+            print(f"📦 {len(payloads)} sensor readings spooled ({type(e).__name__}) - {len(spool)} waiting")
+            return 0, len(payloads), 0
+        print(f"❌ Connection failed - Is the server running at {API_BASE_URL}?")
+        return 0, 0, len(payloads)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Bulk request failed: {str(e)}")
+        return 0, 0, len(payloads)
+    
+    print(f"✅ {len(inserted_ids)} sensor readings logged in one bulk request")
+    for failure in failed:
+        print(f"❌ Reading #{failure['index']} of the batch rejected: {failure['message']}")
+    return len(inserted_ids), 0, len(failed)
+
+def spool_overflow(send_queue, stats):
+    """
+    Spool the readings still queued, then the overflowed ones behind them, so
+    the spool keeps the sampling order. Runs on the sender thread between
+    batches, when the outcome of every older reading is known.
+    Returns: True if the None sentinel was taken off the queue
+    """
+    with overflow_lock:
+        if not overflow_readings:
+            return False
+        queued = 0
+        stopping = False
+        while True:
+            try:
+                payload = send_queue.get_nowait()
+            except queue.Empty:
+                break
+            if payload is None:
+                stopping = True
+                break
+            spool.append(payload)
+            queued += 1
+        for payload in overflow_readings:
+            spool.append(payload)
+        print(f"📦 {queued} queued + {len(overflow_readings)} overflowed sensor reading(s) spooled - "
+              f"{len(spool)} waiting")
+        overflow_readings.clear()
+    stats['spooled'] += queued
+    return stopping
+
+def run_sender(send_queue, stats):
+    """
+    Sender stage: take readings off the queue until the None sentinel arrives.
+    A single waiting reading is POSTed on its own; readings that piled up
+    while a request was in flight go out together in one bulk request.
+    """
+    while True:
+        if spool_overflow(send_queue, stats):
+            return
+        try:
+            # Timeout: overflowed readings are spooled even if nothing else gets queued
+            batch = [send_queue.get(timeout=REQUEST_INTERVAL_SECONDS)]
+        except queue.Empty:
+            continue
+        while batch[-1] is not None and len(batch) < SEND_BATCH_SIZE:
+            try:
+                batch.append(send_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        stopping = batch[-1] is None
+        payloads = batch[:-1] if stopping else batch
+        if len(payloads) == 1:
+            result = make_post_request(payloads[0])
+            successful, spooled, failed = result is True, result == SPOOLED, result is False
+        elif payloads:
+            successful, spooled, failed = make_bulk_request(payloads)
+        else:
+            successful = spooled = failed = 0
+        
+        stats['successful'] += successful
+        stats['spooled'] += spooled
+        stats['failed'] += failed
+        if stopping:
+            spool_overflow(send_queue, stats)
+            return
+
+def enqueue_reading(send_queue, payload, stats):
+    """
+    Hand a reading to the sender. A full queue blocks the sampler for at most
+    half a period (backpressure); after that the reading overflows to the
+    spool, or is dropped without one, so the sampling cadence is kept.
+    Until the sender has spooled an overflowed reading, later readings queue
+    behind it instead of overtaking it through the send queue.
+    """
+    # Counted apart from the sender's outcomes, which only the sender thread updates
+    with overflow_lock:
+        if overflow_readings:
+            overflow_readings.append(payload)
+            stats['overflow'] += 1
+            return
+    
+    try:
+        send_queue.put(payload, timeout=REQUEST_INTERVAL_SECONDS / 2)
+        return
+    except queue.Full:
+        pass
+    
+    stats['overflow'] += 1
+    if spool is not None:
+        with overflow_lock:
+            overflow_readings.append(payload)
+        print(f"📦 Send queue full ({SEND_QUEUE_SIZE}) - reading goes to the spool")
+    else:
+        print(f"⚠️  Send queue full ({SEND_QUEUE_SIZE}) - reading dropped")
+
 def test_api_connection():
     """Test if the API is accessible"""
     url = f"{API_BASE_URL}/items"
     try:
-        response = requests.get(url)
+        response = api_client.get(url, params={'limit': 0})
         if response.status_code == 200:
-            print(f"✅ API connection successful - Found {len(response.json())} existing records")
+            print(f"✅ API connection successful - Found {items_reader.total_count(response)} existing records")
             return True
         else:
             print(f"⚠️  API responded with status {response.status_code}")
@@ -144,8 +323,193 @@ def test_api_connection():
         print(f"❌ API test failed: {str(e)}")
         return False
 
-def main():
+def new_load_stats():
+    """Create the counters shared by all sensor streams in load mode"""
+    return {
+        'scheduled': 0,
+        'successful': 0,
+        'failed': 0,
+        'skipped': 0,  # Ticks dropped because the in-flight cap was reached
+        'in_flight': 0,
+        'latency_total': 0.0,
+        'latency_max': 0.0,
+        'latencies': [],  # Per-request seconds, for latency_stats.summarize()
+        'status_codes': {}
+    }
+
+def import_aiohttp():
+    """Import aiohttp, which only the load mode needs"""
+    try:
+        import aiohttp
+    except ImportError:
+        raise SystemExit("❌ Load mode needs aiohttp: pip install aiohttp") from None
+    return aiohttp
+
+async def post_sensor_payload_async(session, semaphore, stats):
+    """POST one sensor reading and record its outcome; releases the in-flight slot when done"""
+    aiohttp = import_aiohttp()
+    url = f"{API_BASE_URL}/items"
+    payload = generate_sensor_payload()
+    started = time.perf_counter()
+    
+    try:
+        async with session.post(url, json=payload) as response:
+            await response.read()
+            
+            if response.status == 201:
+                stats['successful'] += 1
+            else:
+                stats['failed'] += 1
+                stats['status_codes'][response.status] = stats['status_codes'].get(response.status, 0) + 1
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        stats['failed'] += 1
+        error_name = type(e).__name__
+        stats['status_codes'][error_name] = stats['status_codes'].get(error_name, 0) + 1
+    finally:
+        latency = time.perf_counter() - started
+        stats['latency_total'] += latency
+        stats['latencies'].append(latency)
+        stats['latency_max'] = max(stats['latency_max'], latency)
+        stats['in_flight'] -= 1
+        semaphore.release()
+
+async def run_sensor_stream(session, semaphore, interval, deadline, stats, pending):
+    """Simulate one sensor posting a reading every `interval` seconds on a fixed schedule"""
+    loop = asyncio.get_running_loop()
+    
+    # Stagger stream start so all sensors don't fire on the same tick
+    next_tick = loop.time() + random.uniform(0, interval)
+    
+    while deadline is None or next_tick < deadline:
+        await asyncio.sleep(max(0.0, next_tick - loop.time()))
+        await semaphore.acquire()
+        
+        # If we waited on the in-flight cap for longer than a period, drop the
+        # missed ticks instead of bursting to catch up
+        lag = loop.time() - next_tick
+        if lag >= interval:
+            missed = int(lag // interval)
+            stats['skipped'] += missed
+            next_tick += missed * interval
+        
+        stats['scheduled'] += 1
+        stats['in_flight'] += 1
+        task = asyncio.create_task(post_sensor_payload_async(session, semaphore, stats))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        
+        next_tick += interval
+
+async def report_load_progress(stats, started):
+    """Print one progress line per report interval"""
+    last_done = 0
+    
+    while True:
+        await asyncio.sleep(LOAD_REPORT_INTERVAL_SECONDS)
+        done = stats['successful'] + stats['failed']
+        elapsed = time.perf_counter() - started
+        current_rate = (done - last_done) / LOAD_REPORT_INTERVAL_SECONDS
+        mean_latency = (stats['latency_total'] / done * 1000) if done else 0.0
+        last_done = done
+        print(f"⏱️  {elapsed:6.1f}s | {current_rate:7.1f} rec/s | "
+              f"✅ {stats['successful']} ❌ {stats['failed']} ⏭️  {stats['skipped']} | "
+              f"in-flight: {stats['in_flight']:3d} | mean latency: {mean_latency:.1f} ms")
+
+async def run_load_test(stats, streams=LOAD_SENSOR_STREAMS, target_rate=LOAD_TARGET_RATE,
+                        max_in_flight=LOAD_MAX_IN_FLIGHT, duration=LOAD_DURATION_SECONDS, report=True):
+    """
+    Run `streams` concurrent sensor streams sharing a total rate of `target_rate` records/s
+    report=False suppresses the progress lines (e.g. when sharded_load.py runs many of these)
+    """
+    aiohttp = import_aiohttp()
+    interval = streams / target_rate  # Per-stream period so the streams add up to target_rate
+    pending = set()
+    semaphore = asyncio.Semaphore(max_in_flight)
+    
+    connector = aiohttp.TCPConnector(limit=max_in_flight)
+    timeout = aiohttp.ClientTimeout(total=LOAD_REQUEST_TIMEOUT_SECONDS)
+    
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        deadline = loop.time() + duration if duration is not False else None
+        
+        reporter = asyncio.create_task(report_load_progress(stats, started)) if report else None
+        try:
+            await asyncio.gather(*(
+                run_sensor_stream(session, semaphore, interval, deadline, stats, pending)
+                for _ in range(streams)
+            ))
+            # Let outstanding requests finish before closing the session
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            if reporter:
+                reporter.cancel()
+
+def print_load_summary(stats, elapsed, target_rate):
+    """Print the load mode summary"""
+    done = stats['successful'] + stats['failed']
+    print("=" * 50)
+    print("📊 LOAD TEST SUMMARY")
+    print(f"✅ Successful readings: {stats['successful']}")
+    print(f"❌ Failed readings: {stats['failed']}")
+    print(f"⏭️  Skipped ticks (in-flight cap reached): {stats['skipped']}")
+    if done > 0:
+        print(f"📈 Success rate: {stats['successful'] / done * 100:.1f}%")
+        print(f"⚡ Achieved rate: {done / elapsed:.1f} rec/s (target {target_rate:.1f} rec/s)")
+        print(f"⏳ Latency: mean {stats['latency_total'] / done * 1000:.1f} ms | "
+              f"max {stats['latency_max'] * 1000:.1f} ms")
+    if stats['status_codes']:
+        print(f"🔍 Failures by status: {stats['status_codes']}")
+    print(f"⏱️  Total runtime: {elapsed:.1f} seconds")
+    print("=" * 50)
+
+def main_load(streams, target_rate, max_in_flight, duration):
+    """Entry point for the asyncio high-concurrency load mode"""
+    print("🔧 Live Sensor Data Generator for SimpleUI - LOAD MODE")
+    print("=" * 50)
+    print(f"API URL: {API_BASE_URL}")
+    print(f"Sensor streams: {streams}")
+    print(f"Target rate: {target_rate} records/s ({streams / target_rate:.3f}s per stream)")
+    print(f"Max in-flight requests: {max_in_flight}")
+    print(f"Duration: {'until Ctrl+C' if duration is False else f'{duration} seconds'}")
+    print("=" * 50)
+    
+    if not test_api_connection():
+        print("\n⛔ Exiting due to API connection failure")
+        return
+    
+    print(f"\n🚀 Starting load generation...")
+    print("Press Ctrl+C to stop\n")
+    
+    stats = new_load_stats()
+    started = time.perf_counter()
+    try:
+        asyncio.run(run_load_test(stats, streams, target_rate, max_in_flight, duration))
+    except KeyboardInterrupt:
+        print("\n\n⏹️  Load generation stopped by user")
+    
+    print_load_summary(stats, time.perf_counter() - started, target_rate)
+
+def positive_int(value):
+    """argparse type: integer > 0"""
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def positive_float(value):
+    """argparse type: number > 0"""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def main(spool_path=SPOOL_PATH):
     """Main function to run the sensor data generation script"""
+    global spool
+    
     print("🔧 Live Sensor Data Generator for SimpleUI")
     print("=" * 50)
     print(f"API URL: {API_BASE_URL}")
@@ -155,19 +519,33 @@ def main():
     print(f"Speed: {SPEED_RANGE[0]} to {SPEED_RANGE[1]} mm/s")
     print(f"Pressure: {PRINT_PRESSURE_RANGE[0]} to {PRINT_PRESSURE_RANGE[1]} N/m²")
     print(f"Viscosity: {INK_VISCOSITY_RANGE[0]} to {INK_VISCOSITY_RANGE[1]} cP")
+    print(f"Spool: {spool_path or 'disabled'}")
     print("=" * 50)
     
-    # Test API connection first
+    if spool_path:
+        spool = sensor_spool.SensorSpool(spool_path, API_BASE_URL)
+        if len(spool) > 0:
+            print(f"📦 {len(spool)} reading(s) left in the spool by a previous run will be sent first")
+        spool.start()
+    
+    # Test API connection first; with a spool, readings are kept until the backend is up
     if not test_api_connection():
-        print("\n⛔ Exiting due to API connection failure")
-        return
+        if spool is None:
+            print("\n⛔ Exiting due to API connection failure")
+            return
+        print("📦 Continuing offline - readings will be spooled")
     
     print(f"\n🚀 Starting live sensor data generation...")
     print("Press Ctrl+C to stop\n")
     
-    successful_requests = 0
-    failed_requests = 0
+    stats = {'successful': 0, 'failed': 0, 'spooled': 0, 'overflow': 0, 'max_depth': 0, 'max_lag': 0.0}
+    send_queue = queue.Queue(maxsize=SEND_QUEUE_SIZE)
+    sender = threading.Thread(target=run_sender, args=(send_queue, stats), name="sensor-sender", daemon=True)
+    sender.start()
+    
     request_count = 0
+    started = time.monotonic()
+    started_at = datetime.now()
     
     try:
         while True:
@@ -178,35 +556,79 @@ def main():
                 print(f"\n✅ Completed {TOTAL_REQUESTS} requests")
                 break
             
-            current_time = datetime.now().strftime("%H:%M:%S")
-            print(f"📊 [{current_time}] Generating sensor reading #{request_count}")
-            
-            # Generate and send payload
-            payload = generate_sensor_payload()
-            success = make_post_request(payload)
-            
-            if success:
-                successful_requests += 1
+            # Fixed-rate schedule: reading n is due n periods after the start,
+            # however long the sender takes, so request latency cannot drift it
+            offset = (request_count - 1) * REQUEST_INTERVAL_SECONDS
+            delay = started + offset - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
             else:
-                failed_requests += 1
+                stats['max_lag'] = max(stats['max_lag'], -delay)
             
-            # Wait before next request
-            print(f"⏳ Next reading in {REQUEST_INTERVAL_SECONDS} seconds...\n")
-            time.sleep(REQUEST_INTERVAL_SECONDS)
+            timestamp = started_at + timedelta(seconds=offset)
+            depth = send_queue.qsize()
+            stats['max_depth'] = max(stats['max_depth'], depth)
+            print(f"📊 [{timestamp.strftime('%H:%M:%S')}] Sampling sensor reading #{request_count} | "
+                  f"send queue: {depth}/{SEND_QUEUE_SIZE}")
+            
+            enqueue_reading(send_queue, generate_sensor_payload(timestamp=timestamp), stats)
                 
     except KeyboardInterrupt:
         print("\n\n⏹️  Sensor data generation stopped by user")
     
+    # Let the sender finish what was sampled
+    if send_queue.qsize() > 0:
+        print(f"📤 Sending {send_queue.qsize()} queued reading(s)...")
+    send_queue.put(None)
+    sender.join()
+    elapsed = time.monotonic() - started
+    
+    successful_requests = stats['successful']
+    failed_requests = stats['failed'] + (stats['overflow'] if spool is None else 0)
+    spooled_requests = stats['spooled'] + (stats['overflow'] if spool is not None else 0)
+    
+    if spool is not None:
+        if len(spool) > 0:
+            print(f"📦 Draining {len(spool)} spooled reading(s)...")
+        spool.stop(timeout=SPOOL_DRAIN_TIMEOUT_SECONDS)
+    
     # Summary
     print("=" * 50)
     print("📊 SENSOR DATA GENERATION SUMMARY")
     print(f"✅ Successful readings: {successful_requests}")
     print(f"❌ Failed readings: {failed_requests}")
+    if spool is not None:
+        print(f"📦 Spooled readings: {spooled_requests} | delivered from spool: "
+              f"{spool.stats['delivered'] + spool.stats['duplicates']} | "
+              f"rejected: {spool.stats['rejected']} | still on disk: {len(spool)}")
+        spool.close()
     if successful_requests + failed_requests > 0:
         success_rate = (successful_requests/(successful_requests+failed_requests)*100)
         print(f"📈 Success rate: {success_rate:.1f}%")
-    print(f"⏱️  Total runtime: {request_count * REQUEST_INTERVAL_SECONDS} seconds")
+    print(f"📥 Send queue: max depth {stats['max_depth']}/{SEND_QUEUE_SIZE} | overflowed: {stats['overflow']} | "
+          f"max sampling lag: {stats['max_lag'] * 1000:.1f} ms")
+    print(f"⏱️  Total runtime: {elapsed:.1f} seconds")
     print("=" * 50)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Live sensor data generator for SimpleUI")
+    parser.add_argument("--load", action="store_true",
+                        help="Run the asyncio high-concurrency load mode")
+    parser.add_argument("--streams", type=positive_int, default=LOAD_SENSOR_STREAMS,
+                        help="Number of simulated sensor streams (load mode)")
+    parser.add_argument("--rate", type=positive_float, default=LOAD_TARGET_RATE,
+                        help="Target total records/s across all streams (load mode)")
+    parser.add_argument("--max-in-flight", type=positive_int, default=LOAD_MAX_IN_FLIGHT,
+                        help="Cap on outstanding requests (load mode)")
+    parser.add_argument("--duration", type=float, default=LOAD_DURATION_SECONDS,
+                        help="Seconds to run, 0 to run until Ctrl+C (load mode)")
+    parser.add_argument("--spool", default=SPOOL_PATH,
+                        help="SQLite file buffering readings while the backend is unreachable")
+    parser.add_argument("--no-spool", action="store_true",
+                        help="Drop readings that cannot be sent instead of spooling them")
+    args = parser.parse_args()
+    
+    if args.load:
+        main_load(args.streams, args.rate, args.max_in_flight, args.duration or False)
+    else:
+        main(spool_path=None if args.no_spool else args.spool)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Write-Ahead Spool for Offline Sensor Ingestion
+
+Readings that cannot be POSTed (backend down, network blip) are appended
+to a local SQLite queue instead of being dropped. A background thread
+drains the queue oldest first in bulk batches once the backend answers
+again, so the sampling loop never waits on retries.
+
+Delivery is exactly-once from the API's point of view:
+- Every spooled reading gets a client-generated ObjectId `_id` when it is
+  appended, and keeps it across retries and restarts.
+- Rows are deleted only after the bulk POST returned. If the response was
+  lost, the next attempt re-sends the same `_id` values and the backend
+  rejects them with a duplicate key error (E11000), which the spool counts
+  as already delivered.
+- A batch the backend refuses as a whole with a 4xx (body too large or not
+  parseable) is split in halves until the offending reading is alone; that
+  reading is dropped like any other invalid payload instead of blocking the
+  spool forever.
+
+Usage:
+    from sensor_spool import SensorSpool
+    spool = SensorSpool("sensor_spool.sqlite")
+    spool.start()
+    ...
+    spool.append(payload)  # on ConnectionError
+    ...
+    spool.stop()
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+import bulk_client
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+SPOOL_PATH = "sensor_spool.sqlite"  # Default spool database
+SPOOL_BATCH_SIZE = 200  # Readings per bulk request while draining
+SPOOL_RETRY_SECONDS = 1.0  # First wait after a failed drain attempt
+SPOOL_MAX_RETRY_SECONDS = 30.0  # Backoff cap while the backend stays unreachable
+SPOOL_IDLE_SECONDS = 5.0  # Re-check interval when the spool is empty
+DUPLICATE_KEY_MARKER = "E11000"  # MongoDB duplicate key error code in bulk failure messages
+RETRYABLE_CLIENT_ERRORS = (408, 429)  # 4xx statuses that say nothing about the batch itself
+
+_object_id_lock = threading.Lock()
+_object_id_counter = int.from_bytes(os.urandom(3), 'big')
+_object_id_process = os.urandom(5).hex()
+
+
+def new_object_id():
+    """24-hex id in MongoDB ObjectId layout (time, random process id, counter)"""
+    global _object_id_counter
+    with _object_id_lock:
+        _object_id_counter = (_object_id_counter + 1) % 0xFFFFFF
+        counter = _object_id_counter
+    return f"{int(time.time()):08x}{_object_id_process}{counter:06x}"
+
+
+class SensorSpool:
+    """Durable FIFO of item payloads with a background bulk drainer"""
+
+    def __init__(self, path=SPOOL_PATH, api_base_url=API_BASE_URL, batch_size=SPOOL_BATCH_SIZE,
+                 retry_seconds=SPOOL_RETRY_SECONDS, max_retry_seconds=SPOOL_MAX_RETRY_SECONDS):
+        self.path = path
+        self.api_base_url = api_base_url
+        self.batch_size = batch_size
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS spool (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                spooled_at REAL NOT NULL
+            )''')
+        self.db.commit()
+        self.depth = self.db.execute('SELECT COUNT(*) FROM spool').fetchone()[0]
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.online = True
+        self.stats = {'spooled': 0, 'delivered': 0, 'duplicates': 0, 'rejected': 0, 'retries': 0}
+
+    def __len__(self):
+        return self.depth
+
+    def append(self, payload):
+        """
+        Durably queue one item payload (committed before returning)
+        Returns: the payload's _id (assigned here if it had none)
+        """
+        payload = dict(payload)
+        payload.setdefault('_id', new_object_id())
+        with self.lock:
+            self.db.execute('INSERT INTO spool (payload, spooled_at) VALUES (?, ?)',
+                            (json.dumps(payload, ensure_ascii=False), time.time()))
+            self.db.commit()
+            self.depth += 1
+            self.stats['spooled'] += 1
+        self.wake.set()
+        return payload['_id']
+
+    def peek(self, limit):
+        """Oldest `limit` queued rows as (seq, payload)"""
+        with self.lock:
+            rows = self.db.execute('SELECT seq, payload FROM spool ORDER BY seq LIMIT ?', (limit,)).fetchall()
+        return [(seq, json.loads(payload)) for seq, payload in rows]
+
+    def remove_through(self, seq):
+        """Delete every queued row up to and including seq"""
+        with self.lock:
+            removed = self.db.execute('DELETE FROM spool WHERE seq <= ?', (seq,)).rowcount
+            self.db.commit()
+            self.depth -= removed
+
+    def drain_once(self):
+        """
+        Send the oldest batch and drop it from the spool once the backend answered
+        Returns: number of rows removed (0 when the spool is empty)
+        Raises: requests.exceptions.RequestException when the backend is unreachable
+                or fails (5xx, 408, 429)
+        """
+        rows = self.peek(self.batch_size)
+        if not rows:
+            return 0
+        self.deliver(rows)
+        return len(rows)
+
+    def deliver(self, rows):
+        """
+        POST rows as one bulk request and remove them from the spool; a batch
+        rejected as a whole (4xx) is split until the offending reading is alone
+        Raises: requests.exceptions.RequestException as drain_once()
+        """
+        try:
+            _, failed = bulk_client.post_items_bulk([payload for _, payload in rows], self.api_base_url)
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code
+            if not 400 <= status < 500 or status in RETRYABLE_CLIENT_ERRORS:
+                raise
+            if len(rows) > 1:
+                middle = len(rows) // 2
+                self.deliver(rows[:middle])
+                self.deliver(rows[middle:])
+                return
+            # Rejected on its own, so it would block the spool on every retry
+            print(f"⚠️  Spooled reading {rows[0][1].get('_id')} rejected: HTTP {status} {e.response.text[:200]}")
+            self.remove_through(rows[0][0])
+            self.stats['rejected'] += 1
+            return
+
+        duplicates = sum(1 for f in failed if DUPLICATE_KEY_MARKER in f.get('message', ''))
+        rejected = [f for f in failed if DUPLICATE_KEY_MARKER not in f.get('message', '')]
+        for f in rejected:
+            # Invalid payloads would be rejected on every retry, so they are dropped
+            print(f"⚠️  Spooled reading {rows[f['index']][1].get('_id')} rejected: {f['message']}")
+
+        self.remove_through(rows[-1][0])
+        self.stats['delivered'] += len(rows) - len(failed)
+        self.stats['duplicates'] += duplicates
+        self.stats['rejected'] += len(rejected)
+
+    def run(self):
+        """Drain loop: empty the spool, back off while the backend is down, idle when empty"""
+        delay = self.retry_seconds
+        while not self.stopping.is_set():
+            self.wake.clear()
+            try:
+                drained = self.drain_once()
+            except requests.exceptions.RequestException as e:
+                if self.online:
+                    print(f"📦 Backend unreachable, {self.depth} reading(s) spooled: {type(e).__name__}")
+                self.online = False
+                self.stats['retries'] += 1
+                self.stopping.wait(delay)
+                delay = min(delay * 2, self.max_retry_seconds)
+                continue
+
+            if drained and not self.online:
+                print(f"🔁 Backend reachable again, draining spool ({self.depth} left)")
+            self.online = True
+            delay = self.retry_seconds
+            if not drained:
+                self.wake.wait(SPOOL_IDLE_SECONDS)
+
+    def start(self):
+        """Start the background drain thread"""
+        if self.thread is None:
+            self.stopping.clear()
+            self.thread = threading.Thread(target=self.run, name="sensor-spool-drain", daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the drain thread; with a timeout, first give it up to `timeout`
+        seconds to empty the spool. Undelivered rows stay on disk for the next run.
+        """
+        if timeout:
+            deadline = time.monotonic() + timeout
+            while self.depth and self.online and time.monotonic() < deadline:
+                time.sleep(0.05)
+        self.stopping.set()
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def close(self):
+        """Stop draining and close the database"""
+        self.stop()
+        with self.lock:
+            self.db.close()
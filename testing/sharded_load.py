@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Multi-Process Sharded Load Generator
+
+A single Python process tops out on one core generating and JSON-encoding
+payloads. This launcher spawns one worker process per shard and merges
+their metrics into one report, so a single load box can saturate a
+multi-core backend.
+
+Modes:
+    products    Complete manufacturing records (simulate_dashboard.py). Each
+                shard owns a contiguous product ID range starting at
+                START_PRODUCT_ID and posts it with `concurrency` closed-loop
+                threads, one record per POST or --batch-size records per
+                POST /items/bulk.
+    sensors     Live sensor streams (sensor_data_generator.py load mode).
+                Streams, target rate and in-flight cap are split across shards.
+
+Workers start together at a shared wall-clock time, and return their
+counters and raw latencies, which are merged with latency_stats.summarize().
+
+Usage:
+    python sharded_load.py products --workers 8 --records 200000 --batch-size 500
+    python sharded_load.py sensors --workers 4 --streams 400 --rate 2000 --duration 60
+    python sharded_load.py products --workers 4 --records 20000 --local
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import threading
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import requests
+
+import api_client
+import bulk_client
+import sensor_data_generator
+import simulate_dashboard
+from latency_stats import summarize, histogram_labels
+from sensor_data_generator import positive_int, positive_float
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+SHARD_WORKERS = os.cpu_count() or 4  # Worker processes (one shard each)
+SHARD_CONCURRENCY = 8  # Closed-loop request threads per worker (products mode)
+SHARD_RECORDS = 10000  # Records across all shards (products mode)
+SHARD_BATCH_SIZE = 0  # Records per /items/bulk request, 0 for one POST per record
+SHARD_START_DELAY_SECONDS = 2.0  # Head start for workers to spawn before the shared start time
+SHARD_SEED = 42  # Base seed; shard i draws from SHARD_SEED + i
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+
+
+def split_range(total, shards):
+    """
+    Split `total` items into contiguous (start, count) shards of near-equal size
+    Returns: list of (start, count), empty shards omitted
+    """
+    size, extra = divmod(total, shards)
+    ranges, start = [], 0
+    for shard in range(shards):
+        count = size + (1 if shard < extra else 0)
+        if count:
+            ranges.append((start, count))
+        start += count
+    return ranges
+
+
+def wait_until(start_at):
+    """Sleep until the shared wall-clock start time"""
+    delay = start_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def run_product_shard(shard, start_record_id, count, api_base_url, concurrency, batch_size, start_at):
+    """
+    Worker process: post records start_record_id .. start_record_id + count - 1
+    (product IDs START_PRODUCT_ID + record id) with `concurrency` threads
+    Returns: shard metrics dict with latencies as array('d') bytes
+    """
+    # No urllib3 retries: a failed request must count as failed, not be retried behind the timer
+    api_client.configure(pool_size=concurrency, max_retries=0)
+    rng = random.Random(SHARD_SEED + shard)
+    now = datetime.now()
+    records = (simulate_dashboard.generate_comprehensive_record(record_id, rng, now)
+               for record_id in range(start_record_id, start_record_id + count))
+    lock = threading.Lock()
+    latencies = array('d')
+    metrics = {'successful': 0, 'failed': 0, 'requests': 0, 'errors': {}}
+
+    def next_batch():
+        with lock:
+            batch = []
+            for record in records:
+                batch.append(record)
+                if len(batch) >= max(batch_size, 1):
+                    break
+            return batch
+
+    def record(successful, failed, latency, error_name=None):
+        with lock:
+            metrics['successful'] += successful
+            metrics['failed'] += failed
+            metrics['requests'] += 1
+            latencies.append(latency)
+            if error_name:
+                metrics['errors'][error_name] = metrics['errors'].get(error_name, 0) + 1
+
+    def worker():
+        while True:
+            batch = next_batch()
+            if not batch:
+                return
+            started = time.perf_counter()
+            try:
+                if batch_size:
+                    inserted_ids, failed = bulk_client.post_items_bulk(batch, api_base_url)
+                    record(len(inserted_ids), len(failed), time.perf_counter() - started,
+                           "rejected" if failed else None)
+                else:
+                    response = api_client.post(f"{api_base_url}/items", json=batch[0])
+                    ok = response.status_code == 201
+                    record(int(ok), int(not ok), time.perf_counter() - started,
+                           None if ok else f"HTTP {response.status_code}")
+            except requests.exceptions.RequestException as e:
+                record(0, len(batch), time.perf_counter() - started, type(e).__name__)
+
+    wait_until(start_at)
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics.update({
+        'shard': shard,
+        'pid': os.getpid(),
+        'product_ids': [simulate_dashboard.START_PRODUCT_ID + start_record_id,
+                        simulate_dashboard.START_PRODUCT_ID + start_record_id + count - 1],
+        'elapsed_s': time.perf_counter() - started,
+        'latencies': latencies.tobytes(),
+    })
+    return metrics
+
+
+def run_sensor_shard(shard, streams, target_rate, max_in_flight, duration, api_base_url, start_at):
+    """
+    Worker process: run `streams` sensor streams of the asyncio load mode
+    Returns: shard metrics dict with latencies as array('d') bytes
+    """
+    sensor_data_generator.API_BASE_URL = api_base_url
+    random.seed(SHARD_SEED + shard)
+    stats = sensor_data_generator.new_load_stats()
+
+    wait_until(start_at)
+    started = time.perf_counter()
+    asyncio.run(sensor_data_generator.run_load_test(stats, streams, target_rate, max_in_flight, duration,
+                                                    report=False))
+
+    return {
+        'shard': shard,
+        'pid': os.getpid(),
+        'streams': streams,
+        'successful': stats['successful'],
+        'failed': stats['failed'],
+        'skipped': stats['skipped'],
+        'requests': stats['successful'] + stats['failed'],
+        'errors': {str(key): value for key, value in stats['status_codes'].items()},
+        'elapsed_s': time.perf_counter() - started,
+        'latencies': array('d', stats['latencies']).tobytes(),
+    }
+
+
+def run_shards(mode, workers, options):
+    """
+    Spawn one process per shard and wait for all of them
+    Returns: list of shard metrics, ordered by shard
+    """
+    start_at = time.time() + SHARD_START_DELAY_SECONDS
+    # Spawned (not forked) workers start with clean sockets and their own api_client session
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        if mode == 'products':
+            futures = [executor.submit(run_product_shard, shard, start, count, options['api_url'],
+                                       options['concurrency'], options['batch_size'], start_at)
+                       for shard, (start, count) in enumerate(split_range(options['records'], workers))]
+        else:
+            streams = split_range(options['streams'], workers)
+            futures = [executor.submit(run_sensor_shard, shard, count,
+                                       options['rate'] * count / options['streams'],
+                                       max(1, options['max_in_flight'] * count // options['streams']),
+                                       options['duration'], options['api_url'], start_at)
+                       for shard, (_, count) in enumerate(streams)]
+        return [future.result() for future in futures]
+
+
+def aggregate(mode, shard_results, options):
+    """
+    Merge shard metrics into one report
+    Returns: report dict (shards without raw latencies, totals with merged latency summary)
+    """
+    latencies = array('d')
+    errors = {}
+    for result in shard_results:
+        latencies.frombytes(result.pop('latencies'))
+        for name, count in result['errors'].items():
+            errors[name] = errors.get(name, 0) + count
+
+    elapsed = max((result['elapsed_s'] for result in shard_results), default=0.0)
+    successful = sum(result['successful'] for result in shard_results)
+    failed = sum(result['failed'] for result in shard_results)
+    totals = {
+        'successful': successful,
+        'failed': failed,
+        'requests': sum(result['requests'] for result in shard_results),
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(successful / elapsed, 2) if elapsed else 0.0,
+        'error_rate': round(failed / (successful + failed), 4) if successful + failed else 0.0,
+        'errors': errors,
+    }
+    totals.update(summarize(latencies))
+
+    return {
+        'benchmark': 'sharded_load',
+        'mode': mode,
+        'started_at': datetime.now().isoformat(),
+        'workers': len(shard_results),
+        'options': options,
+        'histogram_buckets': histogram_labels(),
+        'totals': totals,
+        'shards': shard_results,
+    }
+
+
+def print_report(report):
+    """Print per-shard lines and the merged totals"""
+    def fmt(value):
+        return f"{value:8.1f}" if value is not None else "     n/a"
+
+    print("\nShard  PID      Success   Failed  Records/s")
+    print("-" * 50)
+    for shard in report['shards']:
+        rate = shard['successful'] / shard['elapsed_s'] if shard['elapsed_s'] else 0.0
+        print(f"{shard['shard']:5d}  {shard['pid']:<7d} {shard['successful']:8d} {shard['failed']:8d} {rate:10.1f}")
+
+    totals = report['totals']
+    print("=" * 60)
+    print(f"📊 SHARDED LOAD SUMMARY ({report['mode']}, {report['workers']} workers)")
+    print(f"✅ Successful records: {totals['successful']}")
+    print(f"❌ Failed records: {totals['failed']} ({totals['error_rate'] * 100:.1f}%)")
+    print(f"⚡ Throughput: {totals['throughput_rps']:.1f} records/s over {totals['elapsed_s']:.1f}s")
+    print(f"⏳ Request latency: p50 {fmt(totals['p50_ms'])} | p95 {fmt(totals['p95_ms'])} | "
+          f"p99 {fmt(totals['p99_ms'])} | max {fmt(totals['max_ms'])} ms ({totals['count']} requests)")
+    if totals['errors']:
+        print(f"🔍 Errors: {totals['errors']}")
+    print("=" * 60)
+
+
+def non_negative_int(value):
+    """argparse type: integer >= 0"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process sharded load generator for /api/items")
+    parser.add_argument("mode", choices=['products', 'sensors'])
+    parser.add_argument("--api-url", default=API_BASE_URL)
+    parser.add_argument("--workers", type=positive_int, default=SHARD_WORKERS, help="Worker processes (shards)")
+    parser.add_argument("--records", type=positive_int, default=SHARD_RECORDS, help="Total records (products mode)")
+    parser.add_argument("--concurrency", type=positive_int, default=SHARD_CONCURRENCY,
+                        help="Request threads per worker (products mode)")
+    parser.add_argument("--batch-size", type=non_negative_int, default=SHARD_BATCH_SIZE,
+                        help="Records per bulk request, 0 for single POSTs (products mode)")
+    parser.add_argument("--streams", type=positive_int, default=sensor_data_generator.LOAD_SENSOR_STREAMS,
+                        help="Total sensor streams (sensors mode)")
+    parser.add_argument("--rate", type=positive_float, default=sensor_data_generator.LOAD_TARGET_RATE,
+                        help="Total target records/s (sensors mode)")
+    parser.add_argument("--max-in-flight", type=positive_int, default=sensor_data_generator.LOAD_MAX_IN_FLIGHT,
+                        help="Total cap on outstanding requests (sensors mode)")
+    parser.add_argument("--duration", type=positive_float, default=sensor_data_generator.LOAD_DURATION_SECONDS,
+                        help="Seconds to run (sensors mode)")
+    parser.add_argument("--output", help="Result file (default: benchmark_results/sharded_<time>.json)")
+    parser.add_argument("--local", action="store_true",
+                        help="Target a local_items_server started by the launcher instead of --api-url")
+    args = parser.parse_args()
+    if args.mode == 'sensors' and not args.duration:
+        parser.error("sensors mode needs a --duration in seconds")
+
+    local_server = None
+    if args.local:
+        from local_items_server import start_server
+        local_server, args.api_url = start_server(port=0)
+
+    workers = max(1, min(args.workers, args.records if args.mode == 'products' else args.streams))
+    options = {key: getattr(args, key) for key in
+               ('api_url', 'records', 'concurrency', 'batch_size', 'streams', 'rate', 'max_in_flight', 'duration')}
+
+    print("Sharded Load Generator")
+    print("=" * 60)
+    print(f"API URL: {args.api_url}")
+    print(f"Mode: {args.mode} | Workers: {workers}")
+    if args.mode == 'products':
+        print(f"Records: {args.records} (product IDs {simulate_dashboard.START_PRODUCT_ID} to "
+              f"{simulate_dashboard.START_PRODUCT_ID + args.records - 1}) | "
+              f"Threads/worker: {args.concurrency} | "
+              f"{'Bulk ' + str(args.batch_size) + ' per request' if args.batch_size else 'One record per POST'}")
+    else:
+        print(f"Streams: {args.streams} | Target rate: {args.rate} records/s | "
+              f"Max in flight: {args.max_in_flight} | Duration: {args.duration}s")
+    print("=" * 60)
+
+    try:
+        report = aggregate(args.mode, run_shards(args.mode, workers, options), options)
+    finally:
+        if local_server:
+            local_server.shutdown()
+
+    print_report(report)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"sharded_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,15 @@ Each record contains complete manufacturing data for one product ID.
 """
 
 import requests
+import api_client
+import items_reader
+import argparse
 import random
 import json
 from datetime import datetime, timedelta
 import time
+from bulk_client import RecordBatcher, post_items_bulk
+from dataset_io import write_dataset
 
 # =============================================================================
 # MAIN CONFIGURATION
@@ -23,6 +28,10 @@ TOTAL_RECORDS = 100
 START_PRODUCT_ID = 1000
 TIME_RANGE_DAYS = 30
 
+# Batch mode (--batch): records go to POST /items/bulk instead of one call each
+BATCH_SIZE = 500  # Records per bulk request
+BATCH_MAX_WAIT_SECONDS = 2.0  # Flush a partial batch after this long
+
 # =============================================================================
 # SENSOR RANGES AND DEVICE SOURCES
 # =============================================================================
@@ -120,12 +129,12 @@ QC_COMMENT_WEIGHTS = [0.5] + [0.05] * 9  # 50% empty, 50% with content
 # UTILITY FUNCTIONS
 # =============================================================================
 
-def generate_realistic_timestamp():
-    """Generate a realistic timestamp within the configured time range"""
-    now = datetime.now()
-    days_back = random.randint(0, TIME_RANGE_DAYS)
-    hours_back = random.randint(0, 23)
-    minutes_back = random.randint(0, 59)
+def generate_realistic_timestamp(rng=random, now=None):
+    """Generate a realistic timestamp within the configured time range before now"""
+    now = now or datetime.now()
+    days_back = rng.randint(0, TIME_RANGE_DAYS)
+    hours_back = rng.randint(0, 23)
+    minutes_back = rng.randint(0, 59)
     
     timestamp = now - timedelta(days=days_back, hours=hours_back, minutes=minutes_back)
     return timestamp.isoformat()
@@ -134,38 +143,41 @@ def generate_realistic_timestamp():
 # DATA GENERATION FUNCTIONS
 # =============================================================================
 
-def generate_comprehensive_record(record_id):
-    """Generate a comprehensive record with ALL sensor data AND QC data for each product ID"""
+def generate_comprehensive_record(record_id, rng=random, now=None):
+    """
+    Generate a comprehensive record with ALL sensor data AND QC data for each product ID.
+    Pass a seeded random.Random as rng and a fixed now for reproducible output.
+    """
     
     # Generate Quality Control decision logic
-    decision = random.choices(QC_DECISIONS, weights=QC_DECISION_WEIGHTS)[0]
+    decision = rng.choices(QC_DECISIONS, weights=QC_DECISION_WEIGHTS)[0]
       # Generate cause of failure and affected output based on decision
     cause_of_failure = []
     affected_output = []
     
     if decision in ['No', 'Goes to Rework']:
-        num_causes = random.randint(1, 3)
-        selected_causes = random.sample(QC_CAUSE_OF_FAILURE_OPTIONS, num_causes)
+        num_causes = rng.randint(1, 3)
+        selected_causes = rng.sample(QC_CAUSE_OF_FAILURE_OPTIONS, num_causes)
         
         # Handle "Other" option for cause of failure
         cause_of_failure = []
         for cause in selected_causes:
             if cause == 'Other':
                 # Replace "Other" with a specific option from the other array
-                other_option = random.choice(QC_CAUSE_OF_FAILURE_OPTIONS_OTHER)
+                other_option = rng.choice(QC_CAUSE_OF_FAILURE_OPTIONS_OTHER)
                 cause_of_failure.append(other_option)
             else:
                 cause_of_failure.append(cause)
         
-        num_outputs = random.randint(1, 2)
-        selected_outputs = random.sample(QC_AFFECTED_OUTPUT_OPTIONS, num_outputs)
+        num_outputs = rng.randint(1, 2)
+        selected_outputs = rng.sample(QC_AFFECTED_OUTPUT_OPTIONS, num_outputs)
         
         # Handle "Other" option for affected output
         affected_output = []
         for output in selected_outputs:
             if output == 'Other':
                 # Replace "Other" with a specific option from the other array
-                other_option = random.choice(QC_AFFECTED_OUTPUT_OPTIONS_OTHER)
+                other_option = rng.choice(QC_AFFECTED_OUTPUT_OPTIONS_OTHER)
                 affected_output.append(other_option)
             else:
                 affected_output.append(output)
@@ -173,29 +185,29 @@ def generate_comprehensive_record(record_id):
     reworkability = 'N/A'  # Default for products that pass initial inspection
     if decision in ['No', 'Goes to Rework']:
         if decision == 'Goes to Rework':
-            reworkability = random.choices(QC_REWORKABILITY_OPTIONS, weights=QC_REWORKABILITY_WEIGHTS_REWORK)[0]
+            reworkability = rng.choices(QC_REWORKABILITY_OPTIONS, weights=QC_REWORKABILITY_WEIGHTS_REWORK)[0]
         else:
-            reworkability = random.choices(QC_REWORKABILITY_OPTIONS, weights=QC_REWORKABILITY_WEIGHTS_NO)[0]
+            reworkability = rng.choices(QC_REWORKABILITY_OPTIONS, weights=QC_REWORKABILITY_WEIGHTS_NO)[0]
       # Reworked logic
     reworked = 'N/A'  # Default for products that pass initial inspection
     rework_outcome = 'N/A'  # Track the actual rework result separately
     
     if decision == 'No' or (decision == 'Goes to Rework' and reworkability == 'Yes'):
         if decision == 'Goes to Rework' and reworkability == 'Yes':
-            reworked = random.choices(QC_REWORKED_OPTIONS, weights=QC_REWORKED_WEIGHTS_HIGH)[0]
+            reworked = rng.choices(QC_REWORKED_OPTIONS, weights=QC_REWORKED_WEIGHTS_HIGH)[0]
         else:
-            reworked = random.choices(QC_REWORKED_OPTIONS, weights=QC_REWORKED_WEIGHTS_LOW)[0]
+            reworked = rng.choices(QC_REWORKED_OPTIONS, weights=QC_REWORKED_WEIGHTS_LOW)[0]
         
         # Store the rework outcome before potentially updating the decision
         rework_outcome = reworked
       # Update decision if reworked is Yes (but keep original rework outcome)
     if reworked == 'Yes':
-        final_outcome = random.choices(['Yes', 'No', 'Goes to Rework'], weights=QC_FINAL_DECISION_WEIGHTS)[0]
+        final_outcome = rng.choices(['Yes', 'No', 'Goes to Rework'], weights=QC_FINAL_DECISION_WEIGHTS)[0]
         decision = final_outcome
     
     # Generate comments and operator
-    comments = random.choices(QC_COMMENTS_OPTIONS, weights=QC_COMMENT_WEIGHTS)[0]
-    selected_operator = random.choice(QC_OPERATORS)
+    comments = rng.choices(QC_COMMENTS_OPTIONS, weights=QC_COMMENT_WEIGHTS)[0]
+    selected_operator = rng.choice(QC_OPERATORS)
     
     # Product ID for tracking
     product_id = START_PRODUCT_ID + record_id
@@ -204,34 +216,34 @@ def generate_comprehensive_record(record_id):
     record = {
         # Silvering sensor data
         "squeegeeSpeed": {
-            "value": round(random.uniform(*SQUEEGEE_SPEED_RANGE), 1),
+            "value": round(rng.uniform(*SQUEEGEE_SPEED_RANGE), 1),
             "unit": "mm/s",
             "deviceSource": DEVICE_SOURCES['squeegeeSpeed']
         },
         "printPressure": {
-            "value": round(random.uniform(*PRINT_PRESSURE_RANGE), 1),
+            "value": round(rng.uniform(*PRINT_PRESSURE_RANGE), 1),
             "unit": "N/m²",
             "deviceSource": DEVICE_SOURCES['printPressure']
         },
         "inkViscosity": {
-            "value": round(random.uniform(*INK_VISCOSITY_RANGE), 1),
+            "value": round(rng.uniform(*INK_VISCOSITY_RANGE), 1),
             "unit": "cP",
             "deviceSource": DEVICE_SOURCES['inkViscosity']
         },
         
         # Streeting sensor data
         "temperature": {
-            "value": round(random.uniform(*TEMPERATURE_RANGE), 1),
+            "value": round(rng.uniform(*TEMPERATURE_RANGE), 1),
             "unit": "°C",
             "deviceSource": DEVICE_SOURCES['temperature']
         },
         "speed": {
-            "value": round(random.uniform(*SPEED_RANGE), 1),
+            "value": round(rng.uniform(*SPEED_RANGE), 1),
             "unit": "mm/s", 
             "deviceSource": DEVICE_SOURCES['speed']
         },
           # Quality Control data
-        "processStation": random.choice(QC_PROCESS_STATIONS),
+        "processStation": rng.choice(QC_PROCESS_STATIONS),
         "productId": str(product_id),
         "decision": decision,
         "reworkability": reworkability,
@@ -241,7 +253,7 @@ def generate_comprehensive_record(record_id):
         "affectedOutput": affected_output,
         "operator": selected_operator,
         "comments": comments,
-        "timestamp": generate_realistic_timestamp(),
+        "timestamp": generate_realistic_timestamp(rng, now),
         "processType": "QualityControl",
         "statusCode": "3100"
     }
@@ -258,7 +270,7 @@ def make_post_request(payload, record_id):
     headers = {"Content-Type": "application/json"}
     
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = api_client.post(url, json=payload, headers=headers)
         
         if response.status_code == 201:
             data = response.json()
@@ -280,9 +292,9 @@ def test_api_connection():
     """Test if the API is accessible"""
     url = f"{API_BASE_URL}/items"
     try:
-        response = requests.get(url)
+        response = api_client.get(url, params={'limit': 0})
         if response.status_code == 200:
-            existing_count = len(response.json())
+            existing_count = items_reader.total_count(response)
             print(f"API connection successful - Found {existing_count} existing records")
             return True
         else:
@@ -331,13 +343,85 @@ def simulate_comprehensive_data(record_count):
     
     return successful_requests, failed_requests
 
-def main():
+def simulate_comprehensive_data_batched(record_count, batch_size=BATCH_SIZE,
+                                        max_wait=BATCH_MAX_WAIT_SECONDS, records=None):
+    """
+    Generate complete manufacturing records and insert them through the bulk endpoint.
+    `records` may supply a pre-built record iterable (e.g. the vectorized generator).
+    """
+    if records is None:
+        records = (generate_comprehensive_record(i) for i in range(record_count))
+    
+    print(f"\nGenerating {record_count} complete manufacturing records in batches of {batch_size}...")
+    
+    totals = {'successful': 0, 'failed': 0, 'batches': 0}
+    started = time.perf_counter()
+    
+    def send_batch(batch):
+        totals['batches'] += 1
+        try:
+            inserted_ids, failed = post_items_bulk(batch, API_BASE_URL)
+            totals['successful'] += len(inserted_ids)
+            totals['failed'] += len(failed)
+            for failure in failed[:3]:
+                print(f"   Record {failure['index']} rejected: {failure['message']}")
+        except requests.exceptions.RequestException as e:
+            totals['failed'] += len(batch)
+            print(f"Batch {totals['batches']} failed: {str(e)}")
+        
+        done = totals['successful'] + totals['failed']
+        print(f"Batch {totals['batches']}: {done}/{record_count} records sent "
+              f"({done / (time.perf_counter() - started):.0f} records/s)")
+    
+    batcher = RecordBatcher(send_batch, batch_size=batch_size, max_wait=max_wait)
+    try:
+        for record in records:
+            batcher.add(record)
+    finally:
+        batcher.flush()
+    
+    successful_requests = totals['successful']
+    failed_requests = totals['failed']
+    
+    print(f"\nComplete Manufacturing Data Summary:")
+    print(f"   Successful: {successful_requests}")
+    print(f"   Failed: {failed_requests}")
+    print(f"   Bulk requests: {totals['batches']}")
+    print(f"   Elapsed: {time.perf_counter() - started:.1f}s")
+    if successful_requests + failed_requests > 0:
+        print(f"   Success Rate: {(successful_requests/(successful_requests+failed_requests)*100):.1f}%")
+    
+    return successful_requests, failed_requests
+
+def export_comprehensive_data(record_count, path, vectorized=False):
+    """Write generated records to a dataset file instead of posting them"""
+    print(f"\nWriting {record_count} complete manufacturing records to {path}...")
+    
+    if vectorized:
+        # Imported here because vectorized_generator imports this module
+        from vectorized_generator import iter_comprehensive_records
+        records = iter_comprehensive_records(record_count)
+    else:
+        records = (generate_comprehensive_record(i) for i in range(record_count))
+    
+    started = time.perf_counter()
+    written = write_dataset(records, path)
+    elapsed = time.perf_counter() - started
+    
+    print(f"Wrote {written} records in {elapsed:.1f}s ({written / elapsed:.0f} records/s)")
+    print(f"Replay with: python replay_dataset.py {path}")
+    return written
+
+def main(total_records=TOTAL_RECORDS, batch=False, batch_size=BATCH_SIZE, vectorized=False):
     """Main function to generate complete manufacturing data"""
     print("Complete Manufacturing Data Simulation")
     print("=" * 60)
     print(f"API URL: {API_BASE_URL}")
-    print(f"Request Interval: {REQUEST_INTERVAL_SECONDS} seconds")
-    print(f"Total Records: {TOTAL_RECORDS}")
+    if batch:
+        print(f"Batch Mode: {batch_size} records per bulk request")
+    else:
+        print(f"Request Interval: {REQUEST_INTERVAL_SECONDS} seconds")
+    print(f"Total Records: {total_records}")
     print(f"Time Range: Last {TIME_RANGE_DAYS} days")
     print("=" * 60)
     print("COMPLETE MANUFACTURING RECORDS:")
@@ -355,9 +439,9 @@ def main():
         print("   3. Run: npm start or node server.js")
         return
     
-    print(f"\nThis will inject {TOTAL_RECORDS} complete manufacturing records:")
+    print(f"\nThis will inject {total_records} complete manufacturing records:")
     print(f"   Each record contains ALL sensor measurements + QC decision")
-    print(f"   Product IDs: {START_PRODUCT_ID} to {START_PRODUCT_ID + TOTAL_RECORDS - 1}")
+    print(f"   Product IDs: {START_PRODUCT_ID} to {START_PRODUCT_ID + total_records - 1}")
     print(f"   Perfect for dashboard with complete manufacturing data per product")
     
     confirm = input("\nContinue? (y/n): ").lower().strip()
@@ -373,7 +457,16 @@ def main():
     total_failed = 0
     
     try:
-        success, failed = simulate_comprehensive_data(TOTAL_RECORDS)
+        if batch:
+            records = None
+            if vectorized:
+                # Imported here because vectorized_generator imports this module
+                from vectorized_generator import iter_comprehensive_records
+                records = iter_comprehensive_records(total_records)
+            success, failed = simulate_comprehensive_data_batched(total_records, batch_size,
+                                                                  records=records)
+        else:
+            success, failed = simulate_comprehensive_data(total_records)
         total_successful += success
         total_failed += failed
         
@@ -389,4 +482,20 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Complete manufacturing data simulation")
+    parser.add_argument("--records", type=int, default=TOTAL_RECORDS,
+                        help="Number of records to generate")
+    parser.add_argument("--batch", action="store_true",
+                        help="Insert through POST /items/bulk instead of one request per record")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="Records per bulk request (batch mode)")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="Generate records with NumPy in bulk (batch or export mode)")
+    parser.add_argument("--export", metavar="PATH",
+                        help="Write records to a .ndjson(.gz)/.parquet file instead of the API")
+    args = parser.parse_args()
+    
+    if args.export:
+        export_comprehensive_data(args.records, args.export, args.vectorized)
+    else:
+        main(args.records, args.batch or args.vectorized, args.batch_size, args.vectorized)
@@ -1,4 +1,6 @@
 import requests
+import api_client
+import items_reader
 import json
 import time
 import random
@@ -21,33 +23,36 @@ METRIC_OPTIONS = ['Voids', 'Conductivity', 'Thickness']
 # Operators for testing
 TEST_OPERATORS = ['AutoScript']
 
-def generate_random_payload():
-    """Generate a random payload for Streeting POST request"""
+def generate_random_payload(rng=random, timestamp=None):
+    """
+    Generate a random payload for Streeting POST request.
+    Pass a seeded random.Random as rng and a fixed timestamp for reproducible output.
+    """
     
     # Generate random metrics (0 to 3 metrics can be selected)
-    num_metrics = random.randint(0, len(METRIC_OPTIONS))
-    selected_metrics = random.sample(METRIC_OPTIONS, num_metrics) if num_metrics > 0 else []
+    num_metrics = rng.randint(0, len(METRIC_OPTIONS))
+    selected_metrics = rng.sample(METRIC_OPTIONS, num_metrics) if num_metrics > 0 else []
     
     payload = {
         "processType": "Streeting",
         "temperature": {
-            "value": round(random.uniform(*TEMPERATURE_RANGE), 1),
+            "value": round(rng.uniform(*TEMPERATURE_RANGE), 1),
             "unit": "°C",
             "deviceSource": "thermometer"
         },
         "speed": {
-            "value": round(random.uniform(*SPEED_RANGE), 1),
+            "value": round(rng.uniform(*SPEED_RANGE), 1),
             "unit": "mm/s", 
             "deviceSource": "encoder"
         },
-        "priority": random.choice(PRIORITY_OPTIONS),
+        "priority": rng.choice(PRIORITY_OPTIONS),
         "targetMetricAffected": selected_metrics,
-        "operator": random.choice(TEST_OPERATORS),
+        "operator": rng.choice(TEST_OPERATORS),
         "statusCode": "2100",  # Streeting manual form (from StreetingDashboard.js)
         "reworked": "No",
         "decision": "Yes",
         "causeOfFailure": [],
-        "timestamp": datetime.now().isoformat()
+        "timestamp": (timestamp or datetime.now()).isoformat()
     }
     
     return payload
@@ -60,7 +65,7 @@ def make_post_request(payload):
     }
     
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = api_client.post(url, json=payload, headers=headers)
         
         if response.status_code == 201:
             data = response.json()
@@ -84,9 +89,9 @@ def test_api_connection():
     """Test if the API is accessible"""
     url = f"{API_BASE_URL}/items"
     try:
-        response = requests.get(url)
+        response = api_client.get(url, params={'limit': 0})
         if response.status_code == 200:
-            print(f"✅ API connection successful - Found {len(response.json())} existing records")
+            print(f"✅ API connection successful - Found {items_reader.total_count(response)} existing records")
             return True
         else:
             print(f"⚠️  API responded with status {response.status_code}")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Columnar SenseCAP Telemetry
+
+Parses a list_telemetry_data response (list[0] = channel info, list[1] =
+readings per channel) once into compact per-channel arrays, sorted oldest
+first:
+
+    times   array('q')  epoch milliseconds
+    values  array('d')  float readings
+
+WiFi scan payloads (measurement 5001) are lists of networks rather than
+numbers, so they are kept apart in `scans` with their own time array.
+Downstream code (backfill, bridge, aggregation) works on these arrays and
+never touches the nested per-reading lists of the raw response.
+
+Usage:
+    from telemetry_columns import parse_telemetry_columns
+    columns = parse_telemetry_columns(telemetry_data)
+    for series in columns.series.values():
+        print(series.measurement_id, len(series), series.values[-1])
+"""
+
+from array import array
+from bisect import bisect_right
+
+from time_utils import to_epoch_ms
+
+WIFI_SCAN_MEASUREMENT_ID = "5001"
+
+
+class ChannelSeries:
+    """Readings of one (channel, measurement_id), oldest first"""
+
+    __slots__ = ('channel', 'measurement_id', 'times', 'values')
+
+    def __init__(self, channel, measurement_id, times=None, values=None):
+        self.channel = channel
+        self.measurement_id = measurement_id
+        self.times = times if times is not None else array('q')
+        self.values = values if values is not None else array('d')
+
+    def __len__(self):
+        return len(self.times)
+
+    def since(self, time_ms):
+        """Index of the first reading newer than time_ms"""
+        return bisect_right(self.times, time_ms)
+
+
+class WifiScanSeries:
+    """WiFi scan payloads of one channel, oldest first"""
+
+    __slots__ = ('channel', 'measurement_id', 'times', 'scans')
+
+    def __init__(self, channel, measurement_id):
+        self.channel = channel
+        self.measurement_id = measurement_id
+        self.times = array('q')
+        self.scans = []
+
+    def __len__(self):
+        return len(self.times)
+
+    def since(self, time_ms):
+        """Index of the first scan newer than time_ms"""
+        return bisect_right(self.times, time_ms)
+
+
+class TelemetryColumns:
+    """Parsed telemetry: numeric `series` and WiFi `scans`, keyed by (channel, measurement_id)"""
+
+    __slots__ = ('series', 'scans')
+
+    def __init__(self):
+        self.series = {}
+        self.scans = {}
+
+    def __len__(self):
+        return sum(len(s) for s in self.series.values()) + sum(len(s) for s in self.scans.values())
+
+    def counts(self):
+        """Readings per (channel, measurement_id), numeric and WiFi alike"""
+        counts = {key: len(series) for key, series in self.series.items()}
+        counts.update((key, len(series)) for key, series in self.scans.items())
+        return counts
+
+    def oldest(self, key):
+        """Time of the oldest reading for a key"""
+        series = self.series[key] if key in self.series else self.scans[key]
+        return series.times[0]
+
+
+def parse_telemetry_columns(telemetry_data):
+    """
+    Parse a list_telemetry_data response into per-channel arrays
+    Readings with unparseable values or times are skipped
+    Returns: TelemetryColumns
+    """
+    columns = TelemetryColumns()
+    data_list = telemetry_data.get('list', []) if isinstance(telemetry_data, dict) else []
+    if len(data_list) < 2:
+        return columns
+
+    for info, readings in zip(data_list[0], data_list[1]):
+        if not isinstance(info, list) or len(info) < 2 or not isinstance(readings, list):
+            continue
+        channel, measurement_id = str(info[0]), str(info[1])
+        key = (channel, measurement_id)
+        rows = [reading for reading in readings if isinstance(reading, list) and len(reading) >= 2]
+
+        if measurement_id == WIFI_SCAN_MEASUREMENT_ID:
+            parsed = []
+            for value, time, *_ in rows:
+                try:
+                    parsed.append((to_epoch_ms(time), value))
+                except (TypeError, ValueError):
+                    continue
+            parsed.sort(key=lambda row: row[0])
+            series = columns.scans[key] = WifiScanSeries(channel, measurement_id)
+            series.times.extend(time for time, _ in parsed)
+            series.scans.extend(value for _, value in parsed)
+            continue
+
+        times = array('q')
+        values = array('d')
+        for value, time, *_ in rows:
+            # Parse both before appending either, so times and values stay aligned
+            try:
+                time_ms = to_epoch_ms(time)
+                number = float(value)
+            except (TypeError, ValueError):
+                continue
+            times.append(time_ms)
+            values.append(number)
+
+        # Responses list newest first; store oldest first
+        if len(times) > 1 and times[0] > times[-1]:
+            times.reverse()
+            values.reverse()
+        if any(times[i] > times[i + 1] for i in range(len(times) - 1)):
+            order = sorted(range(len(times)), key=times.__getitem__)
+            times = array('q', (times[i] for i in order))
+            values = array('d', (values[i] for i in order))
+
+        columns.series[key] = ChannelSeries(channel, measurement_id, times, values)
+
+    return columns
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Time Conversion Helpers
+
+Shared by the scripts that exchange times with the backend or the SenseCAP
+API: epoch milliseconds in, and the JSON form of a JS Date
+("2025-01-01T12:00:00.000Z") out.
+"""
+
+from datetime import datetime, timezone
+
+
+def to_epoch_ms(value):
+    """
+    Epoch ms from an ISO string ("Z" allowed), datetime or epoch ms;
+    naive strings and datetimes are local time, as in a JS Date
+    Raises: ValueError for a malformed string, TypeError for other types
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if not isinstance(value, datetime):
+        raise TypeError(f"Unsupported time value: {value!r}")
+    return int(value.timestamp() * 1000)
+
+
+def from_epoch_ms(ms):
+    """Format epoch ms as the JSON form of a JS Date (UTC, millisecond precision)"""
+    ms = int(ms)
+    return datetime.fromtimestamp(ms // 1000, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.') + f"{ms % 1000:03d}Z"
@@ -1,6 +1,9 @@
+import argparse
 import requests
+import api_client
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # TTN API Configuration
@@ -14,6 +17,30 @@ TTN_HEADERS = {
     "Accept": "application/json"
 }
 
+# Endpoint probing configuration
+PROBE_TIMEOUT_SECONDS = 5  # Per-request timeout for endpoint probes (no retries)
+PROBE_WORKERS = 8  # Concurrent probes
+
+# Endpoints probed by the diagnostics
+TEST_ENDPOINTS = [
+    "/auth_info",
+    "/applications",
+    "/users",
+    "/users/me",
+    "/organizations",
+    "/gateways"
+]
+APPLICATION_ENDPOINTS = [
+    "/applications",
+    "/users/applications",
+    "/api/v3/applications"
+]
+STORAGE_ENDPOINTS = [
+    "/applications",
+    "/events",
+    "/storage",
+]
+
 def handle_ttn_response(response, endpoint_name):
     """Handle TTN API response format"""
     print(f"[{datetime.now()}] {endpoint_name} - Status Code: {response.status_code}")
@@ -46,7 +73,7 @@ def get_user_info():
     try:
         url = f"{TTN_CONSOLE_URL}/auth_info"
         
-        response = requests.get(url, headers=TTN_HEADERS)
+        response = api_client.get(url, headers=TTN_HEADERS)
         
         user_info = handle_ttn_response(response, "GET User Info")
         
@@ -61,135 +88,166 @@ def get_user_info():
         print(f"Request failed for GET User Info: {e}")
         return None
 
-def get_ttn_applications():
-    """Get all TTN applications using different API endpoints"""
-    endpoints_to_try = [
-        f"{TTN_CONSOLE_URL}/applications",
-        f"{TTN_CONSOLE_URL}/users/applications", 
-        f"{TTN_CONSOLE_URL}/api/v3/applications"
-    ]
-    
-    for url in endpoints_to_try:
+def probe_endpoint(url, session=None, timeout=PROBE_TIMEOUT_SECONDS):
+    """
+    GET one URL and describe the outcome
+    Returns: dict with url, status (None on network errors), ok, latency_ms, bytes,
+             error, and the decoded JSON body as data (None if not JSON)
+    """
+    session = session or api_client.get_session()
+    started = time.perf_counter()
+    report = {'url': url, 'status': None, 'ok': False, 'latency_ms': None, 'bytes': 0, 'error': None, 'data': None}
+    try:
+        response = session.get(url, headers=TTN_HEADERS, timeout=timeout)
+        report['status'] = response.status_code
+        report['ok'] = response.status_code == 200
+        report['bytes'] = len(response.content)
         try:
-            print(f"Trying endpoint: {url}")
-            response = requests.get(url, headers=TTN_HEADERS)
-            
-            if response.status_code == 200:
-                apps_data = response.json()
-                print(f"SUCCESS: Found applications at {url}")
-                
-                if 'applications' in apps_data:
-                    applications = apps_data['applications']
-                    print(f"\n=== TTN Applications ===")
-                    print(f"Found {len(applications)} application(s):")
-                    for i, app in enumerate(applications, 1):
-                        app_id = app.get('ids', {}).get('application_id', 'N/A')
-                        app_name = app.get('name', 'N/A')
-                        created_at = app.get('created_at', 'N/A')
-                        print(f"  {i}. {app_name}")
-                        print(f"     ID: {app_id}")
-                        print(f"     Created: {created_at}")
-                        print()
-                    return applications
-                else:
-                    print("Response doesn't contain 'applications' field")
-                    print(json.dumps(apps_data, indent=2))
-                    return apps_data
-            else:
-                print(f"Failed: Status {response.status_code} - {response.text}")
-                
-        except requests.exceptions.RequestException as e:
-            print(f"Request failed for {url}: {e}")
-    
+            report['data'] = response.json()
+        except ValueError:
+            pass
+        if not report['ok']:
+            report['error'] = response.text[:200]
+    except requests.exceptions.RequestException as e:
+        report['error'] = f"{type(e).__name__}: {e}"
+    report['latency_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return report
+
+def probe_endpoints(urls, timeout=PROBE_TIMEOUT_SECONDS, workers=PROBE_WORKERS):
+    """
+    Probe URLs concurrently without retries, so one unreachable host costs at most `timeout`
+    Returns: list of probe_endpoint() reports in the order of urls
+    """
+    session = api_client.create_session(pool_size=workers, timeout=timeout, max_retries=0)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda url: probe_endpoint(url, session, timeout), urls))
+    finally:
+        session.close()
+
+def describe_body(data):
+    """Short description of a JSON body for the probe report"""
+    if isinstance(data, dict):
+        return f"keys: {', '.join(list(data.keys())[:6])}"
+    if isinstance(data, list):
+        return f"array of {len(data)}"
+    return ""
+
+def print_probe_report(title, reports):
+    """Print probe reports as one table"""
+    print(f"\n=== {title} ===")
+    print(f"{'':2s}{'Endpoint':45s} {'Status':>6s} {'Latency':>10s} {'Bytes':>8s}  Details")
+    print("-" * 100)
+    for report in reports:
+        endpoint = report['url'].replace(TTN_CONSOLE_URL, '') or '/'
+        mark = "✓" if report['ok'] else "✗"
+        status = str(report['status']) if report['status'] is not None else "-"
+        details = describe_body(report['data']) if report['ok'] else (report['error'] or "")
+        print(f"{mark} {endpoint:45s} {status:>6s} {report['latency_ms']:>8.1f}ms {report['bytes']:>8d}  "
+              f"{details.splitlines()[0][:60] if details else ''}")
+
+def find_applications(reports):
+    """
+    Pick the applications list from probe reports of the application endpoints
+    Returns: list of applications, the raw body of the first successful endpoint, or None
+    """
+    for report in reports:
+        if report['ok'] and isinstance(report['data'], dict):
+            return report['data'].get('applications', report['data'])
     return None
 
+def print_applications(applications):
+    """Print the application list"""
+    print(f"\n=== TTN Applications ===")
+    if not isinstance(applications, list):
+        print("Response doesn't contain 'applications' field")
+        print(json.dumps(applications, indent=2))
+        return
+    print(f"Found {len(applications)} application(s):")
+    for i, app in enumerate(applications, 1):
+        app_id = app.get('ids', {}).get('application_id', 'N/A')
+        app_name = app.get('name', 'N/A')
+        created_at = app.get('created_at', 'N/A')
+        print(f"  {i}. {app_name}")
+        print(f"     ID: {app_id}")
+        print(f"     Created: {created_at}")
+        print()
+
+def get_ttn_applications():
+    """Get all TTN applications, trying the candidate endpoints concurrently"""
+    reports = probe_endpoints([f"{TTN_CONSOLE_URL}{endpoint}" for endpoint in APPLICATION_ENDPOINTS])
+    print_probe_report("Application Endpoints", reports)
+    applications = find_applications(reports)
+    if applications is not None:
+        print_applications(applications)
+    return applications
+
 def list_available_endpoints():
     """Try to discover available API endpoints"""
-    print("\n=== Testing TTN API Endpoints ===")
-    
-    test_endpoints = [
-        "/auth_info",
-        "/applications",
-        "/users",
-        "/users/me",
-        "/organizations",
-        "/gateways"
-    ]
-    
-    for endpoint in test_endpoints:
-        try:
-            url = f"{TTN_CONSOLE_URL}{endpoint}"
-            response = requests.get(url, headers=TTN_HEADERS)
-            
-            status_text = "✓" if response.status_code == 200 else "✗"
-            print(f"{status_text} {endpoint} - Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    if isinstance(data, dict):
-                        print(f"   Keys: {list(data.keys())}")
-                    elif isinstance(data, list):
-                        print(f"   Array with {len(data)} items")
-                except:
-                    print(f"   Response length: {len(response.text)} chars")
-            
-        except requests.exceptions.RequestException as e:
-            print(f"✗ {endpoint} - Error: {e}")
+    reports = probe_endpoints([f"{TTN_CONSOLE_URL}{endpoint}" for endpoint in TEST_ENDPOINTS])
+    print_probe_report("Testing TTN API Endpoints", reports)
+    return reports
 
 def test_webhook_data():
     """Test if we can get data from webhook/storage endpoints"""
-    print("\n=== Testing Storage Endpoints ===")
+    reports = probe_endpoints([f"{TTN_CONSOLE_URL}{endpoint}" for endpoint in STORAGE_ENDPOINTS])
+    print_probe_report("Testing Storage Endpoints", reports)
+    for report in reports:
+        if report['ok'] and report['data'] is not None:
+            print(f"\n{report['url']}:\n{json.dumps(report['data'], indent=2)[:500]}...")
+    return reports
+
+def run_diagnostics(timeout=PROBE_TIMEOUT_SECONDS):
+    """
+    Probe every diagnostic endpoint in one concurrent round
+    Returns: dict of section -> list of reports (without response bodies)
+    """
+    sections = {
+        'auth': ["/auth_info"],
+        'endpoints': TEST_ENDPOINTS,
+        'applications': APPLICATION_ENDPOINTS,
+        'storage': STORAGE_ENDPOINTS,
+    }
+    urls = sorted({f"{TTN_CONSOLE_URL}{endpoint}" for endpoints in sections.values() for endpoint in endpoints})
+    reports = dict(zip(urls, probe_endpoints(urls, timeout=timeout, workers=len(urls))))
+    return {section: [reports[f"{TTN_CONSOLE_URL}{endpoint}"] for endpoint in endpoints]
+            for section, endpoints in sections.items()}
+
+def main(timeout=PROBE_TIMEOUT_SECONDS, as_json=False):
+    """Main function to run TTN API diagnostics"""
+    if not as_json:
+        print("=== The Things Network (TTN) API Client ===")
+        print(f"Using API Key: {TTN_API_KEY[:15]}...")
+        print(f"Base URL: {TTN_CONSOLE_URL}")
+        print(f"Probing all endpoints concurrently (timeout {timeout}s)...")
     
-    # Try different storage endpoints
-    storage_endpoints = [
-        "/applications",
-        "/events",
-        "/storage",
-    ]
+    started = time.perf_counter()
+    results = run_diagnostics(timeout)
+    elapsed = time.perf_counter() - started
     
-    for endpoint in storage_endpoints:
-        try:
-            url = f"{TTN_CONSOLE_URL}{endpoint}"
-            response = requests.get(url, headers=TTN_HEADERS)
-            
-            print(f"Endpoint: {endpoint}")
-            print(f"Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                try:
-                    data = response.json()
-                    print(f"Response: {json.dumps(data, indent=2)[:500]}...")
-                except:
-                    print(f"Response text: {response.text[:200]}...")
-            else:
-                print(f"Error: {response.text}")
-            print("-" * 50)
-            
-        except Exception as e:
-            print(f"Error testing {endpoint}: {e}")
-
-def main():
-    """Main function to run TTN API requests"""
-    print("=== The Things Network (TTN) API Client ===")
-    print(f"Using API Key: {TTN_API_KEY[:15]}...")
-    print(f"Base URL: {TTN_CONSOLE_URL}")
+    if as_json:
+        report = {section: [{key: value for key, value in r.items() if key != 'data'} for r in reports]
+                  for section, reports in results.items()}
+        print(json.dumps({'base_url': TTN_CONSOLE_URL, 'elapsed_s': round(elapsed, 3), 'sections': report}, indent=2))
+        return
     
     # Test user authentication first
-    print("\n1. Testing API key authentication...")
-    user_info = get_user_info()
+    print_probe_report("1. API Key Authentication", results['auth'])
+    if results['auth'][0]['ok']:
+        print(json.dumps(results['auth'][0]['data'], indent=2))
     
     # List available endpoints
-    print("\n2. Testing available endpoints...")
-    list_available_endpoints()
+    print_probe_report("2. Available Endpoints", results['endpoints'])
     
     # Try to get applications
-    print("\n3. Fetching TTN applications...")
-    applications = get_ttn_applications()
+    print_probe_report("3. Application Endpoints", results['applications'])
+    applications = find_applications(results['applications'])
+    if applications is not None:
+        print_applications(applications)
+    else:
+        print_probe_report("4. Storage Endpoints", results['storage'])
     
-    if not applications:
-        print("\n4. Testing storage endpoints...")
-        test_webhook_data()
+    print(f"\nDiagnostics finished in {elapsed:.2f}s")
     
     print("\n=== API Key Troubleshooting ===")
     print("If you're getting 404 errors, try these steps:")
@@ -199,4 +257,8 @@ def main():
     print("4. Try creating a new API key with 'Read application traffic' permissions")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="TTN API connectivity diagnostics")
+    parser.add_argument("--timeout", type=float, default=PROBE_TIMEOUT_SECONDS, help="Per-probe timeout in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the structured report as JSON")
+    args = parser.parse_args()
+    main(timeout=args.timeout, as_json=args.json)
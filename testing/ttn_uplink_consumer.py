@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+TTN Uplink Consumer
+
+Push-based alternative to polling ttn_data_api.py: receives application
+uplinks from The Things Network, decodes them and forwards the readings to
+/api/items in batches.
+
+Sources:
+    webhook   Local HTTP receiver for a TTN webhook (POST <path>, default)
+    mqtt      Subscribes to v3/<app>@ttn/devices/+/up on the TTN MQTT
+              server or any local broker (requires paho-mqtt)
+
+Payloads are taken from uplink_message.decoded_payload (the application's
+payload formatter) when present, otherwise frm_payload is decoded as
+Cayenne LPP. Decoded fields are mapped to single-sensor Items via
+FIELD_MAPPINGS, e.g. temperature -> Streeting temperature, status code 2240.
+
+A forwarder thread batches the readings (flushing after FORWARD_BATCH_SIZE
+readings or FORWARD_MAX_WAIT_SECONDS) and reports ingest latency from the
+uplink's received_at to the bulk POST completing. Push sources don't
+redeliver, so a batch whose POST fails goes to a local SensorSpool and is
+retried with backoff; every reading carries a client-generated _id from the
+start, so a retry of a batch that did arrive is rejected as a duplicate.
+Messages that are not TTN uplink objects are answered with 400.
+
+Usage:
+    python ttn_uplink_consumer.py                              # webhook on :8090/ttn/uplink
+    python ttn_uplink_consumer.py --mqtt --app-id my-app       # TTN MQTT (API key from ttn_data_api)
+    python ttn_uplink_consumer.py --simulate 2000 --local      # synthetic uplinks, local stand-in API
+"""
+
+import argparse
+import base64
+import json
+import queue
+import random
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import api_client
+from bulk_client import RecordBatcher, post_items_bulk
+from latency_stats import summarize
+from sensor_spool import SensorSpool, new_object_id
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+WEBHOOK_HOST = "127.0.0.1"
+WEBHOOK_PORT = 8090
+WEBHOOK_PATH = "/ttn/uplink"
+MQTT_HOST = "nam1.cloud.thethings.network"
+MQTT_PORT = 8883  # TLS; local brokers usually listen on 1883 without TLS
+FORWARD_BATCH_SIZE = 100  # Readings per bulk request
+FORWARD_MAX_WAIT_SECONDS = 0.5  # Flush a partial batch after this long, keeps latency sub-second
+FORWARD_QUEUE_SIZE = 10000  # Decoded readings waiting for the forwarder
+REPORT_INTERVAL_SECONDS = 5  # Time between progress lines
+SPOOL_PATH = "ttn_spool.sqlite"  # Failed batches wait here for redelivery
+SPOOL_DRAIN_TIMEOUT_SECONDS = 10  # On shutdown, time allowed to empty the spool
+
+# ===== FIELD MAPPINGS =====
+# Decoded payload field -> Item fields (sensor status codes from frontend/src/utils/statusCodes.js)
+FIELD_MAPPINGS = {
+    'temperature': {'processType': 'Streeting', 'field': 'temperature', 'statusCode': 2240,
+                    'unit': '°C', 'deviceSource': 'thermometer'},
+    'speed': {'processType': 'Streeting', 'field': 'speed', 'statusCode': 2250,
+              'unit': 'mm/s', 'deviceSource': 'encoder'},
+    'squeegeeSpeed': {'processType': 'Silvering', 'field': 'squeegeeSpeed', 'statusCode': 1210,
+                      'unit': 'mm/s', 'deviceSource': 'clicker'},
+    'printPressure': {'processType': 'Silvering', 'field': 'printPressure', 'statusCode': 1220,
+                      'unit': 'N/m²', 'deviceSource': 'load_cell'},
+    'inkViscosity': {'processType': 'Silvering', 'field': 'inkViscosity', 'statusCode': 1230,
+                     'unit': 'cP', 'deviceSource': 'viscometer'},
+}
+# Common payload formatter names for the same quantities
+FIELD_ALIASES = {
+    'temp': 'temperature',
+    'air_temperature': 'temperature',
+    'temperature_1': 'temperature',
+    'TempC_SHT': 'temperature',
+}
+
+# Cayenne LPP data types: type byte -> (name, size, signed, divisor)
+LPP_TYPES = {
+    0x00: ('digital_input', 1, False, 1),
+    0x01: ('digital_output', 1, False, 1),
+    0x02: ('analog_input', 2, True, 100),
+    0x03: ('analog_output', 2, True, 100),
+    0x65: ('illuminance', 2, False, 1),
+    0x66: ('presence', 1, False, 1),
+    0x67: ('temperature', 2, True, 10),
+    0x68: ('humidity', 1, False, 2),
+    0x73: ('barometer', 2, False, 10),
+}
+
+
+# =============================================================================
+# DECODING
+# =============================================================================
+
+def decode_cayenne_lpp(data):
+    """
+    Decode a Cayenne LPP frame
+    Returns: {name: value}; channels after the first of a type get a _<channel> suffix
+    Raises: ValueError on unknown types or truncated frames
+    """
+    fields = {}
+    i = 0
+    while i < len(data):
+        if i + 2 > len(data):
+            raise ValueError("Truncated LPP frame")
+        channel, type_byte = data[i], data[i + 1]
+        if type_byte not in LPP_TYPES:
+            raise ValueError(f"Unsupported LPP type 0x{type_byte:02x}")
+        name, size, signed, divisor = LPP_TYPES[type_byte]
+        raw = data[i + 2:i + 2 + size]
+        if len(raw) < size:
+            raise ValueError("Truncated LPP frame")
+        value = int.from_bytes(raw, "big", signed=signed) / divisor
+        fields[name if name not in fields else f"{name}_{channel}"] = value
+        i += 2 + size
+    return fields
+
+
+def parse_time_ms(value):
+    """Epoch ms from a TTN RFC 3339 time (nanosecond fractions allowed), or None"""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        base, _, fraction = value.rstrip('Z').partition('.')
+        parsed = datetime.fromisoformat(base).replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp() * 1000) + int((fraction[:3] or '0').ljust(3, '0'))
+    except ValueError:
+        return None
+
+
+def decode_uplink(message):
+    """
+    Extract device, time and decoded fields from a TTN uplink message
+    Returns: (device_id, received_at_ms or None, {field: value})
+    Raises: ValueError when the message is not a JSON object
+    """
+    if not isinstance(message, dict):
+        raise ValueError("Uplink message must be a JSON object")
+    device_ids = message.get('end_device_ids')
+    device_id = str(device_ids.get('device_id') or 'unknown') if isinstance(device_ids, dict) else 'unknown'
+    uplink = message.get('uplink_message')
+    uplink = uplink if isinstance(uplink, dict) else {}
+    received_at = parse_time_ms(uplink.get('received_at') or message.get('received_at'))
+
+    fields = uplink.get('decoded_payload')
+    fields = fields if isinstance(fields, dict) else None
+    if not fields and uplink.get('frm_payload'):
+        try:
+            fields = decode_cayenne_lpp(base64.b64decode(uplink['frm_payload']))
+        except (ValueError, TypeError) as e:
+            print(f"⚠️  {device_id}: undecodable frm_payload ({str(e)})")
+            fields = {}
+    return device_id, received_at, fields or {}
+
+
+def uplink_to_items(message):
+    """
+    Map a TTN uplink to /api/items payloads, one per mapped numeric field
+    Returns: (items, received_at_ms or None)
+    Raises: ValueError when the message is not a JSON object
+    """
+    device_id, received_at, fields = decode_uplink(message)
+    timestamp = datetime.fromtimestamp((received_at or time.time() * 1000) / 1000, tz=timezone.utc).isoformat()
+
+    items = []
+    for name, value in fields.items():
+        mapping = FIELD_MAPPINGS.get(FIELD_ALIASES.get(name, name))
+        if mapping is None or isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        items.append({
+            '_id': new_object_id(),  # Fixed before the first POST, so retries can't duplicate
+            'processType': mapping['processType'],
+            'statusCode': mapping['statusCode'],
+            mapping['field']: {'value': value, 'unit': mapping['unit'], 'deviceSource': mapping['deviceSource']},
+            'operator': device_id,
+            'timestamp': timestamp,
+        })
+    return items, received_at
+
+
+# =============================================================================
+# FORWARDING
+# =============================================================================
+
+class UplinkForwarder:
+    """Queue decoded uplinks and forward them to /api/items/bulk from one thread"""
+
+    def __init__(self, api_base_url=API_BASE_URL, batch_size=FORWARD_BATCH_SIZE,
+                 max_wait=FORWARD_MAX_WAIT_SECONDS, queue_size=FORWARD_QUEUE_SIZE, spool_path=SPOOL_PATH):
+        self.api_base_url = api_base_url
+        # Without a spool, readings of a failed POST are counted as failed and lost
+        self.spool = SensorSpool(spool_path, api_base_url) if spool_path else None
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.batcher = RecordBatcher(self.send_batch, batch_size=batch_size, max_wait=max_wait)
+        self.max_wait = max_wait
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.lock = threading.Lock()
+        self.stats = {'uplinks': 0, 'invalid': 0, 'dropped': 0, 'readings': 0, 'forwarded': 0, 'rejected': 0,
+                      'spooled': 0, 'failed': 0}
+        self.latencies = []
+
+    def start(self):
+        if self.spool is not None:
+            self.spool.start()
+        self.thread.start()
+        return self
+
+    def submit(self, message):
+        """
+        Decode an uplink and queue its readings (called from receiver threads)
+        Raises: ValueError when the message is not a JSON object
+        """
+        try:
+            items, received_at = uplink_to_items(message)
+        except ValueError:
+            with self.lock:
+                self.stats['invalid'] += 1
+            raise
+        arrived = time.time() * 1000
+        with self.lock:
+            self.stats['uplinks'] += 1
+            self.stats['readings'] += len(items)
+        for item in items:
+            try:
+                self.queue.put_nowait((item, received_at or arrived))
+            except queue.Full:
+                with self.lock:
+                    self.stats['dropped'] += 1
+
+    def run(self):
+        """Forwarder loop: feed the batcher and flush aged batches"""
+        while not (self.stop_event.is_set() and self.queue.empty()):
+            try:
+                self.batcher.add(self.queue.get(timeout=self.max_wait / 4))
+            except queue.Empty:
+                self.batcher.poll()
+        self.batcher.flush()
+
+    def send_batch(self, batch):
+        """Flush callback: POST one batch and record its latencies"""
+        try:
+            inserted_ids, failed = post_items_bulk([item for item, _ in batch], self.api_base_url)
+        except requests.exceptions.RequestException as e:
+            if self.spool is None:
+                print(f"❌ Forwarding {len(batch)} readings failed: {str(e)}")
+                with self.lock:
+                    self.stats['failed'] += len(batch)
+                return
+            print(f"📦 Forwarding {len(batch)} readings failed, spooled for retry: {type(e).__name__}")
+            for item, _ in batch:
+                self.spool.append(item)
+            with self.lock:
+                self.stats['spooled'] += len(batch)
+            return
+        done = time.time() * 1000
+        with self.lock:
+            self.stats['forwarded'] += len(inserted_ids)
+            self.stats['rejected'] += len(failed)
+            self.latencies.extend(max(0.0, (done - received_at) / 1000) for _, received_at in batch)
+
+    def stop(self):
+        """Flush everything queued, give the spool time to drain and stop"""
+        self.stop_event.set()
+        self.thread.join()
+        if self.spool is not None:
+            self.spool.stop(timeout=SPOOL_DRAIN_TIMEOUT_SECONDS)
+            if len(self.spool):
+                print(f"📦 {len(self.spool)} reading(s) left in {self.spool.path} for the next run")
+            self.spool.close()
+
+    def snapshot(self):
+        """Copy of the counters plus a latency summary"""
+        with self.lock:
+            return dict(self.stats, latency=summarize(self.latencies))
+
+
+# =============================================================================
+# SOURCES
+# =============================================================================
+
+def start_webhook_receiver(forwarder, host=WEBHOOK_HOST, port=WEBHOOK_PORT, path=WEBHOOK_PATH):
+    """
+    Serve the TTN webhook endpoint on a background thread
+    Returns: ThreadingHTTPServer (call shutdown() to stop)
+    """
+    class WebhookHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def reply(self, status):
+            self.send_response(status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_POST(self):
+            if self.path.split('?')[0] != path:
+                return self.reply(404)
+            try:
+                message = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+                # Only decoding happens before the ack; forwarding is asynchronous
+                forwarder.submit(message)
+            except ValueError:  # Includes json.JSONDecodeError
+                return self.reply(400)
+            self.reply(202)
+
+    server = ThreadingHTTPServer((host, port), WebhookHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_mqtt_consumer(forwarder, app_id, api_key, host=MQTT_HOST, port=MQTT_PORT, tls=True):
+    """
+    Subscribe to a TTN application's uplinks over MQTT (needs paho-mqtt)
+    Returns: the running paho client (call loop_stop()/disconnect() to stop)
+    """
+    try:
+        import paho.mqtt.client as mqtt
+    except ImportError:
+        raise SystemExit("❌ MQTT mode needs paho-mqtt: pip install paho-mqtt")
+
+    try:
+        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+    except AttributeError:  # paho-mqtt < 2.0
+        client = mqtt.Client()
+    if app_id:
+        client.username_pw_set(f"{app_id}@ttn", api_key)
+    if tls:
+        client.tls_set()
+
+    topic = f"v3/{app_id}@ttn/devices/+/up" if app_id else "v3/+/devices/+/up"
+
+    def on_connect(client, userdata, *args):
+        print(f"✅ Connected to {host}:{port}, subscribing to {topic}")
+        client.subscribe(topic)
+
+    def on_message(client, userdata, msg):
+        try:
+            forwarder.submit(json.loads(msg.payload))
+        except ValueError:  # Includes json.JSONDecodeError
+            print(f"⚠️  Ignoring message on {msg.topic} that is not a JSON uplink object")
+
+    client.on_connect = on_connect
+    client.on_message = on_message
+    client.connect(host, port)
+    client.loop_start()
+    return client
+
+
+def build_simulated_uplink(rng, device_id):
+    """A TTN-shaped uplink with either a decoded payload or a Cayenne LPP frm_payload"""
+    now = datetime.now(timezone.utc)
+    uplink = {'received_at': now.isoformat().replace('+00:00', 'Z'), 'f_port': 1}
+    temperature = round(rng.uniform(18.0, 45.0), 1)
+    if rng.random() < 0.5:
+        uplink['decoded_payload'] = {'temperature': temperature, 'speed': round(rng.uniform(25.0, 55.0), 1)}
+    else:
+        frame = struct.pack('>BBh', 1, 0x67, int(round(temperature * 10)))
+        uplink['frm_payload'] = base64.b64encode(frame).decode('ascii')
+    return {
+        'end_device_ids': {'device_id': device_id, 'application_ids': {'application_id': 'simulated'}},
+        'received_at': uplink['received_at'],
+        'uplink_message': uplink,
+    }
+
+
+def simulate_uplinks(webhook_url, count, rate, devices=20, seed=None):
+    """POST synthetic uplinks to a webhook receiver at `rate` uplinks/s"""
+    rng = random.Random(seed)
+    session = api_client.create_session(pool_size=1, max_retries=0)
+    started = time.perf_counter()
+    for i in range(count):
+        delay = started + i / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        session.post(webhook_url, json=build_simulated_uplink(rng, f"sim-node-{i % devices:03d}"))
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def print_stats(stats):
+    latency = stats['latency']
+    p95 = f"{latency['p95_ms']:.0f}" if latency['p95_ms'] is not None else "n/a"
+    p50 = f"{latency['p50_ms']:.0f}" if latency['p50_ms'] is not None else "n/a"
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] 📡 {stats['uplinks']} uplinks | "
+          f"✅ {stats['forwarded']} forwarded | ⚠️  {stats['rejected']} rejected | "
+          f"📦 {stats['spooled']} spooled | ❌ {stats['failed']} failed, {stats['dropped']} dropped, "
+          f"{stats['invalid']} invalid | latency p50 {p50} ms, p95 {p95} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forward TTN uplinks to /api/items")
+    parser.add_argument("--api-url", default=API_BASE_URL)
+    parser.add_argument("--local", action="store_true", help="Forward to an in-process local_items_server")
+    parser.add_argument("--mqtt", action="store_true", help="Consume over MQTT instead of the webhook receiver")
+    parser.add_argument("--mqtt-host", default=MQTT_HOST)
+    parser.add_argument("--mqtt-port", type=int, default=MQTT_PORT)
+    parser.add_argument("--no-tls", action="store_true", help="Plain MQTT, e.g. for a local broker")
+    parser.add_argument("--app-id", help="TTN application ID (MQTT username <app-id>@ttn)")
+    parser.add_argument("--webhook-port", type=int, default=WEBHOOK_PORT)
+    parser.add_argument("--simulate", type=int, metavar="N", help="Send N synthetic uplinks to the webhook and exit")
+    parser.add_argument("--rate", type=float, default=100.0, help="Simulated uplinks per second")
+    parser.add_argument("--batch-size", type=int, default=FORWARD_BATCH_SIZE)
+    parser.add_argument("--spool", default=SPOOL_PATH,
+                        help="SQLite file holding readings of failed POSTs until they are delivered")
+    parser.add_argument("--no-spool", action="store_true", help="Count failed POSTs as lost instead of spooling")
+    args = parser.parse_args()
+    if args.simulate and args.mqtt:
+        parser.error("--simulate sends to the webhook receiver and can't be combined with --mqtt")
+
+    local_server = None
+    if args.local:
+        from local_items_server import start_server
+        local_server, args.api_url = start_server(port=0)
+
+    forwarder = UplinkForwarder(args.api_url, batch_size=args.batch_size,
+                                spool_path=None if args.no_spool else args.spool).start()
+
+    if args.mqtt:
+        from ttn_data_api import TTN_API_KEY
+        source = start_mqtt_consumer(forwarder, args.app_id, TTN_API_KEY, args.mqtt_host,
+                                     args.mqtt_port, tls=not args.no_tls)
+        print(f"TTN MQTT consumer -> {args.api_url}")
+    else:
+        source = start_webhook_receiver(forwarder, port=args.webhook_port)
+        print(f"TTN webhook receiver on http://{WEBHOOK_HOST}:{args.webhook_port}{WEBHOOK_PATH} -> {args.api_url}")
+
+    try:
+        if args.simulate:
+            simulate_uplinks(f"http://{WEBHOOK_HOST}:{args.webhook_port}{WEBHOOK_PATH}", args.simulate, args.rate)
+        else:
+            while True:
+                time.sleep(REPORT_INTERVAL_SECONDS)
+                print_stats(forwarder.snapshot())
+    except KeyboardInterrupt:
+        print("\n⏹️  Stopping consumer")
+    finally:
+        if args.mqtt:
+            source.loop_stop()
+            source.disconnect()
+        else:
+            source.shutdown()
+        forwarder.stop()
+        print_stats(forwarder.snapshot())
+        if local_server:
+            local_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Vectorized Bulk Record Generator
+
+NumPy versions of generate_comprehensive_record() (simulate_dashboard.py) and
+generate_quality_control_record() (inject_quality_control_data.py) for
+capacity tests that need millions of records.
+
+Each chunk draws whole columns (sensor values, decisions, reworkability,
+reworked outcomes, ...) in a few NumPy calls using the same weights as the
+scalar generators, then yields the records one at a time, so memory use is
+bounded by the chunk size.
+
+Usage:
+    from vectorized_generator import iter_comprehensive_records
+    for record in iter_comprehensive_records(1_000_000, seed=42):
+        ...
+
+    python vectorized_generator.py --records 1000000   # measure generation rate
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+import inject_quality_control_data as qc
+import simulate_dashboard as sim
+
+# ===== CONFIGURATION CONSTANTS =====
+CHUNK_SIZE = 10000  # Records drawn per NumPy batch
+
+
+# =============================================================================
+# COLUMN HELPERS
+# =============================================================================
+
+def _choice(rng, options, weights, size):
+    """Weighted choice of `size` values from options, as an object array"""
+    p = np.asarray(weights, dtype=float)
+    indexes = rng.choice(len(options), size=size, p=p / p.sum())
+    return np.asarray(options, dtype=object)[indexes]
+
+
+def _uniform(rng, value_range, size, decimals=1):
+    """Uniform values in value_range rounded like the scalar generators, as a list"""
+    return np.round(rng.uniform(value_range[0], value_range[1], size), decimals).tolist()
+
+
+def _sample_lists(rng, options, counts, mask, replacements=None):
+    """
+    Per-row sample without replacement: row i gets counts[i] distinct options
+    where mask[i] is set, and [] elsewhere. `replacements` maps an option to a
+    list it is swapped for (e.g. 'Other' -> a specific 'Other Option N').
+    """
+    size = len(counts)
+    # Sorting random keys per row gives an independent permutation per row
+    order = np.argsort(rng.random((size, len(options))), axis=1)
+    option_array = np.asarray(options, dtype=object)
+
+    swaps = {}
+    for option, choices in (replacements or {}).items():
+        swaps[option] = np.asarray(choices, dtype=object)[rng.integers(0, len(choices), size)]
+
+    rows = []
+    for i in range(size):
+        if not mask[i]:
+            rows.append([])
+            continue
+        picked = option_array[order[i, :counts[i]]].tolist()
+        if swaps:
+            picked = [swaps[value][i] if value in swaps else value for value in picked]
+        rows.append(picked)
+    return rows
+
+
+def _timestamps(rng, size, max_days, now=None):
+    """ISO timestamps going back up to max_days days, 23 hours and 59 minutes from now"""
+    now = np.datetime64(now or datetime.now(), 'us')
+    offsets = (rng.integers(0, max_days + 1, size) * 86400
+               + rng.integers(0, 24, size) * 3600
+               + rng.integers(0, 60, size) * 60)
+    return np.datetime_as_string(now - offsets.astype('timedelta64[s]'), unit='us').tolist()
+
+
+# =============================================================================
+# COMPREHENSIVE RECORDS (simulate_dashboard.py)
+# =============================================================================
+
+def _comprehensive_columns(rng, start_record_id, size):
+    """Draw one chunk of comprehensive record columns"""
+    decision = _choice(rng, sim.QC_DECISIONS, sim.QC_DECISION_WEIGHTS, size)
+    failing = decision != 'Yes'
+    is_rework = decision == 'Goes to Rework'
+    is_no = decision == 'No'
+
+    cause_of_failure = _sample_lists(
+        rng, sim.QC_CAUSE_OF_FAILURE_OPTIONS, rng.integers(1, 4, size), failing,
+        {'Other': sim.QC_CAUSE_OF_FAILURE_OPTIONS_OTHER})
+    affected_output = _sample_lists(
+        rng, sim.QC_AFFECTED_OUTPUT_OPTIONS, rng.integers(1, 3, size), failing,
+        {'Other': sim.QC_AFFECTED_OUTPUT_OPTIONS_OTHER})
+
+    # Reworkability: N/A for passes, weighted by decision otherwise
+    reworkability = np.full(size, 'N/A', dtype=object)
+    reworkability[is_rework] = _choice(rng, sim.QC_REWORKABILITY_OPTIONS,
+                                       sim.QC_REWORKABILITY_WEIGHTS_REWORK, is_rework.sum())
+    reworkability[is_no] = _choice(rng, sim.QC_REWORKABILITY_OPTIONS,
+                                   sim.QC_REWORKABILITY_WEIGHTS_NO, is_no.sum())
+
+    # Reworked: high weights for reworkable rework cases, low weights for No decisions
+    high = is_rework & (reworkability == 'Yes')
+    reworked = np.full(size, 'N/A', dtype=object)
+    reworked[high] = _choice(rng, sim.QC_REWORKED_OPTIONS, sim.QC_REWORKED_WEIGHTS_HIGH, high.sum())
+    reworked[is_no] = _choice(rng, sim.QC_REWORKED_OPTIONS, sim.QC_REWORKED_WEIGHTS_LOW, is_no.sum())
+    rework_outcome = reworked.copy()
+
+    # Reworked products get a new final decision
+    was_reworked = reworked == 'Yes'
+    decision[was_reworked] = _choice(rng, ['Yes', 'No', 'Goes to Rework'],
+                                     sim.QC_FINAL_DECISION_WEIGHTS, was_reworked.sum())
+
+    return {
+        'squeegeeSpeed': _uniform(rng, sim.SQUEEGEE_SPEED_RANGE, size),
+        'printPressure': _uniform(rng, sim.PRINT_PRESSURE_RANGE, size),
+        'inkViscosity': _uniform(rng, sim.INK_VISCOSITY_RANGE, size),
+        'temperature': _uniform(rng, sim.TEMPERATURE_RANGE, size),
+        'speed': _uniform(rng, sim.SPEED_RANGE, size),
+        'processStation': _choice(rng, sim.QC_PROCESS_STATIONS, [1] * len(sim.QC_PROCESS_STATIONS), size).tolist(),
+        'productId': np.arange(sim.START_PRODUCT_ID + start_record_id,
+                               sim.START_PRODUCT_ID + start_record_id + size).astype(str).tolist(),
+        'decision': decision.tolist(),
+        'reworkability': reworkability.tolist(),
+        'reworked': reworked.tolist(),
+        'reworkOutcome': rework_outcome.tolist(),
+        'causeOfFailure': cause_of_failure,
+        'affectedOutput': affected_output,
+        'operator': _choice(rng, sim.QC_OPERATORS, [1] * len(sim.QC_OPERATORS), size).tolist(),
+        'comments': _choice(rng, sim.QC_COMMENTS_OPTIONS, sim.QC_COMMENT_WEIGHTS, size).tolist(),
+        'timestamp': _timestamps(rng, size, sim.TIME_RANGE_DAYS),
+    }
+
+
+def iter_comprehensive_records(count, start_record_id=0, chunk_size=CHUNK_SIZE, seed=None):
+    """
+    Lazily yield `count` records shaped like generate_comprehensive_record()
+    Product IDs continue from START_PRODUCT_ID + start_record_id.
+    """
+    rng = np.random.default_rng(seed)
+    device = sim.DEVICE_SOURCES
+
+    for chunk_start in range(start_record_id, start_record_id + count, chunk_size):
+        size = min(chunk_size, start_record_id + count - chunk_start)
+        c = _comprehensive_columns(rng, chunk_start, size)
+
+        for i in range(size):
+            yield {
+                "squeegeeSpeed": {"value": c['squeegeeSpeed'][i], "unit": "mm/s",
+                                  "deviceSource": device['squeegeeSpeed']},
+                "printPressure": {"value": c['printPressure'][i], "unit": "N/m²",
+                                  "deviceSource": device['printPressure']},
+                "inkViscosity": {"value": c['inkViscosity'][i], "unit": "cP",
+                                 "deviceSource": device['inkViscosity']},
+                "temperature": {"value": c['temperature'][i], "unit": "°C",
+                                "deviceSource": device['temperature']},
+                "speed": {"value": c['speed'][i], "unit": "mm/s",
+                          "deviceSource": device['speed']},
+                "processStation": c['processStation'][i],
+                "productId": c['productId'][i],
+                "decision": c['decision'][i],
+                "reworkability": c['reworkability'][i],
+                "reworked": c['reworked'][i],
+                "reworkOutcome": c['reworkOutcome'][i],
+                "causeOfFailure": c['causeOfFailure'][i],
+                "affectedOutput": c['affectedOutput'][i],
+                "operator": c['operator'][i],
+                "comments": c['comments'][i],
+                "timestamp": c['timestamp'][i],
+                "processType": "QualityControl",
+                "statusCode": "3100"
+            }
+
+
+# =============================================================================
+# QUALITY CONTROL RECORDS (inject_quality_control_data.py)
+# =============================================================================
+
+def _quality_control_columns(rng, start_product_id, size):
+    """Draw one chunk of quality control record columns"""
+    decision = _choice(rng, qc.DECISIONS, qc.DECISION_WEIGHTS, size)
+    failing = decision != 'Yes'
+    is_rework = decision == 'Goes to Rework'
+    is_no = decision == 'No'
+
+    cause_of_failure = _sample_lists(rng, qc.CAUSE_OF_FAILURE_OPTIONS, rng.integers(1, 4, size), failing)
+    affected_output = _sample_lists(rng, qc.AFFECTED_OUTPUT_OPTIONS, rng.integers(1, 3, size), failing)
+
+    # Reworkability: No for passes, weighted for rework, uniform for No decisions
+    reworkability = np.full(size, 'No', dtype=object)
+    reworkability[is_rework] = _choice(rng, qc.REWORKABILITY_OPTIONS,
+                                       qc.REWORKABILITY_WEIGHTS_REWORK, is_rework.sum())
+    reworkability[is_no] = _choice(rng, qc.REWORKABILITY_OPTIONS,
+                                   [1] * len(qc.REWORKABILITY_OPTIONS), is_no.sum())
+
+    high = is_rework & (reworkability == 'Yes')
+    reworked = np.full(size, 'No', dtype=object)
+    reworked[high] = _choice(rng, qc.REWORKED_OPTIONS, qc.REWORKED_WEIGHTS_HIGH, high.sum())
+    reworked[is_no] = _choice(rng, qc.REWORKED_OPTIONS, qc.REWORKED_WEIGHTS_LOW, is_no.sum())
+
+    # Reworked products become Yes with DECISION_UPDATE_WEIGHTS, else keep their decision
+    was_reworked = reworked == 'Yes'
+    update = _choice(rng, [True, False], qc.DECISION_UPDATE_WEIGHTS, size).astype(bool)
+    decision[was_reworked & update] = 'Yes'
+
+    process_station = _choice(rng, qc.PROCESS_STATIONS, [1] * len(qc.PROCESS_STATIONS), size).tolist()
+
+    return {
+        'processStation': process_station,
+        'productId': np.arange(start_product_id, start_product_id + size).astype(str).tolist(),
+        'decision': decision.tolist(),
+        'reworkability': reworkability.tolist(),
+        'reworked': reworked.tolist(),
+        'causeOfFailure': cause_of_failure,
+        'affectedOutput': affected_output,
+        'operator': _choice(rng, qc.OPERATORS, [1] * len(qc.OPERATORS), size).tolist(),
+        'comments': _choice(rng, qc.COMMENTS_OPTIONS, qc.COMMENT_WEIGHTS, size).tolist(),
+        'timestamp': _timestamps(rng, size, 30),
+    }
+
+
+def iter_quality_control_records(count, start_product_id=qc.START_PRODUCT_ID,
+                                 chunk_size=CHUNK_SIZE, seed=None):
+    """Lazily yield `count` records shaped like generate_quality_control_record()"""
+    rng = np.random.default_rng(seed)
+
+    for chunk_start in range(start_product_id, start_product_id + count, chunk_size):
+        size = min(chunk_size, start_product_id + count - chunk_start)
+        c = _quality_control_columns(rng, chunk_start, size)
+
+        for i in range(size):
+            yield {
+                "processType": "QualityControl",
+                "processStation": c['processStation'][i],
+                "productId": c['productId'][i],
+                "decision": c['decision'][i],
+                "reworkability": c['reworkability'][i],
+                "reworked": c['reworked'][i],
+                "causeOfFailure": c['causeOfFailure'][i],
+                "affectedOutput": c['affectedOutput'][i],
+                "operator": c['operator'][i],
+                "statusCode": qc.generate_status_code(c['processStation'][i]),
+                "comments": c['comments'][i],
+                "timestamp": c['timestamp'][i]
+            }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure vectorized record generation rate")
+    parser.add_argument("--records", type=int, default=1000000, help="Records to generate")
+    parser.add_argument("--kind", choices=["comprehensive", "quality_control"], default="comprehensive")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    generator = iter_comprehensive_records if args.kind == "comprehensive" else iter_quality_control_records
+    started = time.perf_counter()
+    generated = sum(1 for _ in generator(args.records, seed=args.seed))
+    elapsed = time.perf_counter() - started
+    print(f"Generated {generated} {args.kind} records in {elapsed:.2f}s "
+          f"({generated / elapsed:,.0f} records/s)")
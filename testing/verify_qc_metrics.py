@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Verify GET /api/items/stats/quality Against a Reference Implementation
+
+The quality control dashboard gets its chart metrics from the backend's
+aggregation endpoint instead of downloading every item. This script
+downloads the items anyway, recomputes the metrics with a straight Python
+port of the client-side code that QualityControlChart.js used before
+(decision/reworked/yield counts, rework outcome, cause of failure and
+affected output per operator, speed/temperature defect rates and the
+binned pass rates), and compares both results field by field.
+
+Names that the chart listed in order of first appearance (operators,
+causes, outputs) are sorted, as the endpoint returns them sorted.
+
+Usage:
+    python verify_qc_metrics.py                   # Check the current data
+    python verify_qc_metrics.py --seed 2000       # Seed records with simulate_dashboard.py first
+    python verify_qc_metrics.py --local --seed 2000
+"""
+
+import argparse
+import math
+import sys
+import time
+
+import requests
+
+import api_client
+import items_reader
+import simulate_dashboard
+
+# ===== CONFIGURATION CONSTANTS =====
+API_BASE_URL = "http://localhost:5050/api"
+PROCESS_TYPE = "QualityControl"  # Items the QC charts are built from
+FLOAT_TOLERANCE = 1e-9  # Relative tolerance for rates and bin starts
+
+# Same as QualityControlChart.js
+BIN_SIZES = {'temperature': 2, 'speed': 5, 'squeegeeSpeed': 5, 'printPressure': 1000, 'inkViscosity': 2}
+DEFECT_DECISIONS = ('No', 'Goes to Rework')
+MIN_RATE_SAMPLES = 2
+# Item fields the reference implementation reads (downloaded with ?fields=)
+REFERENCE_FIELDS = ['decision', 'reworked', 'reworkOutcome', 'operator', 'causeOfFailure', 'affectedOutput',
+                    *(f'{name}.value' for name in BIN_SIZES)]
+
+
+def truthy(value):
+    """JavaScript truthiness, as the chart's `item.x && item.x.value` checks use it"""
+    if isinstance(value, float) and math.isnan(value):
+        return False
+    return bool(value)
+
+
+def measurement(item, field):
+    """A measurement value when set and non-zero and the item has a decision, else None"""
+    value = (item.get(field) or {}).get('value')
+    return float(value) if truthy(value) and truthy(item.get('decision')) else None
+
+
+def count_by(values):
+    """Occurrences of each value"""
+    counts = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def rate_rows(buckets, key):
+    """{bucket: [total, defects]} -> the chart's rate rows, sorted by bucket"""
+    rows = [{key: bucket, 'defectRate': defects / total * 100,
+             'passRate': (total - defects) / total * 100, 'totalSamples': total}
+            for bucket, (total, defects) in buckets.items()]
+    return sorted((row for row in rows if row['totalSamples'] >= MIN_RATE_SAMPLES), key=lambda row: row[key])
+
+
+def defect_buckets(items, field, bucket):
+    """Count items and defects per bucket(value) of a measurement field"""
+    buckets = {}
+    for item in items:
+        value = measurement(item, field)
+        if value is None:
+            continue
+        counts = buckets.setdefault(bucket(value), [0, 0])
+        counts[0] += 1
+        counts[1] += item.get('decision') in DEFECT_DECISIONS
+    return buckets
+
+
+def array_breakdown(items, field, operators):
+    """Totals, names and per-operator rows of an array field (causeOfFailure / affectedOutput)"""
+    totals = count_by(value for item in items if isinstance(item.get(field), list) for value in item[field])
+    names = sorted(totals)
+    rows = []
+    for operator in operators:
+        counts = count_by(value for item in items if item.get('operator') == operator
+                          and isinstance(item.get(field), list) for value in item[field])
+        rows.append({'operator': operator, **{name: counts.get(name, 0) for name in names}})
+    ordered = sorted(totals.items(), key=lambda entry: (-entry[1], entry[0]))
+    return [{'name': name, 'count': count} for name, count in ordered], names, rows
+
+
+def reference_quality_stats(items):
+    """
+    Compute the QC chart metrics from raw items, the way the dashboard did client-side
+    Returns: dict shaped like the GET /stats/quality response
+    """
+    decisions = count_by(item.get('decision') or 'Unknown' for item in items)
+    reworked = count_by(item.get('reworked') or 'No' for item in items)
+    rework_outcome = count_by(item.get('reworkOutcome') or item.get('decision')
+                              for item in items if item.get('reworked') == 'Yes')
+
+    operators = sorted({item['operator'] for item in items if truthy(item.get('operator'))})
+    cause_totals, causes, cause_rows = array_breakdown(items, 'causeOfFailure', operators)
+    output_totals, outputs, output_rows = array_breakdown(items, 'affectedOutput', operators)
+
+    bins = {}
+    for field, size in BIN_SIZES.items():
+        values = [value for value in (measurement(item, field) for item in items) if value is not None]
+        if not values:
+            bins[field] = []
+            continue
+        minimum = min(values)
+        rows = rate_rows(defect_buckets(items, field, lambda v: math.floor((v - minimum) / size) * size + minimum),
+                         'binStart')
+        bins[field] = [{'bin': f"{row['binStart']:.1f}-{row['binStart'] + size:.1f}", **row} for row in rows]
+
+    return {
+        'total': len(items),
+        'decisions': decisions,
+        'reworked': {'Yes': reworked.get('Yes', 0), 'No': reworked.get('No', 0)},
+        'reworkOutcome': rework_outcome,
+        'causeOfFailure': cause_totals,
+        'affectedOutput': output_totals,
+        'operators': operators,
+        'causes': causes,
+        'outputs': outputs,
+        'causeOfFailureByOperator': cause_rows,
+        'affectedOutputByOperator': output_rows,
+        'speedDefectRate': rate_rows(defect_buckets(items, 'speed', lambda v: math.floor(v / 2) * 2), 'speed'),
+        'temperatureDefectRate': rate_rows(defect_buckets(items, 'temperature', math.floor), 'temperature'),
+        'bins': bins,
+    }
+
+
+def compare(expected, actual, path="stats"):
+    """
+    Compare two JSON values, numbers with FLOAT_TOLERANCE
+    Returns: list of mismatch descriptions
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        mismatches = []
+        for key in sorted(set(expected) | set(actual)):
+            if key not in actual:
+                mismatches.append(f"{path}.{key}: missing from endpoint (expected {expected[key]!r})")
+            elif key not in expected:
+                mismatches.append(f"{path}.{key}: unexpected {actual[key]!r}")
+            else:
+                mismatches.extend(compare(expected[key], actual[key], f"{path}.{key}"))
+        return mismatches
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path}: {len(actual)} entries, expected {len(expected)}"]
+        mismatches = []
+        for i, (e, a) in enumerate(zip(expected, actual)):
+            mismatches.extend(compare(e, a, f"{path}[{i}]"))
+        return mismatches
+    if (isinstance(expected, (int, float)) and isinstance(actual, (int, float))
+            and not isinstance(expected, bool) and not isinstance(actual, bool)):
+        if math.isclose(expected, actual, rel_tol=FLOAT_TOLERANCE, abs_tol=FLOAT_TOLERANCE):
+            return []
+    elif expected == actual:
+        return []
+    return [f"{path}: endpoint {actual!r}, expected {expected!r}"]
+
+
+def seed_records(count, api_base_url):
+    """Insert `count` complete manufacturing records through simulate_dashboard's batched mode"""
+    simulate_dashboard.API_BASE_URL = api_base_url
+    simulate_dashboard.simulate_comprehensive_data_batched(count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check /api/items/stats/quality against a Python reference")
+    parser.add_argument("--api-url", default=API_BASE_URL)
+    parser.add_argument("--process-type", default=PROCESS_TYPE)
+    parser.add_argument("--seed", type=int, default=0, metavar="N",
+                        help="Insert N records with simulate_dashboard.py before checking")
+    parser.add_argument("--local", action="store_true",
+                        help="Check an in-process local_items_server instead of --api-url")
+    args = parser.parse_args()
+
+    local_server = None
+    if args.local:
+        from local_items_server import start_server
+        local_server, args.api_url = start_server(port=0)
+
+    try:
+        if args.seed:
+            seed_records(args.seed, args.api_url)
+
+        started = time.perf_counter()
+        items = list(items_reader.iter_items({'processType': args.process_type}, api_base_url=args.api_url,
+                                             fields=REFERENCE_FIELDS))
+        expected = reference_quality_stats(items)
+        reference_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        response = api_client.get(f"{args.api_url}/items/stats/quality",
+                                  params={'processType': args.process_type})
+        response.raise_for_status()
+        actual = response.json()
+        endpoint_seconds = time.perf_counter() - started
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Request failed: {str(e)}")
+        sys.exit(2)
+    finally:
+        if local_server:
+            local_server.shutdown()
+
+    print(f"📥 Downloaded {len(items)} {args.process_type} items and computed metrics in {reference_seconds:.2f}s")
+    print(f"📊 Aggregation endpoint answered in {endpoint_seconds:.2f}s")
+
+    mismatches = compare(expected, actual)
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} mismatch(es):")
+        for mismatch in mismatches[:50]:
+            print(f"   {mismatch}")
+        sys.exit(1)
+    print(f"✅ Endpoint metrics match the reference implementation ({len(items)} items)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Deterministic Workload Profiles
+
+Named workload profiles (record mix, rate, value ranges, duration) are loaded
+from workload_profiles.json. Every profile carries a seed and a fixed start
+time, so two runs of the same profile produce byte-identical record streams
+and backend throughput can be compared before and after a change without
+noise coming from the data.
+
+Profile fields:
+    seed              Seed for the profile's random.Random
+    start_time        ISO time of the first record; later records are spaced 1/rate apart
+    rate              Records/s when sent to the API (0 = as fast as possible)
+    duration_seconds  Run length; records = rate * duration_seconds
+    records           Explicit record count (overrides duration_seconds)
+    mix               {generator: weight}, generators: sensor, streeting, comprehensive
+    ranges            {generator: {CONSTANT_NAME: [low, high]}} range overrides
+
+Usage:
+    python workload_profiles.py list
+    python workload_profiles.py digest line_sensors        # sha256 of the record stream
+    python workload_profiles.py export qc_history qc.ndjson.gz
+    python workload_profiles.py run line_sensors
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import sensor_data_generator
+import simulate_dashboard
+import streeting_data_generator
+from dataset_io import write_dataset
+from replay_dataset import replay_records, print_replay_summary
+
+# ===== CONFIGURATION CONSTANTS =====
+PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workload_profiles.json")
+DEFAULT_START_TIME = "2026-01-01T00:00:00"
+
+# Generator name -> (module holding its range constants, record factory)
+GENERATORS = {
+    'sensor': (
+        sensor_data_generator,
+        lambda rng, index, timestamp: sensor_data_generator.generate_sensor_payload(rng, timestamp)
+    ),
+    'streeting': (
+        streeting_data_generator,
+        lambda rng, index, timestamp: streeting_data_generator.generate_random_payload(rng, timestamp)
+    ),
+    'comprehensive': (
+        simulate_dashboard,
+        lambda rng, index, timestamp: simulate_dashboard.generate_comprehensive_record(index, rng, timestamp)
+    ),
+}
+
+
+def load_profiles(path=PROFILES_PATH):
+    """Load all profiles from a JSON config file"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_profile(name, path=PROFILES_PATH):
+    """
+    Load and validate one profile by name
+    Raises: KeyError for unknown profiles, ValueError for invalid settings
+    """
+    profiles = load_profiles(path)
+    if name not in profiles:
+        raise KeyError(f"Unknown profile '{name}' (available: {', '.join(sorted(profiles))})")
+
+    profile = dict(profiles[name], name=name)
+    unknown = set(profile.get('mix', {})) - set(GENERATORS)
+    if not profile.get('mix') or unknown:
+        raise ValueError(f"Profile '{name}' needs a mix of {', '.join(GENERATORS)} (unknown: {unknown or 'none'})")
+    if 'seed' not in profile:
+        raise ValueError(f"Profile '{name}' has no seed")
+    if 'records' not in profile and not (profile.get('rate') and profile.get('duration_seconds')):
+        raise ValueError(f"Profile '{name}' needs either records or rate and duration_seconds")
+    return profile
+
+
+def profile_record_count(profile):
+    """Number of records a profile produces"""
+    if 'records' in profile:
+        return int(profile['records'])
+    return int(profile['rate'] * profile['duration_seconds'])
+
+
+@contextmanager
+def profile_ranges(profile):
+    """Temporarily apply the profile's range overrides to the generator modules"""
+    saved = []
+    try:
+        for generator, overrides in profile.get('ranges', {}).items():
+            module = GENERATORS[generator][0]
+            for constant, value in overrides.items():
+                if not hasattr(module, constant):
+                    raise ValueError(f"{module.__name__} has no constant {constant}")
+                saved.append((module, constant, getattr(module, constant)))
+                setattr(module, constant, tuple(value))
+        yield
+    finally:
+        for module, constant, value in reversed(saved):
+            setattr(module, constant, value)
+
+
+def iter_profile_records(profile):
+    """
+    Lazily yield the profile's records. The stream depends only on the
+    profile, so repeated runs yield identical records.
+    """
+    rng = random.Random(profile['seed'])
+    generators = list(profile['mix'])
+    weights = [profile['mix'][generator] for generator in generators]
+    start = datetime.fromisoformat(profile.get('start_time', DEFAULT_START_TIME))
+    # Records are spaced on a virtual clock; unthrottled profiles use 1 record/s
+    spacing = 1.0 / profile['rate'] if profile.get('rate') else 1.0
+
+    with profile_ranges(profile):
+        for index in range(profile_record_count(profile)):
+            generator = rng.choices(generators, weights=weights)[0]
+            timestamp = start + timedelta(seconds=index * spacing)
+            yield GENERATORS[generator][1](rng, index, timestamp)
+
+
+def profile_digest(profile):
+    """sha256 of the profile's serialized record stream, for checking reproducibility"""
+    digest = hashlib.sha256()
+    for record in iter_profile_records(profile):
+        digest.update(json.dumps(record, sort_keys=True).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic workload profiles")
+    parser.add_argument("--config", default=PROFILES_PATH, help="Profiles JSON file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List available profiles")
+    digest_parser = subparsers.add_parser("digest", help="Print the sha256 of a profile's stream")
+    digest_parser.add_argument("profile")
+    export_parser = subparsers.add_parser("export", help="Write a profile's records to a dataset file")
+    export_parser.add_argument("profile")
+    export_parser.add_argument("path")
+    run_parser = subparsers.add_parser("run", help="Send a profile's records to the API at its rate")
+    run_parser.add_argument("profile")
+    run_parser.add_argument("--batch-size", type=int, default=None,
+                            help="Records per request (default: 1 for rated profiles, 500 otherwise)")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name in load_profiles(args.config):
+            profile = load_profile(name, args.config)
+            print(f"{name:16s} {profile_record_count(profile):>9d} records  "
+                  f"rate={profile.get('rate') or 'max'}  seed={profile['seed']}  "
+                  f"{profile.get('description', '')}")
+        return
+
+    profile = load_profile(args.profile, args.config)
+
+    if args.command == "digest":
+        print(f"{profile['name']}: {profile_digest(profile)}")
+    elif args.command == "export":
+        written = write_dataset(iter_profile_records(profile), args.path)
+        print(f"Wrote {written} records of profile '{profile['name']}' to {args.path}")
+    elif args.command == "run":
+        batch_size = args.batch_size or (1 if profile.get('rate') else 500)
+        print(f"Running profile '{profile['name']}': {profile_record_count(profile)} records "
+              f"at {profile.get('rate') or 'max'} records/s")
+        stats = replay_records(iter_profile_records(profile), rate=profile.get('rate', 0),
+                               batch_size=batch_size)
+        print_replay_summary(stats)
+
+
+if __name__ == "__main__":
+    main()